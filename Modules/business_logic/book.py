@@ -7,8 +7,10 @@ Module Usage:
 Use of this module should only be through 'BookController' with 'action' attribute to determine
 correct instance of other classes to create and return followed by call to 'create_crud_instance()'
 Valid BookController Arguments are:
- 'Create Default Table', 'Create Entity', 'Search Entity' or 'Read Entity' or 'Read All',
-    'Update Entity' and 'Delete Entity'.
+ 'Create Default Table', 'Create Entity', 'Import Entities', 'Restock Entities', 'Search Entity'
+    or 'Read Entity' or 'Read All', 'Text Search Entity', 'Browse Entity', 'Update Entity',
+    'Batch Update Entities', 'Adjust Stock Entity', 'Delete Entity', 'Bulk Delete Entities' and
+    'Stock Report'.
 
 Classes:
 --------
@@ -27,6 +29,10 @@ FieldControl:
     primary_key_field_getter(self):
         Getter to return primary_key field_name
 
+    record_class(self):
+        return compact '__slots__' record class 'Book' generated with an attribute for each field,
+        used as 'row_factory' of 'ReadData' so rows are read by field name
+
     __return_field_names(self, field_list):
         'private', helper method to return the names of fields from a list of tuples with
         first value in tuple equal to field name
@@ -77,6 +83,53 @@ CreateBook:
     def retrieve_numeric_value(self, data_type, input_field, error_message, value_range=None):
         use parameters to request and validate user input for a numeric based attribute
 
+BookImport:
+    Request path of a CSV or JSON Lines file and read, convert and validate its rows against
+        FieldControl types and value ranges for a bulk insert.
+
+    Methods:
+    --------
+    __init__(self, file_path):
+        request and validate path of file to import (if 'file_path' is not given)
+
+    read_rows(self):
+        generator yielding (line_number, tuple of values) for each valid row of file, rows
+        failing validation are recorded in attribute 'row_errors'
+
+    convert_record(self, record):
+        return tuple of converted and range checked values from a record read from file
+
+    convert_value(field, value): 'staticmethod'
+        return one value converted to type of FieldControl 'field' and range checked
+
+BookBatchUpdate:
+    Child class of BookImport reading a CSV or JSON Lines file of changes (primary_key and the
+        fields to change) to existing books, validating each change.
+
+    Methods:
+    --------
+    __init__(self, file_path):
+        request and validate path of file to read changes from (if 'file_path' is not given)
+
+    read_changes(self):
+        generator yielding (primary_key value, dictionary of new values) for each valid row,
+        rows failing validation are recorded in attribute 'row_errors'
+
+    convert_change(self, record):
+        return primary_key value and dictionary of converted new values from a record
+
+BookRestock:
+    Child class of BookImport reading a CSV or JSON Lines restock feed of books that may or may
+        not already exist, validating each row for an upsert merging stock quantities.
+
+    Methods:
+    --------
+    __init__(self, file_path):
+        request and validate path of feed to read (if 'file_path' is not given)
+
+    convert_record(self, record): 'override'
+        return tuple of converted values with an optional primary_key value first
+
 BookSearch:
     Request and validate user_input to initialise class instance with field_names and search
         values corresponding to a book search
@@ -90,24 +143,48 @@ BookSearch:
     __str__(self):
         return string containing values for class attributes for testing
 
-    search_book_single_field(self, int_list, text_list, float_list):
+    search_book_single_field(self, int_list, text_list, float_list, allow_range):
         retrieve and validate user inputs to determine desired fields and values used
         when performing book search. Method will instantiate class attributes. Returns
         None for invalid argmuments in method call.
 
+    search_book_range(self, field):
+        retrieve and validate comparison ('<', '<=', '>', '>=' or 'BETWEEN') and value(s)
+        within field_control value range for a numeric field search, sorted and limited
+
+    retrieve_comparison(cls, field): 'classmethod'
+        request comparison of a numeric field from 'COMPARISONS'
+
+    retrieve_comparison_value(field, operator): 'staticmethod'
+        request value (or lowest and highest values) for comparison, range checked
+
+    search_book_full_text(self):
+        retrieve and validate user inputs for a full-text (word, prefix or phrase) search of
+        fields in field_control 'full_text_list'
+
+    browse_books(self):
+        retrieve and validate user inputs for field to order books by (primary_key or an
+        indexed field) and an optional single field search for viewing books page by page
+
 BookUpdate:
     Retrieve desired user field and associated value to perform update to field. Update is only
         performed using primary key for 'book' entity.
 
     Methods:
     --------
-    __init__(self):
+    __init__(self, user_action):
         initialise attributes of BookUpdate instance and call 'update_book_single_field()'
-        to retrieve and validate user_inputs for update
+        or 'adjust_book_stock()' to retrieve and validate user_inputs for update
 
     __str__(self):
         testing method to print values in 'field_names' and 'update_tuple' attributes
 
+    retrieve_primary_value(self, purpose):
+        request, retrieve and validate primary_key value of book to change
+
+    adjust_book_stock(self):
+        request, retrieve and validate book and change (sale or delivery) to its stock quantity
+
     update_book_single_field(self):
         request, retrieve and validate user_input for desired field and value for update
         of book entity
@@ -118,7 +195,7 @@ BookDelete:
 
     Methods:
     --------
-    __init__(self):
+    __init__(self, user_action):
         initialise attributes of BookDelete instance
 
     __str__(self):
@@ -127,7 +204,34 @@ BookDelete:
     retrieve_deletion_value(self):
         request, retrieve and validate user_input for primary_key to perform row deletion
         in a database
+
+    bulk_delete_books(self):
+        request, retrieve and validate file of primary_key values or field and value of books
+        to delete together
+
+    read_key_values(self):
+        generator yielding valid primary_key values read from file
+
+BookReport:
+    Set fields and thresholds of the stock report (total stock, stock per author and low-stock
+        counts), requesting an optional low stock level from user
+
+    Methods:
+    --------
+    __init__(self):
+        initialise report fields from FieldControl and call 'request_low_stock_level()'
+
+    __str__(self):
+        return string of class attributes for testing
+
+    request_low_stock_level(self):
+        request and validate an optional low stock level added to 'low_stock_levels'
 """
+import csv
+import dataclasses
+import json
+import os
+
 
 class FieldControl():
     """A component used to set and control the names and types of fields that would be present in
@@ -153,6 +257,20 @@ class FieldControl():
         list containing field_names populated from 'text_list'
     float_field_names: string list
         list containing field_names populated from 'float_list'
+    all_field_names: string list
+        primary_key field_name followed by all names above in table order
+    index_list: string list
+        names of fields that should have a (non-unique) index for fast searches
+    unique_list: list of strings or tuples of strings
+        names of fields whose values must be unique (enforced with a unique index), or tuples of
+        field names whose values must be unique together (composite unique index)
+    partial_index_list: list of tuples
+        (field_name, level) of integer fields with a partial index of rows at or below level,
+        small however many rows are above level (books low on stock)
+    full_text_list: string list
+        names of text fields included in full-text (word, prefix and phrase) searches
+    stock_field: str
+        name of integer field holding stock quantity (adjusted by sales and deliveries)
 
     Methods:
     -------
@@ -162,6 +280,9 @@ class FieldControl():
     __str__(self):
         print all declared field_names and types for testing
 
+    record_class(self):
+        return '__slots__' record class 'Book' with an attribute for each of 'all_field_names'
+
     __return_field_names(self, field_list):
         'private', helper method to return the names of fields from a list of tuples with
         first value in tuple equal to field name
@@ -169,6 +290,8 @@ class FieldControl():
     __check_no_list_duplicates(self, check_list):
         'private', helper method to check for any duplicates in check_list
     """
+    # record classes generated for each set of field names, shared by all instances
+    _record_classes = {}
 
     def __init__(self):
         """Constructor to set primary_key, field names, associated types and possible value range.
@@ -182,11 +305,30 @@ class FieldControl():
         self.int_list = [("qty", "int", 0, None)]
         self.text_list = [("author", "text"), ("title", "text")]
         self.float_list = []
+        # fields searched often are indexed so searches are index seeks, not table scans.
+        # Fields listed in 'unique_list' receive a unique index instead. A book is identified
+        # by its title and author together (natural key): restock feeds without primary_key
+        # values are matched to existing books on it, and creating or importing a second book
+        # with the same title and author is refused. Title searches use the unique index as
+        # title is its first field. A table holding such duplicates from before keeps no
+        # unique index (reported at start up) and cannot be restocked until they are merged
+        self.index_list = ["author", "qty"]
+        self.unique_list = [("title", "author")]
+        # books at or below a low stock level are found (sorted by quantity) with a partial
+        # index holding only those books, while most of the catalogue is well stocked
+        self.partial_index_list = [("qty", 10)]
+        # text fields searchable by words, word prefixes and phrases (full-text index)
+        self.full_text_list = ["title", "author"]
+        # integer field holding stock on hand, changed by sales and deliveries
+        self.stock_field = "qty"
 
         # attributes storing only the names of the fields (no other data as in tuples above)
         self.int_field_names = self.__return_field_names(self.int_list)
         self.text_field_names = self.__return_field_names(self.text_list)
         self.float_field_names = self.__return_field_names(self.float_list)
+        # names of every field in table order (primary_key first) used for explicit projection
+        self.all_field_names = ([self.primary_key[0]] + self.int_field_names +
+                                self.text_field_names + self.float_field_names)
 
         # perform check that primary_key tuple has been populated
         if not self.primary_key:
@@ -201,12 +343,66 @@ class FieldControl():
         if not self.__no_duplicates_tuple_lists(self.int_list, self.text_list, self.float_list):
             print("Error Log - A duplicated field name has been stated.")
 
+        # perform check that indexed and unique fields are declared fields
+        unique_field_names = [field_name for unique in self.unique_list
+                              for field_name in ((unique,) if isinstance(unique, str) else unique)]
+        for field_name in self.index_list + unique_field_names:
+            if field_name not in self.all_field_names:
+                print(f"Error Log - Indexed field '{field_name}' is not a declared field.")
+
+        # perform check that partial indexes are on declared integer fields within their range
+        for field_name, level in self.partial_index_list:
+            int_fields = [field for field in self.int_list if field[0] == field_name]
+            if not int_fields or not isinstance(level, int) or \
+                    (int_fields[0][2] is not None and level < int_fields[0][2]):
+                print(f"Error Log - Partial index ('{field_name}', {level}) is not on a " +
+                      "declared int field within its value range.")
+
+        # perform check that stock field is a declared integer field
+        if self.stock_field not in self.int_field_names:
+            print(f"Error Log - Stock field '{self.stock_field}' is not a declared int field.")
+
+        # perform check that full-text fields are declared text fields
+        for field_name in self.full_text_list:
+            if field_name not in self.text_field_names:
+                print(f"Error Log - Full-text field '{field_name}' is not a declared text field.")
+
     def __str__(self):
         """return attributes of 'FieldControl' instance as string for testing"""
         return (f"PK: {self.primary_key}, Integer_List: {self.int_list}, " +
                 f"Text_List: {self.text_list}, Float_List: {self.float_list}, " +
                 f"int_fields: {self.int_field_names}, text_fields: {self.text_field_names}, " +
-                f"float_fields: {self.float_field_names}")
+                f"float_fields: {self.float_field_names}, index_list: {self.index_list}, " +
+                f"unique_list: {self.unique_list}, " +
+                f"partial_index_list: {self.partial_index_list}, " +
+                f"full_text_list: {self.full_text_list}, " +
+                f"stock_field: {self.stock_field}")
+
+    def record_class(self):
+        """Return record class 'Book' with an attribute for each field in 'all_field_names',
+            generated once for each set of field names. Instances store values in '__slots__'
+            (no per-instance dictionary) so large results stay compact, are created with the
+            values of a row in table order and iterate over them in the same order. Pass the
+            class as 'row_factory' of 'ReadData' projecting 'all_field_names':
+
+            ReadData(database_name, "books", field_control.all_field_names,
+                     row_factory=field_control.record_class())
+
+        Return:
+        -------
+        class - dataclass with '__slots__', e.g. Book(id=3001, qty=30, author=..., title=...)
+        """
+        field_names = tuple(self.all_field_names)
+        record_class = FieldControl._record_classes.get(field_names)
+        if record_class is None:
+            def iterate_values(record):
+                """Iterate over values of record in field order (unpacking and display)."""
+                return iter([getattr(record, field_name) for field_name in field_names])
+
+            record_class = dataclasses.make_dataclass(
+                "Book", field_names, slots=True, namespace={"__iter__": iterate_values})
+            FieldControl._record_classes[field_names] = record_class
+        return record_class
 
     def __return_field_names(self, field_list):
         """Internal, Helper Function that may be called by another class to retrieve the names of
@@ -267,8 +463,10 @@ class BookController:
     ------------
     book_action: String
         used to determine lower class instance to return. Values can only be one of:
-        'Create Default Table', 'Create Entity', 'Search Entity' or 'Read Entity' or
-        'Read All', 'Update Entity' and 'Delete Entity'
+        'Create Default Table', 'Create Entity', 'Import Entities', 'Restock Entities',
+        'Search Entity' or 'Read Entity' or 'Read All', 'Text Search Entity', 'Browse Entity',
+        'Update Entity', 'Batch Update Entities', 'Adjust Stock Entity', 'Delete Entity',
+        'Bulk Delete Entities' and 'Stock Report'
 
     Methods:
     -----------
@@ -279,8 +477,10 @@ class BookController:
         Compulsory method that must be called after initialisation of 'BookController'
          to determine instance of lower class to instantiate and return based on
          attribute 'book_action' Returns none for 'book_action' not matching:
-         'Create Default Table', 'Create Entity', 'Search Entity' or 'Read Entity' or 'Read All',
-         'Update Entity' and 'Delete Entity'
+         'Create Default Table', 'Create Entity', 'Import Entities', 'Restock Entities',
+         'Search Entity' or 'Read Entity' or 'Read All', 'Text Search Entity', 'Browse Entity',
+         'Update Entity', 'Batch Update Entities', 'Adjust Stock Entity', 'Delete Entity',
+         'Bulk Delete Entities' and 'Stock Report'
     """
 
     def __init__(self, book_action):
@@ -293,13 +493,22 @@ class BookController:
             return CreateDefaultBookTable()
         elif self.book_action == "Create Entity":
             return CreateBook()
+        elif self.book_action == "Import Entities":
+            return BookImport()
+        elif self.book_action == "Restock Entities":
+            return BookRestock()
+        elif self.book_action == "Batch Update Entities":
+            return BookBatchUpdate()
         elif self.book_action == "Search Entity" or self.book_action == "Read Entity" \
-                or self.book_action == "Read All":
+                or self.book_action == "Read All" or self.book_action == "Text Search Entity" \
+                or self.book_action == "Browse Entity":
             return BookSearch(self.book_action)
-        elif self.book_action == "Update Entity":
-            return BookUpdate()
-        elif self.book_action == "Delete Entity":
-            return BookDelete()
+        elif self.book_action == "Update Entity" or self.book_action == "Adjust Stock Entity":
+            return BookUpdate(self.book_action)
+        elif self.book_action == "Delete Entity" or self.book_action == "Bulk Delete Entities":
+            return BookDelete(self.book_action)
+        elif self.book_action == "Stock Report":
+            return BookReport()
         else:
             print("Error Log - Invalid Book Action has been entered for BookController")
             return None
@@ -321,6 +530,14 @@ class CreateDefaultBookTable:
         name of field(s) that would hold string(s)
     float_list: string list
         name of field(s) that would hold float(s)
+    index_list: string list
+        name of field(s) that should be indexed
+    unique_list: string list
+        name of field(s) that should have a unique index
+    partial_index_list: list of tuples
+        (field_name, level) of field(s) with a partial index of rows at or below level
+    full_text_list: string list
+        name of text field(s) included in the table's full-text index
 
     Methods:
     ---------
@@ -341,11 +558,19 @@ class CreateDefaultBookTable:
         self.int_list = self.field_control.int_field_names
         self.text_list = self.field_control.text_field_names
         self.float_list = self.field_control.float_field_names
+        # use field_control to retrieve and set fields needing an index or unique index
+        self.index_list = self.field_control.index_list
+        self.unique_list = self.field_control.unique_list
+        self.partial_index_list = self.field_control.partial_index_list
+        self.full_text_list = self.field_control.full_text_list
 
     def __str__(self):
         "return attributes of 'CreateDefaultBookTable' instance as string for testing"
         return (f"PK: {self.primary_key}, int_list names: {self.int_list}," +
-                f"test_list names: {self.text_list}, float_list names: {self.float_list}")
+                f"test_list names: {self.text_list}, float_list names: {self.float_list}, " +
+                f"index_list: {self.index_list}, unique_list: {self.unique_list}, " +
+                f"partial_index_list: {self.partial_index_list}, " +
+                f"full_text_list: {self.full_text_list}")
 
 
 # -------------------------------------------------------------------------------------------------
@@ -535,6 +760,357 @@ class CreateBook:
                 print(f"\n{error_message[0]}")
 
 
+# -------------------------------------------------------------------------------------------------
+class BookImport:
+    """Request path of a CSV or JSON Lines file of books and read, convert and validate its rows
+        against FieldControl types and value ranges for a bulk insert. Rows are read lazily as
+        'read_rows()' is consumed so files of any size can be imported. Primary_key values are
+        not read from file and are allocated by the database.
+
+    Attributes:
+    -----------
+    field_control: FieldControl
+        component holding primary_key field, other field names and associated types
+    file_path: str
+        path of file to import
+    file_format: str
+        "csv" (first line holding field names) or "jsonl" (one JSON object per line)
+    field_names: string list
+        names of fields (int, text then float fields) values in each row are given for
+    chunk_size: int
+        number of rows inserted in each database transaction
+    row_errors: list of tuples
+        (line_number, error message) for each row of file that failed validation
+
+    Methods:
+    --------
+    __init__(self, file_path):
+        request and validate path of file to import (if 'file_path' is not given)
+
+    __str__(self):
+        return string of class attributes for testing
+
+    retrieve_file_path(self):
+        request and validate path to an existing CSV or JSON Lines file
+
+    read_records(self):
+        generator yielding (line_number, dictionary of field values) from file
+
+    read_rows(self):
+        generator yielding (line_number, tuple of values) for each valid row of file
+
+    convert_record(self, record):
+        return tuple of converted values for 'field_names' from record, raising ValueError
+        for a missing, empty, incorrectly typed or out of range value
+
+    convert_value(field, value): 'staticmethod'
+        return one value converted to type of FieldControl 'field' and range checked
+    """
+    # number of rows inserted and committed together
+    chunk_size = 5000
+    # accepted file extensions and the format they are read as
+    FILE_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+    def __init__(self, file_path=None):
+        """Request and validate path of file to import and set names of fields read from file.
+
+        Arguments:
+        ----------
+        file_path: str (Default = None)
+            path of an existing '.csv', '.jsonl' or '.ndjson' file to import without prompting
+            user (path is requested from user if None)
+        """
+        self.field_control = FieldControl()
+        self.field_names = (self.field_control.int_field_names +
+                            self.field_control.text_field_names +
+                            self.field_control.float_field_names)
+        self.row_errors = []
+        if file_path is None:
+            self.file_path, self.file_format = self.retrieve_file_path()
+        else:
+            self.file_path = file_path
+            self.file_format = self.FILE_FORMATS.get(os.path.splitext(file_path)[1].lower())
+
+    def __str__(self):
+        """Return class attributes as string for testing."""
+        return (f"file_path: {self.file_path}, file_format: {self.file_format}, " +
+                f"field_names: {self.field_names}, row_errors: {len(self.row_errors)}")
+
+    def retrieve_file_path(self):
+        """Request path to file until an existing file with a '.csv', '.jsonl' or '.ndjson'
+            extension is entered.
+
+        Return:
+        -------
+        tuple of file path and file format ("csv" or "jsonl")
+        """
+        while True:
+            user_input = input("\nEnter path of CSV or JSON Lines file: ").strip()
+            if user_input == "":
+                print("\nA value was not entered.")
+                continue
+            file_format = self.FILE_FORMATS.get(os.path.splitext(user_input)[1].lower())
+            if file_format is None:
+                print("\nFile must have a '.csv', '.jsonl' or '.ndjson' extension")
+                continue
+            if not os.path.isfile(user_input):
+                print(f"\nFile '{user_input}' could not be found")
+                continue
+            return user_input, file_format
+
+    def read_records(self):
+        """Generator reading file one line at a time.
+
+        Yield:
+        ------
+        (line_number, record) with record as dictionary of field name to value. Record is None
+        for a JSON line that is not a valid JSON object (error added to 'row_errors')
+        """
+        with open(self.file_path, newline="", encoding="utf-8-sig") as import_file:
+            if self.file_format == "csv":
+                reader = csv.DictReader(import_file)
+                for record in reader:
+                    yield reader.line_num, record
+                return
+
+            for line_number, line in enumerate(import_file, start=1):
+                if line.strip() == "":
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                if not isinstance(record, dict):
+                    self.row_errors.append((line_number, "line is not a JSON object"))
+                    continue
+                yield line_number, record
+
+    def read_rows(self):
+        """Generator converting and validating each record of file. Rows failing validation are
+            added to 'row_errors' and not yielded.
+
+        Yield:
+        ------
+        (line_number, tuple of values in order of 'field_names')
+        """
+        for line_number, record in self.read_records():
+            try:
+                yield line_number, self.convert_record(record)
+            except ValueError as value_error:
+                self.row_errors.append((line_number, str(value_error)))
+
+    def convert_record(self, record):
+        """Convert values in 'record' to types declared in FieldControl and check value ranges.
+
+        Arguments:
+        ----------
+        record: dict
+            field name (key) with value read from file
+
+        Return:
+        -------
+        tuple of values in order of 'field_names'
+
+        Exceptions:
+        -----------
+        ValueError:
+            raised with a message for user for a missing, empty, incorrectly typed or out of
+            range value
+        """
+        field_tuples = {field[0]: field for field in self.field_control.int_list +
+                        self.field_control.text_list + self.field_control.float_list}
+        return tuple(self.convert_value(field_tuples[field_name], record.get(field_name))
+                     for field_name in self.field_names)
+
+    @staticmethod
+    def convert_value(field, value):
+        """Convert one value read from file to type of 'field' and check its value range.
+
+        Arguments:
+        ----------
+        field: tuple
+            FieldControl field tuple (field_name, data_type, and for numbers min and max)
+        value: str, int, float or None
+            value read from file
+
+        Return:
+        -------
+        converted value (text values have surrounding whitespace removed)
+
+        Exceptions:
+        -----------
+        ValueError:
+            raised with a message for user for a missing, empty, incorrectly typed or out of
+            range value
+        """
+        if value is None or str(value).strip() == "":
+            raise ValueError(f"'{field[0]}' has no value")
+        if field[1] == "text":
+            return str(value).strip()
+
+        try:
+            if field[1] == "int":
+                # reject decimals rather than truncating them ("2.5" or 2.5)
+                if isinstance(value, float) or (isinstance(value, str) and "." in value):
+                    raise ValueError
+                converted = int(value)
+            else:
+                converted = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{field[0]}' value {value!r} is not a valid {field[1]}") \
+                from None
+        if field[2] is not None and converted < field[2]:
+            raise ValueError(f"'{field[0]}' value {converted} is below minimum of {field[2]}")
+        if field[3] is not None and converted > field[3]:
+            raise ValueError(f"'{field[0]}' value {converted} is above maximum of {field[3]}")
+        return converted
+
+
+# -------------------------------------------------------------------------------------------------
+class BookBatchUpdate(BookImport):
+    """Request path of a CSV or JSON Lines file of changes to existing books and read, convert
+        and validate each change. Each row must hold the book primary_key and at least one other
+        field, fields missing or left empty in a row are not changed. Used for stock and catalog
+        reconciliations touching many books at once.
+
+    Attributes:
+    -----------
+    (as BookImport)
+    primary_key: tuple
+        primary_key field name and type books are matched by
+
+    Methods:
+    --------
+    __init__(self, file_path):
+        request and validate path of file to read changes from (if 'file_path' is not given)
+
+    read_changes(self):
+        generator yielding (primary_key value, dictionary of field name to new value) for
+        each valid row of file
+
+    convert_change(self, record):
+        return primary_key value and dictionary of converted new values from record
+    """
+    # number of changes grouped and executed together
+    chunk_size = 10000
+
+    def __init__(self, file_path=None):
+        """Request and validate path of file holding changes to books."""
+        super().__init__(file_path)
+        self.primary_key = self.field_control.primary_key
+
+    def read_changes(self):
+        """Generator converting and validating each change in file. Rows failing validation are
+            added to 'row_errors' (with line number) and not yielded.
+
+        Yield:
+        ------
+        (primary_key value, dictionary of field name to converted new value)
+        """
+        for line_number, record in self.read_records():
+            try:
+                yield self.convert_change(record)
+            except ValueError as value_error:
+                self.row_errors.append((line_number, str(value_error)))
+
+    def convert_change(self, record):
+        """Convert primary_key and each non-empty field value in 'record'.
+
+        Arguments:
+        ----------
+        record: dict
+            field name (key) with value read from file
+
+        Return:
+        -------
+        tuple of primary_key value and dictionary of field name to new value
+
+        Exceptions:
+        -----------
+        ValueError:
+            raised with a message for user for a missing or invalid primary_key, a row with no
+            fields to change or an incorrectly typed or out of range value
+        """
+        key_value = self.convert_value(self.primary_key + (None, None),
+                                       record.get(self.primary_key[0]))
+        new_values = {}
+        for field in (self.field_control.int_list + self.field_control.text_list +
+                      self.field_control.float_list):
+            value = record.get(field[0])
+            # fields not given (or left empty) keep their current value
+            if value is None or str(value).strip() == "":
+                continue
+            new_values[field[0]] = self.convert_value(field, value)
+
+        if not new_values:
+            raise ValueError("no fields to update")
+        return key_value, new_values
+
+
+# -------------------------------------------------------------------------------------------------
+class BookRestock(BookImport):
+    """Request path of a CSV or JSON Lines restock feed of books that may or may not already be
+        in the table and read, convert and validate its rows for an upsert. Each row holds every
+        field of a book. Rows matching an existing book on 'conflict_field' add their stock
+        quantity to it, other rows are inserted as new books with a primary_key allocated by the
+        database. Primary_key values are only read from the feed (and required in every row)
+        when FieldControl declares no unique field to match books on.
+
+    Attributes:
+    -----------
+    (as BookImport)
+    conflict_field: str or tuple of strings
+        field (or fields together) feed rows are matched to existing books by (first entry of
+        FieldControl 'unique_list' if declared, primary_key otherwise)
+    add_fields: string list
+        fields added to an existing book when a row matches (stock field)
+
+    Methods:
+    --------
+    __init__(self, file_path):
+        request and validate path of feed to read (if 'file_path' is not given)
+
+    convert_record(self, record): 'override'
+        return tuple of converted values, with the primary_key value first if books are
+        matched on it
+    """
+
+    def __init__(self, file_path=None):
+        """Request and validate path of restock feed and set field matched on."""
+        super().__init__(file_path)
+        primary_key = self.field_control.primary_key[0]
+        unique_list = self.field_control.unique_list
+        self.conflict_field = unique_list[0] if unique_list else primary_key
+        if self.conflict_field == primary_key:
+            self.field_names = [primary_key] + self.field_names
+        self.add_fields = [self.field_control.stock_field]
+
+    def convert_record(self, record):
+        """Convert values in 'record' as BookImport, with a primary_key value first when books
+            are matched on primary_key. A row without a primary_key could then only be
+            inserted as a duplicate of a book already in the table, so it is rejected.
+
+        Exceptions:
+        -----------
+        ValueError:
+            raised with a message for user for a missing, empty, incorrectly typed or out of
+            range value (primary_key included when books are matched on it)
+        """
+        if self.conflict_field != self.field_control.primary_key[0]:
+            return super().convert_record(record)
+        key_value = record.get(self.field_names[0])
+        if key_value is None or str(key_value).strip() == "":
+            raise ValueError(f"'{self.field_names[0]}' has no value, books are matched on " +
+                             f"'{self.field_names[0]}'")
+        key_value = self.convert_value(self.field_control.primary_key + (None, None),
+                                       key_value)
+        field_tuples = {field[0]: field for field in self.field_control.int_list +
+                        self.field_control.text_list + self.field_control.float_list}
+        return (key_value,) + tuple(
+            self.convert_value(field_tuples[field_name], record.get(field_name))
+            for field_name in self.field_names[1:])
+
+
 # -------------------------------------------------------------------------------------------------
 class BookSearch:
     """Request and validate user_input to initialise class instance with field_names and search
@@ -544,12 +1120,32 @@ class BookSearch:
     ------------
     field_control: FieldControl
         component holding primary_key field, other field names and associated types
-    fields_list: string list (default = "*" for all fields)
+    fields_list: string list (default = all field names from field_control)
         list containing field name values to return for search
     where_fields_list: string list
         list containing name of fields to perform search against
     search_values: list of type corresponding to desired search field
         list containing search values used when performing a book search in a database
+    where_operators: string list (or None)
+        comparison of each field in where_fields_list with its search value, None for '='
+    order_by: string list (or None)
+        names of fields books found are ordered by (range searches)
+    limit: int (or None)
+        maximum number of books returned, None for all matching books
+    range_limit: int
+        maximum number of books returned by a comparison or range search
+    search_text: str
+        text entered for a full-text search ('Text Search Entity' only)
+    search_mode: str
+        full-text search mode as one of "token", "prefix" or "phrase"
+    result_limit: int
+        maximum number of best ranked full-text search results to return
+    fetch_size: int
+        number of rows fetched from database at a time when all books are streamed ('Read All')
+    sort_field: str
+        name of field books are ordered by when browsed page by page ('Browse Entity')
+    page_size: int
+        number of books displayed per page when browsing
 
     Methods:
     --------
@@ -560,10 +1156,26 @@ class BookSearch:
     __str__(self):
         return string containing values for class attributes for testing
 
-    search_book_single_field(self, int_list, text_list, float_list):
+    search_book_single_field(self, int_list, text_list, float_list, allow_range):
         retrieve and validate user inputs to determine desired fields and values used
         when performing book search. Method will instantiate class attributes. Returns
         None for invalid argmuments in method call. 
+
+    search_book_range(self, field):
+        retrieve and validate comparison and value(s) for a numeric field search
+
+    retrieve_comparison(cls, field): 'classmethod'
+        request comparison of a numeric field
+
+    retrieve_comparison_value(field, operator): 'staticmethod'
+        request value(s) compared with a numeric field
+
+    search_book_full_text(self):
+        retrieve and validate user inputs for a full-text (word, prefix or phrase) search
+
+    browse_books(self):
+        retrieve and validate user inputs for sort field and optional search used to view
+        books page by page
     """
     # name(s) of field values to return in database book search.
     fields_list = None
@@ -571,6 +1183,28 @@ class BookSearch:
     where_fields_list = None
     # values corresponding to where_fields_list above
     search_values = None
+    # comparison of each where field ('=' if None), ordering and limit of books returned
+    where_operators = None
+    order_by = None
+    limit = None
+    # books returned by a comparison or range search (e.g. books below a stock level)
+    range_limit = 50
+    # comparisons offered for numeric fields (option description, operator)
+    COMPARISONS = [("Equal to", "="), ("Below", "<"), ("At or below", "<="),
+                   ("Above", ">"), ("At or above", ">="), ("Between (inclusive)", "BETWEEN")]
+    # full-text search text, mode and number of best ranked results to return
+    search_text = None
+    search_mode = None
+    result_limit = 20
+    # rows fetched from database at a time when reading all books
+    fetch_size = 500
+    # field books are ordered by and number of books per page when browsing
+    sort_field = None
+    page_size = 10
+    # full-text search modes offered to user (option description, mode)
+    FULL_TEXT_MODES = [("All words (e.g. hobbit tolkien)", "token"),
+                       ("Words starting with (e.g. hob)", "prefix"),
+                       ("Exact phrase (e.g. the hobbit)", "phrase")]
 
     def __init__(self, user_action):
         """call 'search_book_single_field' method to request and validated user_input to populate
@@ -584,31 +1218,254 @@ class BookSearch:
             create required parameters to read all books
             Can only be "Read Book" or "Search Book" to perform book search
             or "Read All" to create required parameters to search for all books
+            or "Text Search Entity" to perform a full-text search of titles and authors
         """
         self.field_control = FieldControl()
+        # include an integer primary_key as first search option allowing a single book to be
+        # looked up by its primary_key
+        self.int_search_list = list(self.field_control.int_list)
+        if self.field_control.primary_key[1] == "int":
+            self.int_search_list.insert(0, (self.field_control.primary_key[0], "int", None, None))
+
         if user_action == "Read Entity" or user_action == "Search Entity":
-            # call 'search_book' with int, text and float field_names list from field_control
-            self.search_book_single_field(self.field_control.int_list, self.field_control.text_list,
-                                          self.field_control.float_list)
+            # call 'search_book' with int, text and float field_names list from field_control,
+            # numeric fields may also be compared or searched by a range of values
+            self.search_book_single_field(self.int_search_list, self.field_control.text_list,
+                                          self.field_control.float_list, allow_range=True)
         elif user_action == "Read All":
             self.read_all_books()
+        elif user_action == "Text Search Entity":
+            self.search_book_full_text()
+        elif user_action == "Browse Entity":
+            self.browse_books()
 
     def __str__(self):
         """return class instance variables values for testing."""
         return (f"fields_list: {self.fields_list}, where_fields_list: {self.where_fields_list} " +
-                f"search_vals = {self.search_values}")
+                f"search_vals = {self.search_values}, where_operators: {self.where_operators}, " +
+                f"order_by: {self.order_by}, limit: {self.limit}, " +
+                f"search_text: {self.search_text}, search_mode: {self.search_mode}")
 
 
     def read_all_books(self):
-        """Populate fields list with '*' to return data from all fields in table."""
-        self.fields_list = ["*"]
+        """Populate fields list with all field names to return data from all fields in table."""
+        self.fields_list = self.field_control.all_field_names
         self.where_fields_list = None
         self.search_values = None
 
 
-    def search_book_single_field(self, int_list, text_list, float_list):
+    def browse_books(self):
+        """Request and validate field books should be ordered by when viewed page by page and
+            whether books should first be filtered by a single field search. Only the primary_key
+            and indexed fields are offered for ordering so each page is read with an index seek.
+
+        Exceptions:
+        -----------
+        ValueError:
+            occurs when user choice for sort option is not an integer
+        """
+        # primary_key followed by indexed fields (each listed once), a composite unique index
+        # orders by its first field
+        sort_options = [self.field_control.primary_key[0]]
+        for field_name in self.field_control.index_list + self.field_control.unique_list:
+            if not isinstance(field_name, str):
+                field_name = field_name[0]
+            if field_name not in sort_options:
+                sort_options.append(field_name)
+
+        while True:
+            print("\nEnter the number option below for how books should be ordered")
+            for count, field_name in enumerate(sort_options):
+                print(f"{count} : {field_name}")
+            try:
+                option_input = int(input("\nOption: "))
+            except ValueError:
+                print("\nPlease enter a valid number for your choice.")
+                continue
+
+            if option_input < 0 or option_input > len(sort_options) - 1:
+                print("\nInvalid. Please enter an option number within range of options")
+                continue
+            self.sort_field = sort_options[option_input]
+            break
+
+        # optionally filter books browsed with a single field search
+        while True:
+            filter_input = input("\nOnly show books matching a search? (y/n): ").lower()
+            if filter_input == "y":
+                self.search_book_single_field(self.int_search_list, self.field_control.text_list,
+                                              self.field_control.float_list)
+                break
+            if filter_input == "n":
+                self.read_all_books()
+                break
+            print("\nPlease enter 'y' or 'n'")
+
+    def search_book_full_text(self):
+        """Request and validate search mode and search text for a full-text search of fields in
+            field_control 'full_text_list' (titles and authors). Words may be partial when
+            'prefix' mode is selected.
+
+        Exceptions:
+        -----------
+        ValueError:
+            occurs when user choice for search mode is not an integer
+        """
+        self.fields_list = self.field_control.all_field_names
+
+        # request search mode until a valid option number is entered
+        while True:
+            print("\nEnter the number option below for how you want to perform search")
+            for count, mode in enumerate(self.FULL_TEXT_MODES):
+                print(f"{count} : {mode[0]}")
+            try:
+                option_input = int(input("\nOption: "))
+            except ValueError:
+                print("\nPlease enter a valid number for your choice.")
+                continue
+
+            if option_input < 0 or option_input > len(self.FULL_TEXT_MODES) - 1:
+                print("\nInvalid. Please enter an option number within range of options")
+                continue
+            self.search_mode = self.FULL_TEXT_MODES[option_input][1]
+            break
+
+        # request non-empty search text containing at least one word
+        while True:
+            user_value = input("\nEnter the text to search for in book " +
+                               f"{' and '.join(self.field_control.full_text_list)}: ")
+            if user_value.strip() == "":
+                print("\nA value was not recieved")
+                continue
+            self.search_text = user_value.strip()
+            break
+
+    def search_book_range(self, field):
+        """Request comparison of numeric 'field' ('COMPARISONS') and value, or lowest and
+            highest values of a range, each converted and checked against the field's value range
+            in field_control. Books found are ordered by field (then primary_key) and limited to
+            'range_limit'. If the search is bounded at or below the level of a partial index on
+            field ('partial_index_list'), the index condition is added so the index is used.
+
+        Arguments:
+        ----------
+        field: tuple
+            FieldControl field tuple (field_name, data_type, minimum, maximum)
+
+        Return:
+        -------
+        False if user chose 'Equal to' (value is then requested as for any search), otherwise
+        True with 'where_fields_list', 'where_operators', 'search_values', 'order_by' and
+        'limit' set
+
+        Exceptions:
+        -----------
+        ValueError:
+            occurs when option is not an integer or value is of incorrect type or out of range
+        """
+        operator = self.retrieve_comparison(field)
+        if operator == "=":
+            return False
+        search_value = self.retrieve_comparison_value(field, operator)
+
+        self.where_fields_list = [field[0]]
+        self.where_operators = [operator]
+        self.search_values = [search_value]
+        self.order_by = [field[0], self.field_control.primary_key[0]]
+        self.limit = self.range_limit
+
+        # repeat condition of a partial index covering every book searched for (sqlite only
+        # uses a partial index when the query holds its condition)
+        if operator == "BETWEEN":
+            highest_value = search_value[1]
+        elif operator in ("<", "<="):
+            highest_value = search_value
+        else:
+            highest_value = None
+        for index_field, level in self.field_control.partial_index_list:
+            if index_field == field[0] and highest_value is not None and highest_value <= level:
+                self.where_fields_list.append(index_field)
+                self.where_operators.append("<=")
+                self.search_values.append(level)
+                break
+        return True
+
+    @classmethod
+    def retrieve_comparison(cls, field):
+        """Request how numeric 'field' should compare with a value, one of 'COMPARISONS'.
+
+        Arguments:
+        ----------
+        field: tuple
+            FieldControl field tuple (field_name, data_type, minimum, maximum)
+
+        Return:
+        -------
+        str - operator of chosen comparison ('=', '<', '<=', '>', '>=' or 'BETWEEN')
+
+        Exceptions:
+        -----------
+        ValueError:
+            occurs when option is not an integer
+        """
+        while True:
+            print(f"\nEnter the number option below for how book {field[0]} should compare")
+            for count, comparison in enumerate(cls.COMPARISONS):
+                print(f"{count} : {comparison[0]}")
+            try:
+                option_input = int(input("\nOption: "))
+            except ValueError:
+                print("\nPlease enter a valid number for your choice.")
+                continue
+
+            if option_input < 0 or option_input > len(cls.COMPARISONS) - 1:
+                print("\nInvalid. Please enter an option number within range of options")
+                continue
+            return cls.COMPARISONS[option_input][1]
+
+    @staticmethod
+    def retrieve_comparison_value(field, operator):
+        """Request value compared with numeric 'field' by 'operator', or lowest and highest
+            values for 'BETWEEN', until they are of field type and within its value range.
+
+        Arguments:
+        ----------
+        field: tuple
+            FieldControl field tuple (field_name, data_type, minimum, maximum)
+        operator: str
+            operator returned by 'retrieve_comparison()'
+
+        Return:
+        -------
+        converted value, or tuple of (lowest, highest) for 'BETWEEN'
+
+        Exceptions:
+        -----------
+        ValueError:
+            occurs when value is of incorrect type or out of range
+        """
+        while True:
+            try:
+                if operator == "BETWEEN":
+                    lowest = BookImport.convert_value(
+                        field, input(f"\nEnter the lowest {field[0]}: "))
+                    highest = BookImport.convert_value(
+                        field, input(f"\nEnter the highest {field[0]}: "))
+                    if lowest > highest:
+                        print(f"\nLowest {field[0]} must not be above highest {field[0]}")
+                        continue
+                    return (lowest, highest)
+                return BookImport.convert_value(
+                    field, input(f"\nEnter a value for the book(s) {field[0]}: "))
+            except ValueError as value_error:
+                print(f"\n{value_error}")
+                continue
+
+    def search_book_single_field(self, int_list, text_list, float_list, allow_range=False):
         """determine search criteria from user to perform a book(s) search. Method requests and
             validates one field_name and one corresponding search_value used for search in database.
+            With 'allow_range' a numeric field may instead be compared with a value or range of
+            values ('search_book_range()').
 
         Keyword Arguments:
         ------------------
@@ -620,6 +1477,8 @@ class BookSearch:
             names of fields corresponding to float (Real) values in a database
         NOTE: at least one list must be populated. For book implementation the 'id'
                 primary key should be included in the 'int_list'
+        allow_range: bool (Default = False)
+            offer comparisons other than equality for integer and float fields
 
         Exceptions:
         -----------
@@ -639,8 +1498,8 @@ class BookSearch:
         values_recieved = False
         while True:
             try:
-                # set to return all fields as default
-                self.fields_list = ["*"]
+                # set to return all fields as default (named explicitly so projection is exact)
+                self.fields_list = self.field_control.all_field_names
 
                 # store total number of options to perform search by
                 search_count = 0
@@ -652,9 +1511,8 @@ class BookSearch:
                 print(
                     "\nEnter the number option below for how you want to perform search")
                 # move through each list to print options together
-                for count, field_name in enumerate(self.field_control.int_field_names +
-                                                   self.field_control.text_field_names +
-                                                   self.field_control.float_field_names):
+                for count, field_name in enumerate([tup[0] for tup in
+                                                    int_list + text_list + float_list]):
                     # print option number and field_name to user
                     print(f"{count} : {field_name}")
 
@@ -688,6 +1546,14 @@ class BookSearch:
                     self.where_fields_list = [
                         search_option_field[option_input][0]]
 
+                    # numeric fields may be searched by a comparison or range of values,
+                    # 'search_book_range()' returns False if user chooses an equal value
+                    if allow_range and search_option_field[option_input][1] != "text_list":
+                        field = [tup for tup in int_list + float_list
+                                 if tup[0] == search_option_field[option_input][0]][0]
+                        if self.search_book_range(field):
+                            break
+
                     # Request and validate user_input value for selected field above
                     # first list value in dict 'seach_option_value' holds field name
                     while True:
@@ -707,7 +1573,7 @@ class BookSearch:
                             int_tup = ()
                             # Retrieve possible allowed value range from field_control,
                             # by iterating through all tuples trying to match field names
-                            for tup in self.field_control.int_list:
+                            for tup in int_list:
                                 # tup[0] = field_name
                                 if search_option_field[option_input][0] == tup[0]:
                                     int_tup = tup
@@ -748,7 +1614,7 @@ class BookSearch:
                             float_tup = ()
                             # Retrieve possible allowed value range from field_control,
                             # by iterating through all tuples trying to match field names
-                            for tup in self.field_control.float_list:
+                            for tup in float_list:
                                 # tup[0] = field_name
                                 if search_option_field[option_input][0] == tup[0]:
                                     float_tup = tup
@@ -780,7 +1646,13 @@ class BookSearch:
                                     "\nInvalid. Please enter a valid number")
                                 continue
 
-                        # at this point, value has been recieved and validated from user
+                        # at this point, value has been recieved and validated from user.
+                        # store numeric values as numbers so search compares against field
+                        # type directly and can use table indexes
+                        if search_option_field[option_input][1] == "int_list":
+                            user_value = int(user_value)
+                        elif search_option_field[option_input][1] == "float_list":
+                            user_value = float(user_value)
                         self.search_values = [user_value]
                         # terminate main_loop
                         values_recieved = True
@@ -799,7 +1671,8 @@ class BookSearch:
 # -------------------------------------------------------------------------------------------------
 class BookUpdate:
     """Retrieve desired user field and associated value to perform update to field. Update is only
-        performed using primary key for 'book' entity.
+        performed using primary key for 'book' entity. Also retrieves change to stock quantity
+        of a book for an atomic stock adjustment ('Adjust Stock Entity').
 
         Attributes:
         -----------
@@ -810,16 +1683,30 @@ class BookUpdate:
         update_tuple: tuple
             holds (in order) new value for field to be updated and primary key value
             where update should be performed
+        stock_field: str
+            name of stock quantity field adjusted ('Adjust Stock Entity' only)
+        primary_value: type controlled by FieldControl
+            primary_key value of book whose stock is adjusted
+        quantity_change: int
+            amount added to stock quantity (negative to subtract)
+        stock_range: tuple
+            (minimum, maximum) stock quantity allowed after adjustment, either may be None
 
         Methods:
         --------
-        __init__(self):
+        __init__(self, user_action):
             initialise attributes of BookUpdate instance and call 'update_book_single_field()'
-            to retrieve and validate user_inputs for update
+            or 'adjust_book_stock()' to retrieve and validate user_inputs for update
 
         __str__(self):
             testing method to print values in 'field_names' and 'update_tuple' attributes
 
+        retrieve_primary_value(self, purpose):
+            request, retrieve and validate primary_key value of book to change
+
+        adjust_book_stock(self):
+            request, retrieve and validate book and change to its stock quantity
+
         update_book_single_field(self):
             request, retrieve and validate user_input for desired field and value for update
             of book entity
@@ -829,11 +1716,23 @@ class BookUpdate:
         Value_Error:
             raised if user enters a value not correspoding to required 'int' or 'float' types
         """
+    # stock adjustment values (only set for 'Adjust Stock Entity')
+    stock_field = None
+    primary_value = None
+    quantity_change = None
+    stock_range = None
 
-    def __init__(self):
+    def __init__(self, user_action="Update Entity"):
         """Constructor to initialise field_control component controlling field names, types and 
-            ranges (for numeric fields). Calls 'update_book_single_field()' method to retrieve and
-            validate  user inputs used to set class attributes.
+            ranges (for numeric fields). Calls 'update_book_single_field()' method (or
+            'adjust_book_stock()' for a stock adjustment) to retrieve and validate user inputs
+            used to set class attributes.
+
+        Arguments:
+        ----------
+        user_action: str (Default = "Update Entity")
+            "Update Entity" to set a new value for one field or "Adjust Stock Entity" to add to
+            or subtract from book stock quantity
 
         Attributes:
         -----------
@@ -848,18 +1747,34 @@ class BookUpdate:
         self.field_control = FieldControl()
         self.field_names = []
         self.update_tuple = []
-        # call 'update_book_single_field()' to initialise attributes with user inputs
-        self.update_book_single_field()
+        if user_action == "Adjust Stock Entity":
+            self.adjust_book_stock()
+        else:
+            # call 'update_book_single_field()' to initialise attributes with user inputs
+            self.update_book_single_field()
 
     def __str__(self):
         """Return attributes 'field_name' and 'update_tuple' values for testing."""
-        return f"field_names_list: {self.field_names}, update_tuple: {self.update_tuple}"
+        return (f"field_names_list: {self.field_names}, update_tuple: {self.update_tuple}, " +
+                f"stock_field: {self.stock_field}, quantity_change: {self.quantity_change}")
 
-    def update_book_single_field(self):
-        """Method to request, retrieve and validate user_input for data to be used for a 'book'
-        entity update.
-        """
+    def retrieve_primary_value(self, purpose):
+        """Request, retrieve and validate user_input for primary_key of book to change.
+
+        Arguments:
+        ----------
+        purpose: str
+            description of change shown in input request (e.g. "update")
+
+        Return:
+        -------
+        primary_key value converted to type of primary_key in field_control
 
+        Exceptions:
+        -----------
+        ValueError:
+            raised if user enters a value not corresponding to 'int' or 'float' primary_key type
+        """
         # retrieve data_type of primary key used for book update
         primary_key_type = self.field_control.primary_key[1]
 
@@ -868,7 +1783,7 @@ class BookUpdate:
             # request user_input for primary key
             # field_control.primary_key[0] = field_name of primary key
             primary_search_value = input("\nPlease enter the book " +
-                                         f"{self.field_control.primary_key[0]} for update: ")
+                                         f"{self.field_control.primary_key[0]} for {purpose}: ")
 
             # check for empty input
             if primary_search_value == "":
@@ -880,7 +1795,7 @@ class BookUpdate:
             if primary_key_type == "int":
                 # attempt cast of user input for primary key to int:
                 try:
-                    int(primary_search_value)
+                    return int(primary_search_value)
                 except ValueError:
                     print("\nPlease enter a valid, non-decimal number")
                     continue
@@ -888,14 +1803,50 @@ class BookUpdate:
             elif primary_key_type == "float":
                 # attempt cast of user input for primary_key to float:
                 try:
-                    float(primary_search_value)
+                    return float(primary_search_value)
                 except ValueError:
                     print("\nPlease enter a valid number")
                     continue
 
-            # at this point primary key is of valid type, end loop
+            # at this point primary key is of valid type
+            return primary_search_value
+
+    def adjust_book_stock(self):
+        """Request, retrieve and validate primary_key of book and a non-zero change to its stock
+            quantity (negative for a sale, positive for a delivery). Sets 'stock_field',
+            'primary_value', 'quantity_change' and stock range allowed after the change.
+
+        Exceptions:
+        -----------
+        ValueError:
+            raised if user enters a quantity change that is not a whole number
+        """
+        stock_tuple = [field for field in self.field_control.int_list
+                       if field[0] == self.field_control.stock_field][0]
+        self.stock_field = stock_tuple[0]
+        # stock may not move outside of the range declared for field in field_control
+        self.stock_range = (stock_tuple[2], stock_tuple[3])
+        self.primary_value = self.retrieve_primary_value("stock adjustment")
+
+        while True:
+            try:
+                self.quantity_change = int(input(
+                    f"\nEnter change to book {self.stock_field} (e.g. -1 for a sale, " +
+                    "20 for a delivery): "))
+            except ValueError:
+                print("\nPlease enter a valid, non-decimal number")
+                continue
+            if self.quantity_change == 0:
+                print("\nA change of 0 does not adjust stock")
+                continue
             break
 
+    def update_book_single_field(self):
+        """Method to request, retrieve and validate user_input for data to be used for a 'book'
+        entity update.
+        """
+        primary_search_value = self.retrieve_primary_value("update")
+
         # combine tuple lists in field_control into single list containing all tuples
         # all tuples hold: 'field_name', 'data_type'
         # tuples for numeric lists also hold: 'min_value' and 'max-value' - both may be None
@@ -1026,7 +1977,10 @@ class BookUpdate:
 # -------------------------------------------------------------------------------------------------
 class BookDelete:
     """Retrieve primary_key field name from field_controller, request and retrieve associated value
-        for primary_key matching data_type for desired row deletion.
+        for primary_key matching data_type for desired row deletion. For a bulk deletion
+        ('Bulk Delete Entities') either a file of primary_key values or a field and value all
+        deleted books must match (equal to, or for numeric fields a comparison or range as in
+        'BookSearch') are retrieved instead.
 
         Attributes:
         -----------
@@ -1036,10 +1990,24 @@ class BookDelete:
             name of primary_key_field
         primary_value: type controlled by FieldControl (int, string or float)
             value for primary_key corresponding to desired row to be deleted
+        key_file: BookImport
+            file of primary_key values to delete (bulk deletion by file only)
+        where_fields_list: string list
+            name of field books to delete must match (bulk deletion by field only)
+        search_values: list
+            value books to delete must have for field in 'where_fields_list' ((lowest, highest)
+            pair for 'BETWEEN')
+        where_operators: string list
+            comparison of field in 'where_fields_list' with its value ('=', '<', '<=', '>',
+            '>=' or 'BETWEEN')
+        row_errors: list of tuples
+            (line_number, reason) for invalid primary_key values in 'key_file'
+        chunk_size: int
+            largest number of books deleted in one transaction
 
         Methods:
         --------
-        __init__(self):
+        __init__(self, user_action):
             initialise attributes of BookDelete instance
 
         __str__(self):
@@ -1049,6 +2017,13 @@ class BookDelete:
             request, retrieve and validate user_input for primary_key to perform row deletion
             in a database
 
+        bulk_delete_books(self):
+            request, retrieve and validate file of primary_key values or field and value of
+            books to delete
+
+        read_key_values(self):
+            generator yielding valid primary_key values read from 'key_file'
+
         Exceptions:
         -----------
         Value_Error:
@@ -1056,9 +2031,22 @@ class BookDelete:
             'int' or 'float' types
         """
 
-    def __init__(self):
+    # bulk deletion values (only set for 'Bulk Delete Entities')
+    key_file = None
+    where_fields_list = None
+    search_values = None
+    where_operators = None
+    chunk_size = 1000
+
+    def __init__(self, user_action="Delete Entity"):
         """Constructor to initialise BookDelete instance.
 
+        Arguments:
+        ----------
+        user_action: str (Default = "Delete Entity")
+            "Delete Entity" to delete one book by primary_key or "Bulk Delete Entities" to
+            delete books listed in a file or matching a field value
+
         Attributes:
         -----------
         field_control: FieldControl
@@ -1071,8 +2059,13 @@ class BookDelete:
         self.field_control = FieldControl()
         # set primary_key field name defined by primary_key in FieldControl Class
         self.primary_key_field = self.field_control.primary_key[0]
-        # retrieve user input value for primary key
-        self.primary_value = self.retrieve_deletion_value()
+        self.primary_value = None
+        self.row_errors = []
+        if user_action == "Bulk Delete Entities":
+            self.bulk_delete_books()
+        else:
+            # retrieve user input value for primary key
+            self.primary_value = self.retrieve_deletion_value()
 
     def __str__(self):
         """Return values for primary key field and associated values for testing"""
@@ -1117,3 +2110,180 @@ class BookDelete:
                 except ValueError:
                     print("\nPlease Enter a valid number")
                     continue
+
+    def bulk_delete_books(self):
+        """Request how books should be chosen for deletion: by a CSV or JSON Lines file holding a
+            primary_key column, or by a single field value all deleted books must match (value
+            converted and range checked against field_control). Numeric fields may instead be
+            compared with a value or range of values (for example all books with qty below 5).
+            Deletion by field value must be confirmed by user; declining leaves no field set so
+            nothing is deleted.
+
+        Exceptions:
+        -----------
+        ValueError:
+            occurs when user choice for option is not an integer or value does not match type
+            of field
+        """
+        while True:
+            print("\nEnter the number option below for how books should be chosen for deletion")
+            print(f"0 : {self.primary_key_field} values listed in a CSV or JSON Lines file")
+            print("1 : all books matching a field value")
+            try:
+                option_input = int(input("\nOption: "))
+            except ValueError:
+                print("\nPlease enter a valid number for your choice.")
+                continue
+            if option_input not in (0, 1):
+                print("\nInvalid. Please enter an option number within range of options")
+                continue
+            break
+
+        if option_input == 0:
+            # BookImport requests and validates path of file
+            self.key_file = BookImport()
+            return
+
+        # fields (other than primary_key) books may be matched by
+        field_tuples = (self.field_control.int_list + self.field_control.text_list +
+                        self.field_control.float_list)
+        while True:
+            print("\nEnter the number option below for field books to delete must match")
+            for count, field in enumerate(field_tuples):
+                print(f"{count} : {field[0]}")
+            try:
+                option_input = int(input("\nOption: "))
+            except ValueError:
+                print("\nPlease enter a valid number for your choice.")
+                continue
+            if option_input < 0 or option_input > len(field_tuples) - 1:
+                print("\nInvalid. Please enter an option number within range of options")
+                continue
+            field = field_tuples[option_input]
+            break
+
+        # numeric fields may be compared with a value or range as in a search, values are
+        # converted and range checked as for file imports
+        if field[1] == "text":
+            operator = "="
+            while True:
+                try:
+                    value = BookImport.convert_value(
+                        field, input(f"\nEnter {field[0]} of books to delete: "))
+                except ValueError as value_error:
+                    print(f"\n{value_error}")
+                    continue
+                break
+        else:
+            operator = BookSearch.retrieve_comparison(field)
+            value = BookSearch.retrieve_comparison_value(field, operator)
+
+        if operator == "BETWEEN":
+            condition = f"{field[0]} between {value[0]!r} and {value[1]!r}"
+        else:
+            condition = f"{field[0]} {operator} {value!r}"
+        confirm = input(f"\nDelete ALL books with {condition}? (y/n): ").lower()
+        if confirm == "y":
+            self.where_fields_list = [field[0]]
+            self.search_values = [value]
+            self.where_operators = [operator]
+        else:
+            print("\nBulk deletion cancelled")
+
+    def read_key_values(self):
+        """Generator reading primary_key values from 'key_file'. Invalid values are added to
+            'row_errors' (with line number) and not yielded.
+
+        Yield:
+        ------
+        primary_key value converted to type of primary_key in field_control
+        """
+        key_field = self.field_control.primary_key + (None, None)
+        for line_number, record in self.key_file.read_records():
+            try:
+                yield self.key_file.convert_value(key_field, record.get(self.primary_key_field))
+            except ValueError as value_error:
+                self.row_errors.append((line_number, str(value_error)))
+        self.row_errors.extend(self.key_file.row_errors)
+
+
+# -------------------------------------------------------------------------------------------------
+class BookReport:
+    """Set fields and thresholds of the stock report: total stock held, stock held for each
+        author and number of books at or below low stock levels. The report is computed by the
+        database, only its few result rows are returned.
+
+    Attributes:
+    -----------
+    field_control: FieldControl
+        component holding primary_key field, other field names and associated types
+    stock_field: str
+        name of integer field holding stock quantity (field_control 'stock_field')
+    group_field: str
+        name of field stock is totalled by (GROUP_FIELD)
+    group_limit: int
+        number of groups (authors) with most stock listed
+    low_stock_levels: list of int
+        quantities books are counted at or below, LOW_STOCK_LEVELS with any level entered by
+        user
+
+    Methods:
+    --------
+    __init__(self):
+        initialise report fields from FieldControl and call 'request_low_stock_level()'
+
+    __str__(self):
+        return string of class attributes for testing
+
+    request_low_stock_level(self):
+        request and validate an optional low stock level added to 'low_stock_levels'
+    """
+    # field stock is totalled by and number of groups listed
+    GROUP_FIELD = "author"
+    group_limit = 10
+    # stock levels books are always counted at or below (0 counts books out of stock)
+    LOW_STOCK_LEVELS = [0, 5, 10]
+
+    def __init__(self):
+        """Initialise report fields from FieldControl and request optional low stock level."""
+        self.field_control = FieldControl()
+        self.stock_field = self.field_control.stock_field
+        self.group_field = self.GROUP_FIELD
+        self.low_stock_levels = list(self.LOW_STOCK_LEVELS)
+
+        # perform check that group field is a declared field
+        if self.group_field not in self.field_control.all_field_names:
+            print(f"Error Log - Report group field '{self.group_field}' is not a declared field.")
+
+        self.request_low_stock_level()
+
+    def __str__(self):
+        """return class instance variables values for testing."""
+        return (f"stock_field: {self.stock_field}, group_field: {self.group_field}, " +
+                f"group_limit: {self.group_limit}, low_stock_levels: {self.low_stock_levels}")
+
+    def request_low_stock_level(self):
+        """Request a low stock level to count books at or below in addition to
+            'LOW_STOCK_LEVELS'. Level is converted and checked against the value range of the
+            stock field in field_control. Empty input keeps the default levels.
+
+        Exceptions:
+        -----------
+        ValueError:
+            occurs when user input is not an integer or is outside of stock field range
+        """
+        stock_field = [field for field in self.field_control.int_list
+                       if field[0] == self.stock_field][0]
+        while True:
+            user_value = input("\nEnter a low stock level to report on " +
+                               f"(press Enter for {', '.join(map(str, self.LOW_STOCK_LEVELS))}): ")
+            if user_value.strip() == "":
+                return
+            try:
+                level = BookImport.convert_value(stock_field, user_value.strip())
+            except ValueError as value_error:
+                print(f"\n{value_error}")
+                continue
+            if level not in self.low_stock_levels:
+                self.low_stock_levels.append(level)
+            return
@@ -14,8 +14,14 @@ Use of this module should be done only through class 'EntityPersistanceSingleKey
 'create_and_execute_query()'
 
 user_action attribute used for Entity and Peristance classes initialisation and matching can only
- be one of the following: 'Create Default Table', 'Create Entity', 'Search Entity' or 'Read Entity'
- or 'Read All', 'Update Entity' and 'Delete Entity'
+ be one of the following: 'Create Default Table', 'Create Entity', 'Import Entities',
+ 'Restock Entities', 'Search Entity' or 'Read Entity' or 'Read All', 'Text Search Entity',
+ 'Browse Entity', 'Update Entity', 'Batch Update Entities', 'Adjust Stock Entity',
+ 'Delete Entity', 'Bulk Delete Entities' and 'Stock Report'
+
+Single-row writes ('Create Entity', 'Update Entity', 'Adjust Stock Entity' and 'Delete Entity')
+ are queued for the single writer thread of the database ('write_queue.WriteQueue') and their
+ result waited for, so writes from several threads never fail waiting for the database lock.
 
 Module Extension Recommendations:
 ---------------------------------
@@ -78,6 +84,8 @@ PersistanceSingleKeyControl:
 """
 from Modules.business_logic import book
 from Modules.persistance_layer import persistence_classes_single_key
+from Modules.persistance_layer import stock_reports
+from Modules.persistance_layer import write_queue
 
 class EntityPersistanceSingleKeyControl:
     """Class used to hold database_name, table_name and desired user_action. Initialises
@@ -288,8 +296,12 @@ class PersistanceSingleKeyControl:
 
         Return:
         -------
-        Function may return None, a boolean value or a list of values depending on desired
-        user_action and Entity Object
+        Function may return None, a boolean value, a list of values, a generator of rows
+        ('Read All'), a tuple of rows changed and rejected rows ('Import Entities',
+        'Restock Entities' and 'Batch Update Entities'), a generator of deletion progress with
+        rejected rows ('Bulk Delete Entities'), a pager reading pages of rows ('Browse Entity'),
+        a tuple of report tables ('Stock Report') or the primary_key value of a newly created
+        entity ('Create Entity') depending on desired user_action and Entity Object
         """
 
         # confirm that an Entity Object has been created to have access to correct and relevant
@@ -316,10 +328,25 @@ class PersistanceSingleKeyControl:
 
                     # Create instance of 'CreateTableSingleKey' class which initialises and
                     # manages database connection. Call its 'execute()' method to create and execute
-                    # query to create a new table with name 'table_name'
+                    # query to create a new table with name 'table_name' and its indexes
                     persistence_classes_single_key.CreateTableSingleKey(
                         self.database_name, self.table_name, primary_key,
-                        int_fields, text_fields, float_fields).execute()
+                        int_fields, text_fields, float_fields,
+                        self.entity_object.index_list, self.entity_object.unique_list,
+                        self.entity_object.partial_index_list).execute()
+                else:
+                    # table exists, create any indexes missing from tables made before fields
+                    # were marked as indexed in Entity Object (no change if all exist)
+                    persistence_classes_single_key.CreateIndexes(
+                        self.database_name, self.table_name, self.entity_object.index_list,
+                        self.entity_object.unique_list,
+                        self.entity_object.partial_index_list).execute()
+
+                # create full-text index for text fields if not already present
+                if self.entity_object.full_text_list:
+                    persistence_classes_single_key.CreateFullTextIndex(
+                        self.database_name, self.table_name, self.entity_object.primary_key,
+                        self.entity_object.full_text_list).execute()
 
             # if user wishes to perform an action requiring a table to already exist in the database
             elif self.user_action != "Create Default Table":
@@ -347,17 +374,17 @@ class PersistanceSingleKeyControl:
                         # determine primary_key datatype
                         primary_key_type = primary_key_data[1]
 
-                        # if type is integer, retrieve last row from table to increment primary
-                        # key value for new (current) row by 1
-                        if primary_key_type == "int":
-                            # increment primary_key int value for current row by 1 from last in
-                            # database table
-                            row_primary_value = persistence_classes_single_key.ReturnLastId(
-                                self.database_name, self.table_name, primary_key_name).execute()
-                            row_primary_value += 1
-
-                        # primary key is not an integer (not recommended)
-                        else:
+                        # names of fields in order values are supplied from entity object
+                        field_names = (self.entity_object.field_control.int_field_names +
+                                       self.entity_object.field_control.text_field_names +
+                                       self.entity_object.field_control.float_field_names)
+                        values_tup = tuple(int_values + text_values + float_values)
+
+                        # if type is integer, primary_key is not supplied. sqlite allocates next
+                        # primary_key value within the insert itself (one statement, safe for
+                        # concurrent writers)
+                        if primary_key_type != "int":
+                            # primary key is not an integer (not recommended)
                             # loop until user enters a non-empty value for primary_key
                             while True:
                                 row_primary_value = input(
@@ -367,28 +394,66 @@ class PersistanceSingleKeyControl:
                                     continue
                                 else:
                                     break
-
-                        # 'InsertData' Class requires values to be in one tuple, stored in a list
-                        # create tuple with primary_key value and all values retrieved from user as
-                        # ints, strings or floats
-                        values_tup = (row_primary_value, )
-                        values_tup += tuple(int_values +
-                                            text_values + float_values)
-                        # convert tuple with values to list for correct passing to InsertData
-                        # constructor
-                        values_list = []
-                        values_list.append(values_tup)
-
-                        # Create instance of 'CreateTableSingleKey' class which initialises and
-                        # manages database connection. Call 'execute()' method to create and execute
-                        # query to create and add new row to table
-                        # returns True for more than one row affected or False for none affected
-                        return persistence_classes_single_key.InsertData(
-                            self.database_name, self.table_name, values_list).execute()
+                            field_names = [primary_key_name] + field_names
+                            values_tup = (row_primary_value, ) + values_tup
+
+                        # Queue 'InsertData' for the database writer thread which creates and
+                        # executes query to add new row to table and commits it with other
+                        # waiting writes. 'InsertData' requires values to be in one tuple,
+                        # stored in a list
+                        insert_future = write_queue.WriteQueue.for_database(
+                            self.database_name).submit(
+                            persistence_classes_single_key.InsertData, self.database_name,
+                            self.table_name, [values_tup], field_names)
+
+                        # return primary_key of new row or False if no row was added
+                        if insert_future.result():
+                            if primary_key_type == "int":
+                                return insert_future.query.new_row_id
+                            return row_primary_value
+                        return False
+
+                    # user wishes to add entities read from a file. Rows are read, validated
+                    # and inserted one chunk at a time as entity 'read_rows()' is consumed
+                    elif self.user_action == "Import Entities":
+                        import_query = persistence_classes_single_key.BulkInsertData(
+                            self.database_name, self.table_name, self.entity_object.read_rows(),
+                            self.entity_object.field_names, self.entity_object.chunk_size)
+                        if import_query.execute() is None:
+                            return None
+
+                        # return number of rows added and (line_number, reason) of rows
+                        # rejected by validation or by the database, in file order
+                        return (import_query.inserted_count,
+                                sorted(self.entity_object.row_errors + import_query.row_errors))
+
+                    # user wishes to merge a restock feed into the table. Each row inserts a new
+                    # entity or adds its stock to the entity matched on the conflict field, in
+                    # one statement per row (no lookup before each write)
+                    elif self.user_action == "Restock Entities":
+                        restock_query = persistence_classes_single_key.UpsertData(
+                            self.database_name, self.table_name, self.entity_object.read_rows(),
+                            self.entity_object.field_names, self.entity_object.conflict_field,
+                            self.entity_object.add_fields,
+                            chunk_size=self.entity_object.chunk_size)
+                        if restock_query.execute() is None:
+                            return None
+
+                        # return number of rows added or restocked and (line_number, reason) of
+                        # rows rejected, in file order
+                        return (restock_query.inserted_count,
+                                sorted(self.entity_object.row_errors + restock_query.row_errors))
+
+                    # user wishes to read all entities in a table. Rows are streamed from
+                    # database in chunks of entity 'fetch_size' as returned generator is consumed
+                    elif self.user_action == "Read All":
+                        return persistence_classes_single_key.ReadData(
+                            self.database_name, self.table_name, self.entity_object.fields_list
+                            ).execute_stream(self.entity_object.fetch_size)
 
                     # user wishes to read / search for an entity in a table
                     elif self.user_action == "Read Entity" or \
-                    self.user_action == "Search Entity" or self.user_action == "Read All":
+                    self.user_action == "Search Entity":
 
                         # retrieve desired field_list values to return
                         return_fields_list = self.entity_object.fields_list
@@ -398,10 +463,35 @@ class PersistanceSingleKeyControl:
                         search_values = self.entity_object.search_values
 
                         # pass above search attributes to persistance control class to return row(s)
-                        # from table. No matching row returns empty list
+                        # from table, comparing fields with operators of a range search (sorted
+                        # and limited). No matching row returns empty list
                         return persistence_classes_single_key.ReadData(
                             self.database_name, self.table_name, return_fields_list,
-                            where_fields_list, search_values).execute()
+                            where_fields_list, search_values,
+                            where_operators=self.entity_object.where_operators,
+                            order_by=self.entity_object.order_by,
+                            limit=self.entity_object.limit).execute()
+
+                    # user wishes to view entities page by page. A pager is returned that
+                    # reads each page from database when requested
+                    elif self.user_action == "Browse Entity":
+                        return persistence_classes_single_key.KeysetPager(
+                            self.database_name, self.table_name, self.entity_object.fields_list,
+                            self.entity_object.field_control.primary_key[0],
+                            self.entity_object.sort_field, self.entity_object.page_size,
+                            self.entity_object.where_fields_list,
+                            self.entity_object.search_values)
+
+                    # user wishes to search for entities by words in text fields
+                    elif self.user_action == "Text Search Entity":
+
+                        # pass search text, mode and result limit from entity to full-text search
+                        # returning best ranked row(s). No matching row returns empty list
+                        return persistence_classes_single_key.FullTextSearch(
+                            self.database_name, self.table_name, self.entity_object.fields_list,
+                            self.entity_object.field_control.primary_key[0],
+                            self.entity_object.search_text, self.entity_object.search_mode,
+                            self.entity_object.result_limit).execute()
 
                     # user wishes to update (change info) of an entity
                     elif self.user_action == "Update Entity":
@@ -412,11 +502,45 @@ class PersistanceSingleKeyControl:
                         # retrieve tuple of new value and primary_key field value
                         update_tuple = self.entity_object.update_tuple
 
-                        # pass above attributes to persistance control class to perform update.
+                        # queue update with above attributes for database writer thread.
                         # returns True if update was successful and False if not
-                        return persistence_classes_single_key.UpdateData(
-                            self.database_name, self.table_name, fields_list,
-                            update_tuple).execute()
+                        return write_queue.WriteQueue.for_database(self.database_name).submit(
+                            persistence_classes_single_key.UpdateData, self.database_name,
+                            self.table_name, fields_list, update_tuple).result()
+
+                    # user wishes to apply many changes read from a file to existing entities.
+                    # Changes are grouped by fields changed and applied in one transaction
+                    elif self.user_action == "Batch Update Entities":
+                        primary_key_name = self.entity_object.primary_key[0]
+                        update_query = persistence_classes_single_key.BatchUpdateData(
+                            self.database_name, self.table_name, primary_key_name,
+                            self.entity_object.read_changes(), self.entity_object.chunk_size)
+                        if update_query.execute() is None:
+                            return None
+
+                        # return number of rows updated and (reference, reason) for each change
+                        # rejected by validation (file line) or not applied (primary_key value)
+                        return (update_query.updated_count,
+                                [(f"line {line_number}", reason) for line_number, reason
+                                 in self.entity_object.row_errors] +
+                                [(f"{primary_key_name} {key_value}", reason) for key_value, reason
+                                 in update_query.row_errors])
+
+                    # user wishes to add to or subtract from stock quantity of an entity
+                    elif self.user_action == "Adjust Stock Entity":
+
+                        # change is applied and checked against allowed stock range in one
+                        # statement. Returns new quantity or False if entity was not found or
+                        # would be left with stock outside of range. Queued for database
+                        # writer thread
+                        return write_queue.WriteQueue.for_database(self.database_name).submit(
+                            persistence_classes_single_key.AdjustQuantity, self.database_name,
+                            self.table_name, self.entity_object.stock_field,
+                            self.entity_object.field_control.primary_key[0],
+                            self.entity_object.primary_value,
+                            self.entity_object.quantity_change,
+                            self.entity_object.stock_range[0],
+                            self.entity_object.stock_range[1]).result()
 
                     # user wishes to delete an entity
                     elif self.user_action == "Delete Entity":
@@ -426,11 +550,59 @@ class PersistanceSingleKeyControl:
                         # retrieve primary_key value from Entity Object
                         primary_value = self.entity_object.primary_value
 
-                        # pass above attributes to persistance control class to perform
-                        # row deletion. Returns True for successful deletion and False if not
-                        return persistence_classes_single_key.DeleteData(
-                            self.database_name, self.table_name, primary_field,
-                            primary_value).execute()
+                        # queue row deletion with above attributes for database writer
+                        # thread. Returns True for successful deletion and False if not
+                        return write_queue.WriteQueue.for_database(self.database_name).submit(
+                            persistence_classes_single_key.DeleteData, self.database_name,
+                            self.table_name, primary_field, primary_value).result()
+
+                    # user wishes to delete many entities, listed in a file or matching a field
+                    # value. Deletion is performed chunk by chunk as returned generator is
+                    # consumed
+                    elif self.user_action == "Bulk Delete Entities":
+                        if self.entity_object.key_file is not None:
+                            delete_query = persistence_classes_single_key.BulkDeleteData(
+                                self.database_name, self.table_name,
+                                self.entity_object.primary_key_field,
+                                key_values=self.entity_object.read_key_values(),
+                                chunk_size=self.entity_object.chunk_size)
+                        elif self.entity_object.where_fields_list is not None:
+                            delete_query = persistence_classes_single_key.BulkDeleteData(
+                                self.database_name, self.table_name,
+                                self.entity_object.primary_key_field,
+                                where_field_list=self.entity_object.where_fields_list,
+                                search_vals=self.entity_object.search_values,
+                                chunk_size=self.entity_object.chunk_size,
+                                where_operators=self.entity_object.where_operators)
+                        else:
+                            # user cancelled deletion
+                            return None
+
+                        # return generator yielding rows deleted so far after each chunk and
+                        # list of (line_number, reason) for invalid values in file (filled as
+                        # generator is consumed)
+                        return delete_query.execute_chunks(), self.entity_object.row_errors
+
+                    # user wishes to view stock report. Totals are aggregated by database and
+                    # only report rows returned: stock over table, stock per group (author)
+                    # and counts of entities at or below each low stock level
+                    elif self.user_action == "Stock Report":
+                        report = (
+                            stock_reports.StockTotals(
+                                self.database_name, self.table_name,
+                                self.entity_object.stock_field).execute(),
+                            stock_reports.GroupStockTotals(
+                                self.database_name, self.table_name,
+                                self.entity_object.group_field, self.entity_object.stock_field,
+                                self.entity_object.group_limit).execute(),
+                            stock_reports.LowStockCounts(
+                                self.database_name, self.table_name,
+                                self.entity_object.stock_field,
+                                self.entity_object.low_stock_levels).execute())
+                        # report is only returned if every part could be read
+                        if None in report:
+                            return None
+                        return report
 
                     # an invalid user_action has been received
                     else:
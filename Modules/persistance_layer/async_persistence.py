@@ -0,0 +1,455 @@
+"""Module holding an asyncio interface to the Persistance Controllers of
+    'persistence_classes_single_key' so that async front ends can overlap many database
+    operations without blocking their event loop on disk I/O:
+
+    rows = await AsyncReadData(database_name, "books", ["*"], ["author"], ["Tolkien"]).execute()
+
+Each Async class takes the same arguments as the Persistance Controller of the same name
+(without the name prefix) and 'await execute()' returns what its 'execute()' returns. The
+Persistance Controller is created and executed on a worker thread of the dedicated
+'AsyncPersistenceExecutor' of the database. Worker threads borrow connections from a
+connection pool of their own (bound to each worker with 'ConnectionPool.bind_to_thread()') so
+async queries never wait for, or hold up, connections of the synchronous application.
+Row and query caches are shared with synchronous queries.
+
+Writes that may be queued ('AsyncInsertData', 'AsyncUpdateData', 'AsyncBatchUpdateData',
+'AsyncAdjustQuantity' and 'AsyncDeleteData') are not run on the executor: they are submitted to
+the 'write_queue.WriteQueue' of the database and await its 'WriteFuture', so async writes are
+group-committed by the single writer thread with every other queued write instead of competing
+with it for the write lock.
+
+Several queries that must commit together are run as one function on a worker thread with
+'AsyncPersistenceExecutor.run()', the function opening its own 'Transaction':
+
+    def restock(database_name):
+        with Transaction(database_name) as transaction:
+            ...
+
+    await AsyncPersistenceExecutor.for_database(database_name).run(restock, database_name)
+
+Module Usage:
+-------------
+Use of this module should be through child classes of 'AsyncDataBaseQuery' as:
+'AsyncVerifyTable', 'AsyncInsertData', 'AsyncBulkInsertData', 'AsyncUpsertData', 'AsyncReadData',
+'AsyncReadPage', 'AsyncFullTextSearch', 'AsyncUpdateData', 'AsyncBatchUpdateData',
+'AsyncAdjustQuantity', 'AsyncDeleteData' and 'AsyncBulkDeleteData', and through
+'AsyncPersistenceExecutor.run()'. 'AsyncPersistenceExecutor.configure(database_name, ...)' may be
+called before first use to set the number of worker threads.
+NOTE: a 'Transaction' must not be passed to Async classes, it belongs to the thread it was
+opened on.
+
+Classes:
+--------
+AsyncPersistenceExecutor:
+    Per-database pool of worker threads with their own connection pool, running blocking
+    persistence calls for coroutines
+
+    Methods:
+    --------
+    __init__(self, database_name, max_workers, pragma_profile):
+        initialise executor for 'database_name' (threads are started on first use)
+
+    for_database(cls, database_name): 'classmethod'
+        return shared executor for 'database_name', creating executor on first call
+
+    configure(cls, database_name, **settings): 'classmethod'
+        create or replace shared executor for 'database_name' with desired settings
+
+    close_all_executors(cls): 'classmethod'
+        close every shared executor (application shutdown)
+
+    run(self, function, *args):
+        return awaitable result of 'function(*args)' called on a worker thread
+
+    close(self):
+        wait for queued calls, stop worker threads and close their connections
+
+    statistics(self):
+        return dictionary of executor counters and its connection pool statistics
+
+AsyncDataBaseQuery:
+    super class of Async classes creating and executing a Persistance Controller on a worker
+    thread of the database executor
+
+    Methods:
+    --------
+    __init__(self, database_name, *arguments, **keyword_arguments):
+        store arguments of Persistance Controller 'query_class'
+
+    execute(self): 'coroutine'
+        create and execute Persistance Controller on executor and return its result
+
+    execute_query(self):
+        create and execute Persistance Controller (called on worker thread)
+
+AsyncQueuedWrite:
+    super class of Async write classes submitting their Persistance Controller to the write
+    queue of the database
+
+    Methods:
+    --------
+    execute(self): 'coroutine'
+        submit Persistance Controller to write queue and return its result once committed
+
+AsyncVerifyTable, AsyncInsertData, AsyncBulkInsertData, AsyncUpsertData, AsyncReadData,
+AsyncReadPage, AsyncFullTextSearch, AsyncUpdateData, AsyncBatchUpdateData, AsyncAdjustQuantity,
+AsyncDeleteData, AsyncBulkDeleteData:
+    Child classes of AsyncDataBaseQuery for the Persistance Controller of the same name. The
+    executed controller is kept in attribute 'query' (for example 'query.new_row_id' of
+    'AsyncInsertData' or 'query.inserted_count' of 'AsyncBulkInsertData')
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Modules.persistance_layer import connection_pool
+from Modules.persistance_layer import persistence_classes_single_key
+from Modules.persistance_layer import write_queue
+
+
+class AsyncPersistenceExecutor:
+    """Per-database pool of worker threads running blocking persistence calls for coroutines.
+        Worker threads borrow connections from a connection pool of their own holding one
+        connection per worker.
+
+    Attributes:
+    -----------
+    database_name: str
+        name of database queries are run against
+    max_workers: int
+        number of worker threads (and maximum number of connections) of executor
+    pragma_profile: str
+        PRAGMA profile of worker connections ('ConnectionPool.PRAGMA_PROFILES')
+    connection_pool: connection_pool.ConnectionPool
+        pool (not shared with synchronous queries) worker threads borrow connections from
+
+    Methods:
+    --------
+    __init__(self, database_name, max_workers, pragma_profile):
+        initialise executor for 'database_name'
+
+    for_database(cls, database_name): 'classmethod'
+        return shared executor for 'database_name'
+
+    configure(cls, database_name, **settings): 'classmethod'
+        create or replace shared executor for 'database_name'
+
+    close_all_executors(cls): 'classmethod'
+        close every shared executor
+
+    run(self, function, *args):
+        return awaitable result of 'function(*args)' called on a worker thread
+
+    close(self):
+        stop worker threads and close their connections
+
+    statistics(self):
+        return dictionary of executor and connection pool counters
+    """
+    # shared executors (one per database_name) and lock guarding their creation
+    _executors = {}
+    _executors_lock = threading.Lock()
+
+    def __init__(self, database_name, max_workers=4, pragma_profile=None):
+        """Constructor initialising executor and its connection pool, worker threads and
+            connections are only started on demand.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database to connect to, also serves as path to database file
+        max_workers: int (Default = 4)
+            number of worker threads, so number of queries run at the same time (must be at
+            least 1)
+        pragma_profile: str (Default = None)
+            PRAGMA profile of worker connections. None uses the profile of the shared
+            connection pool of the database
+        """
+        if max_workers < 1:
+            raise ValueError("AsyncPersistenceExecutor max_workers must be at least 1")
+        shared_pool = connection_pool.ConnectionPool.for_database(database_name)
+        if pragma_profile is None:
+            pragma_profile = shared_pool.pragma_profile
+
+        self.database_name = database_name
+        self.max_workers = max_workers
+        self.pragma_profile = pragma_profile
+        self.connection_pool = connection_pool.ConnectionPool(
+            database_name, max_size=max_workers, pragma_profile=pragma_profile,
+            cached_statements=shared_pool.cached_statements)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="async-persistence",
+                                            initializer=self._bind_worker)
+        self._closed = False
+        self._lock = threading.Lock()
+
+        # usage counters returned by 'statistics()'
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0}
+
+    @classmethod
+    def for_database(cls, database_name):
+        """Return shared executor for 'database_name', creating one with default settings if
+            one has not been created yet (or the last one was closed)."""
+        with cls._executors_lock:
+            executor = cls._executors.get(database_name)
+            if executor is None or executor._closed:
+                executor = cls(database_name)
+                cls._executors[database_name] = executor
+            return executor
+
+    @classmethod
+    def configure(cls, database_name, **settings):
+        """Create shared executor for 'database_name' with desired settings, replacing (and
+            closing once its queued calls are done) any existing executor.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of database the shared executor is for
+        settings: keyword arguments
+            any of 'max_workers' or 'pragma_profile' as in constructor
+
+        Return:
+        -------
+        AsyncPersistenceExecutor - the shared executor for 'database_name'
+        """
+        for setting in settings:
+            if setting not in ("max_workers", "pragma_profile"):
+                raise ValueError(f"Unknown AsyncPersistenceExecutor setting '{setting}'")
+        executor = cls(database_name, **settings)
+        with cls._executors_lock:
+            replaced = cls._executors.get(database_name)
+            cls._executors[database_name] = executor
+        if replaced is not None:
+            replaced.close()
+        return executor
+
+    @classmethod
+    def close_all_executors(cls):
+        """Close every shared executor, waiting for their queued calls (application
+            shutdown)."""
+        with cls._executors_lock:
+            executors = list(cls._executors.values())
+            cls._executors.clear()
+        for executor in executors:
+            executor.close()
+
+    def run(self, function, *args):
+        """Call 'function(*args)' on a worker thread and return an awaitable of its result.
+            Must be called from a running event loop. Exceptions raised by 'function' are
+            raised on await.
+
+        Arguments:
+        ----------
+        function: callable
+            blocking function to call, for example one using Persistance Controllers and a
+            'Transaction'
+        args:
+            positional arguments of 'function'
+
+        Return:
+        -------
+        asyncio.Future resolving to return value of 'function'
+
+        Exceptions:
+        -----------
+        RuntimeError:
+            raised if executor has been closed or no event loop is running
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(
+                    f"Async persistence executor for {self.database_name} has been closed")
+            self._stats["submitted"] += 1
+        return loop.run_in_executor(self._executor, self._call, function, args)
+
+    def close(self):
+        """Wait for queued calls to finish, stop worker threads and close their connections."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        self.connection_pool.close()
+
+    def statistics(self):
+        """Return dictionary of call counters together with statistics of the worker
+            connection pool (prefixed 'pool_')."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["max_workers"] = self.max_workers
+        for counter, value in self.connection_pool.statistics().items():
+            stats["pool_" + counter] = value
+        return stats
+
+    def _bind_worker(self):
+        """Internal, run on start of each worker thread so its queries use the executor's
+            connection pool."""
+        connection_pool.ConnectionPool.bind_to_thread(self.connection_pool)
+
+    def _call(self, function, args):
+        """Internal, call 'function' on worker thread counting completed and failed calls."""
+        try:
+            result = function(*args)
+        except BaseException:
+            with self._lock:
+                self._stats["failed"] += 1
+            raise
+        with self._lock:
+            self._stats["completed"] += 1
+        return result
+
+
+# -------------------------------------------------------------------------------------------------
+class AsyncDataBaseQuery:
+    """super class of Async classes. Arguments are stored on creation; the Persistance
+        Controller 'query_class' is created (connecting to database) and executed on a worker
+        thread of the database's 'AsyncPersistenceExecutor' when 'execute()' is awaited.
+
+    Attributes:
+    -----------
+    query_class: class
+        Persistance Controller created and executed ('DataBaseQueryClass' child class)
+    database_name: str
+        name of the database to connect to, also serves as path to database file
+    arguments: tuple
+        positional arguments of 'query_class' after 'database_name'
+    keyword_arguments: dict
+        keyword arguments of 'query_class'
+    query: DataBaseQueryClass
+        Persistance Controller once executed (None before), holding attributes set by its
+        'execute()'
+
+    Methods:
+    --------
+    __init__(self, database_name, *arguments, **keyword_arguments):
+        store arguments of Persistance Controller
+
+    execute(self): 'coroutine'
+        create and execute Persistance Controller on executor and return its result
+
+    execute_query(self):
+        create and execute Persistance Controller (called on worker thread)
+    """
+    query_class = None
+
+    def __init__(self, database_name, *arguments, **keyword_arguments):
+        """Constructor storing arguments of Persistance Controller, no connection is made.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database to connect to, also serves as path to database file
+        arguments, keyword_arguments:
+            remaining arguments of 'query_class' constructor (without 'transaction')
+        """
+        self.database_name = database_name
+        self.arguments = arguments
+        self.keyword_arguments = keyword_arguments
+        self.query = None
+
+    async def execute(self):
+        """Coroutine creating and executing Persistance Controller on a worker thread. Event
+            loop is free to run other tasks until it completes.
+
+        Return:
+        -------
+        value returned by 'execute()' of Persistance Controller
+        """
+        executor = AsyncPersistenceExecutor.for_database(self.database_name)
+        return await executor.run(self.execute_query)
+
+    def execute_query(self):
+        """Create and execute Persistance Controller, called on worker thread."""
+        self.query = self.query_class(self.database_name, *self.arguments,
+                                      **self.keyword_arguments)
+        return self.query.execute()
+
+
+class AsyncQueuedWrite(AsyncDataBaseQuery):
+    """super class of Async write classes. 'query_class' (one of
+        'WriteQueue.QUEUED_QUERY_CLASSES') is submitted to the write queue of the database and
+        executed by its writer thread, the coroutine awaiting the returned 'WriteFuture'.
+
+    Methods:
+    --------
+    execute(self): 'coroutine'
+        submit Persistance Controller to write queue and return its result once committed
+    """
+
+    async def execute(self):
+        """Coroutine submitting Persistance Controller to the write queue of the database.
+            Event loop is free to run other tasks until the batch holding the write commits.
+
+        Return:
+        -------
+        value returned by 'execute()' of Persistance Controller (None if the write failed or
+        its batch could not be committed)
+        """
+        future = write_queue.WriteQueue.for_database(self.database_name).submit(
+            self.query_class, self.database_name, *self.arguments, **self.keyword_arguments)
+        result = await asyncio.wrap_future(future)
+        self.query = future.query
+        return result
+
+
+# -------------------------------------------------------------------------------------------------
+class AsyncVerifyTable(AsyncDataBaseQuery):
+    """Async 'VerifyTable', returns True if table exists."""
+    query_class = persistence_classes_single_key.VerifyTable
+
+
+class AsyncInsertData(AsyncQueuedWrite):
+    """Async 'InsertData', allocated primary_key is held in 'query.new_row_id'."""
+    query_class = persistence_classes_single_key.InsertData
+
+
+class AsyncBulkInsertData(AsyncDataBaseQuery):
+    """Async 'BulkInsertData', row iterator is read on the worker thread."""
+    query_class = persistence_classes_single_key.BulkInsertData
+
+
+class AsyncUpsertData(AsyncDataBaseQuery):
+    """Async 'UpsertData', row iterator is read on the worker thread."""
+    query_class = persistence_classes_single_key.UpsertData
+
+
+class AsyncReadData(AsyncDataBaseQuery):
+    """Async 'ReadData', returns header tuple followed by matching rows."""
+    query_class = persistence_classes_single_key.ReadData
+
+
+class AsyncReadPage(AsyncDataBaseQuery):
+    """Async 'ReadPage', returns header tuple followed by one page of rows."""
+    query_class = persistence_classes_single_key.ReadPage
+
+
+class AsyncFullTextSearch(AsyncDataBaseQuery):
+    """Async 'FullTextSearch', returns header tuple followed by ranked rows."""
+    query_class = persistence_classes_single_key.FullTextSearch
+
+
+class AsyncUpdateData(AsyncQueuedWrite):
+    """Async 'UpdateData', returns True if a row was updated."""
+    query_class = persistence_classes_single_key.UpdateData
+
+
+class AsyncBatchUpdateData(AsyncQueuedWrite):
+    """Async 'BatchUpdateData', changes are read on the writer thread."""
+    query_class = persistence_classes_single_key.BatchUpdateData
+
+
+class AsyncAdjustQuantity(AsyncQueuedWrite):
+    """Async 'AdjustQuantity', returns new quantity (False if change was refused)."""
+    query_class = persistence_classes_single_key.AdjustQuantity
+
+
+class AsyncDeleteData(AsyncQueuedWrite):
+    """Async 'DeleteData', returns True if a row was deleted."""
+    query_class = persistence_classes_single_key.DeleteData
+
+
+class AsyncBulkDeleteData(AsyncDataBaseQuery):
+    """Async 'BulkDeleteData', returns number of rows deleted."""
+    query_class = persistence_classes_single_key.BulkDeleteData
@@ -0,0 +1,183 @@
+"""Module holding the database session owned by an application for its whole lifetime. The
+    session keeps one long-lived sqlite3 connection open for the thread running the
+    application (the console menu of 'BookStoreController'), so every query made on that
+    thread by the Entity-Persistance matcher and the Persistance Controllers reuses the same
+    connection: its page cache and prepared statements stay warm between menu actions instead
+    of starting cold on another connection.
+
+The session connection is held in a private connection pool of size 1 bound to the
+application thread with 'ConnectionPool.bind_to_thread()' - Persistance Controllers borrow and
+return it exactly as they would a pooled connection, needing no session argument. A query made
+while the session connection is borrowed (for example a read not joined to an open 'Transaction')
+borrows a connection of the shared pool instead of waiting for it. Worker threads (write queue,
+asyncio executor) keep their own connections.
+
+Closing the session is the clean shutdown of the Persistance Layer: writes still queued for the
+writer thread are committed, the asyncio executors are stopped, 'PRAGMA optimize' is run on the
+session connection (as recommended by sqlite for long-lived connections) and every connection,
+pool and cache watcher connection is closed.
+
+Module Usage:
+-------------
+Use of this module should be through 'DatabaseSession' opened when the application starts and
+closed when it ends, either with 'open()' and 'close()' or as a context manager:
+
+    with DatabaseSession(database_name):
+        ...
+
+Classes:
+--------
+DatabaseSession:
+    Long-lived connection of the application thread and shutdown of Persistance Layer
+    resources
+
+    Methods:
+    --------
+    __init__(self, database_name, pragma_profile):
+        initialise session for 'database_name' (connection is opened by 'open()')
+
+    open(self):
+        open session connection and bind it to calling thread
+
+    close(self):
+        commit queued writes, stop worker threads and close every connection of the database
+
+    __enter__(self), __exit__(self, exc_type, exc_value, traceback):
+        open session on entering 'with' block, close session when it ends
+
+    statistics(self):
+        return dictionary of session connection usage counters
+"""
+import sqlite3
+
+from Modules.persistance_layer import async_persistence
+from Modules.persistance_layer import connection_pool
+from Modules.persistance_layer import query_cache
+from Modules.persistance_layer import row_cache
+from Modules.persistance_layer import write_queue
+
+
+class DatabaseSession:
+    """Long-lived database connection of the application thread, shared by every query made on
+        that thread, and shutdown of Persistance Layer resources when closed.
+
+    Attributes:
+    -----------
+    database_name: str
+        name of database session is opened on
+    pragma_profile: str
+        PRAGMA profile of session connection ('ConnectionPool.PRAGMA_PROFILES')
+    connection_pool: connection_pool.ConnectionPool
+        private pool holding the single session connection (None until opened)
+    is_open: bool
+        True between 'open()' and 'close()'
+
+    Methods:
+    --------
+    __init__(self, database_name, pragma_profile):
+        initialise session for 'database_name'
+
+    open(self):
+        open session connection and bind it to calling thread
+
+    close(self):
+        close session and shut down Persistance Layer resources
+
+    __enter__(self), __exit__(self, exc_type, exc_value, traceback):
+        open and close session around a 'with' block
+
+    statistics(self):
+        return dictionary of session connection usage counters
+    """
+
+    def __init__(self, database_name, pragma_profile=None):
+        """Constructor initialising session, no connection is opened until 'open()'.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database to connect to, also serves as path to database file
+        pragma_profile: str (Default = None)
+            PRAGMA profile of session connection. None uses the profile of the shared
+            connection pool of the database
+        """
+        self.database_name = database_name
+        self.pragma_profile = pragma_profile
+        self.connection_pool = None
+        self.is_open = False
+
+    def open(self):
+        """Open session connection and bind it to the calling thread, so every query made on
+            this thread uses it. Must be called on the thread running the application. If the
+            connection cannot be opened an error is printed and queries fall back to the shared
+            connection pool.
+
+        Return:
+        -------
+        DatabaseSession - this session
+        """
+        if self.is_open:
+            return self
+        shared_pool = connection_pool.ConnectionPool.for_database(self.database_name)
+        if self.pragma_profile is None:
+            self.pragma_profile = shared_pool.pragma_profile
+        # session connection keeps as many compiled statements as shared pool connections
+        self.connection_pool = connection_pool.ConnectionPool(
+            self.database_name, max_size=1, pragma_profile=self.pragma_profile,
+            cached_statements=shared_pool.cached_statements)
+        try:
+            # open connection now so first menu action does not wait for it
+            self.connection_pool.checkin(self.connection_pool.checkout())
+        except sqlite3.OperationalError as operational_error:
+            print(f"Error opening session on Database {self.database_name}")
+            print(operational_error)
+            self.connection_pool.close()
+            return self
+        connection_pool.ConnectionPool.bind_to_thread(self.connection_pool)
+        self.is_open = True
+        return self
+
+    def close(self):
+        """Clean shutdown of the Persistance Layer: commit writes waiting in the write queue,
+            stop asyncio executors, optimise and close session connection, then close the shared
+            connection pools and cache watcher connections."""
+        write_queue.WriteQueue.close_all_queues()
+        async_persistence.AsyncPersistenceExecutor.close_all_executors()
+
+        if self.is_open:
+            self.is_open = False
+            # skip optimisation if connection is still borrowed (an unfinished row stream)
+            try:
+                if self.connection_pool.statistics()["borrowed_connections"]:
+                    raise sqlite3.OperationalError("session connection is still in use")
+                connection = self.connection_pool.checkout()
+                try:
+                    # let sqlite update statistics for queries run during session
+                    connection.execute("PRAGMA optimize")
+                finally:
+                    self.connection_pool.checkin(connection)
+            except sqlite3.Error as database_error:
+                print(f"Error optimising Database {self.database_name} on close")
+                print(database_error)
+            self.connection_pool.close()
+
+        row_cache.RowCache.close_all_caches()
+        query_cache.QueryCache.close_all_caches()
+        connection_pool.ConnectionPool.close_all_pools()
+
+    def __enter__(self):
+        """Open session on entering 'with' block."""
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close session when 'with' block ends. Exceptions raised in block are not
+            suppressed."""
+        self.close()
+        return False
+
+    def statistics(self):
+        """Return usage counters of session connection ('ConnectionPool.statistics()'), empty
+            dictionary if session has not been opened."""
+        if self.connection_pool is None:
+            return {}
+        return self.connection_pool.statistics()
@@ -8,14 +8,24 @@ manage and abstract away database connections from creation of sqlite3 queries.
 Module Usage:
 -------------
 Use of this module should only be through child classes of 'DataBaseQueryClass' as:
-'CreateTableSingleKey', 'VerifyTable', 'InsertData', 'ReadData', ''UpdateData' and
-'DeleteData'
+'CreateTableSingleKey', 'CreateIndexes', 'CreateFullTextIndex', 'VerifyTable', 'InsertData',
+'BulkInsertData', 'UpsertData', 'ReadData', 'FullTextSearch', 'UpdateData', 'BatchUpdateData',
+'AdjustQuantity', 'DeleteData' and 'BulkDeleteData', and through context manager 'Transaction'
 NOTE: all child classes have method 'execute()' that must be called for class usage
 
+'VerifyTable', 'InsertData', 'ReadData', 'UpdateData', 'BatchUpdateData', 'AdjustQuantity' and
+'DeleteData' accept an open 'Transaction' so several queries are committed (or rolled back)
+together with one commit:
+
+    with Transaction(database_name) as transaction:
+        UpdateData(database_name, table_name, field_names, values, transaction).execute()
+        DeleteData(database_name, table_name, primary_key, key_value, transaction).execute()
+
 Classes:
 --------
 DatabaseController:
     A Helper class controlling connection to a database with 'connection' and 'cursor' objects.
+    Connections are borrowed from the shared 'connection_pool.ConnectionPool' for the database.
 
     Methods:
     --------
@@ -23,12 +33,12 @@ DatabaseController:
         Initialize DataBaseController Object with connection and cursor objects for sqlite3
 
     open_connection_and_create_cursor(self):
-        attempts to create connection to specified database or create database
-        if not present. Creates cursor object to database and returns cursor or
+        attempts to borrow connection to specified database from connection pool (creating
+        database if not present). Creates cursor object to database and returns cursor or
         'None' if successful connection is not made
 
     close_connection(self):
-        attempts to close connection to current database. Any class using 'DataBaseController'
+        returns borrowed connection to connection pool. Any class using 'DataBaseController'
         instance MUST call this method.
 
 DataBaseQueryClass:
@@ -37,7 +47,7 @@ DataBaseQueryClass:
 
     Methods:
     --------
-    __init__(self, database_name, table_name):
+    __init__(self, database_name, table_name, transaction):
         instantiate instance of class
 
     execute(self):
@@ -47,73 +57,268 @@ DataBaseQueryClass:
         attempt to create database connection and initialize "connection"
         "cursor" objects
 
+    commit(self), rollback(self), close_connection(self):
+        commit, undo and release a query's connection, deferring to 'transaction' if given
+
+    commit_connection(connection, database_name): 'staticmethod'
+        commit connection of the application, attributing the commit with the cache watcher
+
+    invalidate_cached_rows(self, key_field, key_values):
+        drop rows changed by query from the database's row cache ('row_cache.RowCache') and
+        make cached search results of table stale ('query_cache.QueryCache')
+
+    cached_sql(self, shape, build_sql):
+        return SQL text of an operation shape (query kind, table and fields), built once and
+        reused so connections also reuse their compiled statement for the text
+
+Transaction:
+    Unit of work context manager holding one pooled connection in a 'BEGIN IMMEDIATE'
+    transaction that queries join with their 'transaction' argument. Commits once when its
+    'with' block ends, or rolls back if an exception was raised or a joined query failed
+
+    Methods:
+    --------
+    __init__(self, database_name):
+        initialise transaction for database (connection is borrowed on entering 'with' block)
+
+    __enter__(self), __exit__(self, exc_type, exc_value, traceback):
+        begin transaction, then commit or roll back and return connection to pool
+
 CreateTableSingleKey:
     Child class of DataBaseQueryClass allowing for creation of a new table in a Database using
-    sqlite3 with a non-compound Primary-Key. Fields are all set as "NOT NULL".
+    sqlite3 with a non-compound Primary-Key. Fields are all set as "NOT NULL". Indexes, unique
+    indexes and partial indexes are created for fields in 'index_list', 'unique_list' and
+    'partial_index_list'.
 
     Methods:
     --------
-    __init__(self, database_name, table_name, primary_key, int_list, text_list, float_list):
+    __init__(self, database_name, table_name, primary_key, int_list, text_list, float_list,
+             index_list, unique_list, partial_index_list):
         Initialize CreateTableSingleKey and parent DataBaseQueryClass objects allowing
         for sqlite3 connection. Parent contructor attempts to create connection to database.
 
     execute(self): 'override'
         Use class attributes to create new table in database and then close database connection.
 
+CreateIndexes:
+    Child class of DataBaseQueryClass creating any missing indexes, unique indexes and partial
+    indexes on fields of an existing table (migration of tables created before fields were
+    marked as indexed).
+
+    Methods:
+    --------
+    __init__(self, database_name, table_name, index_list, unique_list, partial_index_list):
+        Initialize CreateIndexes and parent DataBaseQueryClass objects
+
+    index_queries(table_name, index_list, unique_list, partial_index_list): 'staticmethod'
+        return list of 'CREATE INDEX IF NOT EXISTS' queries for desired fields
+
+    execute(self): 'override'
+        Create missing indexes in a single transaction and close database connection.
+
+CreateFullTextIndex:
+    Child class of DataBaseQueryClass creating (if not present) an sqlite FTS5 full-text index
+    '<table>_fts' over text fields of a table, kept in sync with the table by triggers
+
+    Methods:
+    --------
+    __init__(self, database_name, table_name, primary_key, full_text_list):
+        Initialize CreateFullTextIndex and parent DataBaseQueryClass objects
+
+    execute(self): 'override'
+        Create full-text table and triggers, populating index from existing rows when created
+
 VerifyTable:
-    child class of DataBaseQueryClass to verify if a table exists in specified database
+    child class of DataBaseQueryClass to verify if a table exists in specified database using
+    the cached schema held in 'schema_registry.SchemaRegistry'
 
     Methods:
     --------
-    __init__(self, database_name, table_name):
+    __init__(self, database_name, table_name, transaction):
         Constructor initialising VerifyTable and DataBaseQueryClass parent objects
 
     execute(self): 'override'
-        Connect to database, create SQL query to return count of tables in database
-         with name equal to 'table_name'. Close Database Connection.
+        Connect to database, check cached schema (reloaded only if database schema_version has
+         changed) for a table with name equal to 'table_name'. Close Database Connection.
 
 InsertData:
-    Allows for insertion of single or multiple rows to table in database
+    Allows for insertion of single or multiple rows to table in database. If 'field_names' are
+    given without the integer primary_key, sqlite allocates the primary_key within the insert
+    and the new value is stored in attribute 'new_row_id'
 
     Methods:
     ----------------
-    __init__(self, database_name, table_name, row_data_list):
+    __init__(self, database_name, table_name, row_data_list, field_names, transaction):
         Initialize InsertData and parent DataBaseQueryClass objects allowing
         for sqlite3 connection. Parent contructor attempts to create connection to database.
 
     execute(self): 'override'
         Use values in tuples of row_data_list to add row(s) to table and close database connection
 
+BulkInsertData:
+    Insert rows read from an iterator in chunked transactions (one 'executemany' per chunk),
+    reporting rows rejected by the database by their row number
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, row_iterator, field_names, chunk_size):
+        Initialize BulkInsertData and parent DataBaseQueryClass objects
+
+    execute(self): 'override'
+        Insert all rows chunk by chunk and close database connection. Number of rows added and
+        rejected rows are stored in attributes 'inserted_count' and 'row_errors'
+
+UpsertData:
+    Child class of BulkInsertData merging rows with 'INSERT ... ON CONFLICT DO UPDATE' in one
+    statement per row (executemany per chunk), adding to or replacing fields of matching rows
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, row_iterator, field_names, conflict_field,
+             add_fields, replace_fields, chunk_size):
+        Initialize UpsertData and parent BulkInsertData objects
+
+    execute(self): 'override'
+        check rows can be matched on 'conflict_field', then merge all rows as BulkInsertData
+
+    conflict_index_exists(self):
+        return True if 'conflict_field' is the primary_key or fields of a unique index
+
+    insert_query(self, value_count): 'override'
+        return INSERT query with ON CONFLICT clause merging rows into existing rows
+
+    insert_chunk(self, query, chunk): 'override'
+        merge and commit one chunk of rows, dropping table's cached rows
+
 ReadData:
-    Allows reading of desired values from table and returns matching row(s)
+    Allows reading of desired values from table and returns matching row(s). Outside of a
+    transaction a row read by its primary_key is served from and stored in 'row_cache.RowCache'
+    and other search results in 'query_cache.QueryCache'. Rows are returned as tuples, named
+    tuples or instances of a record class as selected by 'row_factory'. Where fields are
+    compared with '=' unless other operators ('<', '<=', '>', '>=', 'BETWEEN') are given, and
+    rows may be ordered and limited
 
     Methods:
     ----------------
-    __init__(self, database_name, table_name, fields_list, where_field_list, search_vals):
+    __init__(self, database_name, table_name, fields_list, where_field_list, search_vals,
+             transaction, row_factory, where_operators, order_by, limit):
         Initialize ReadData and parent DataBaseQueryClass objects allowing
         for sqlite3 connection. Parent contructor attempts to create connection to database.
 
     execute(self): 'override'
         Search for and return matching row from table and close database connection
 
+    execute_stream(self, arraysize):
+        generator yielding header and matching rows fetched in chunks of 'arraysize' rows,
+        closing database connection when exhausted or closed
+
+    read_cache(self):
+        return result of search held in row cache or query cache, else None
+
+    cached_row_key(self):
+        return primary_key value searched for if row read may be stored in row cache, else None
+
+    cached_query_key(self):
+        return key of search if result read may be stored in query cache, else None
+
+    make_rows(self, fields_and_values):
+        return result with each row built by 'row_factory', header tuple kept first
+
+    row_class(self, field_names):
+        return class (or function) building one row from its values for 'row_factory'
+
+    is_key_lookup(self):
+        return True if where fields are only compared for equality and rows are not limited
+
+    where_conditions(self):
+        return conditions of where fields and their parameters ('BETWEEN' takes two)
+
+    build_conditions(where_fields_list, where_operators, search_vals): 'staticmethod'
+        return conditions and parameters for where fields compared by their operators
+
+ReadPage:
+    Child class of ReadData reading one page of rows ordered by a sort field using keyset
+    pagination, so any page is located with an index seek rather than skipping earlier rows
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, fields_list, primary_key, sort_field, page_size,
+             after_key, before_key, where_field_list, search_vals):
+        Initialize ReadPage and parent ReadData objects
+
+    execute(self): 'override'
+        Read and return page of rows and close database connection
+
+KeysetPager:
+    Helper (not a DataBaseQueryClass) holding position of a user moving forwards and backwards
+    through pages of a table using 'ReadPage'
+
+    Methods:
+    --------
+    first_page(self), next_page(self), previous_page(self):
+        read and return first, following or preceding page
+
+FullTextSearch:
+    Search full-text index created by 'CreateFullTextIndex' for words, word prefixes or a phrase
+    and return best matching rows ranked by bm25
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, fields_list, primary_key, search_text,
+             search_mode, result_limit):
+        Initialize FullTextSearch and parent DataBaseQueryClass objects
+
+    match_expression(search_text, search_mode): 'staticmethod'
+        return FTS5 MATCH expression for user search text and search mode
+
+    execute(self): 'override'
+        Search for and return ranked matching rows and close database connection
+
 UpdateData:
     Modify a single field value for row in database using primary_key value
 
     Methods:
     ----------------
-    __init__(self, database_name, table_name, field_names, update_tuple):
+    __init__(self, database_name, table_name, field_names, update_tuple, transaction):
         Initialize UpdateData and parent DataBaseQueryClass objects allowing
         for sqlite3 connection. Parent contructor attempts to create connection to database.
 
     execute(self): 'override'
         Attempt to update value in a row and close database connection
 
+BatchUpdateData:
+    Apply many (primary_key value, {field_name: new value}) changes in one transaction, grouping
+    changes by the fields they change and executing each group with one 'executemany'
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, primary_key, changes, chunk_size, transaction):
+        Initialize BatchUpdateData and parent DataBaseQueryClass objects
+
+    execute(self): 'override'
+        Apply changes and close database connection. Number of rows updated and changes not
+        applied are stored in attributes 'updated_count' and 'row_errors'
+
+AdjustQuantity:
+    Add to or subtract from a numeric field of one row atomically ('field = field + ?') within
+    an allowed range, returning the new value from the same statement ('RETURNING')
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, field_name, primary_key, key_value, change,
+             minimum, maximum, transaction):
+        Initialize AdjustQuantity and parent DataBaseQueryClass objects
+
+    execute(self): 'override'
+        Adjust value and close database connection. Returns new value or False if row does not
+        exist or new value would be out of range
+
 DeleteData:
     Delete a single row in database using only primary_key value
 
     Methods:
     ----------------
-    __init__(self, database_name, table_name, primary_key, key_value):
+    __init__(self, database_name, table_name, primary_key, key_value, transaction):
         Initialize DeleteData and parent DataBaseQueryClass objects allowing
         for sqlite3 connection. Parent contructor attempts to create connection to database.
 
@@ -121,29 +326,45 @@ DeleteData:
         Attempt to delete matching row and close database connection. Returns True or False
         to confirm deletion of a row(s)
 
-ReturnLastId:
-    Retrieve primary_key value in last row of table in database.
+BulkDeleteData:
+    Delete many rows by a list of primary_key values or by conditions on fields ('=' or the
+    comparisons of 'ReadData') in chunks, committing each chunk so the write lock is only held
+    for one chunk at a time
 
     Methods:
-    --------
-    __init__(self, database_name, table_name, primary_key):
-        Constructor initialising ReturnLastId and DataBaseQueryClass parent objects.
+    ----------------
+    __init__(self, database_name, table_name, primary_key, key_values, where_field_list,
+             search_vals, chunk_size, where_operators):
+        Initialize BulkDeleteData and parent DataBaseQueryClass objects
 
     execute(self): 'override'
-        Connect to database, create SQL query to retrieve last row primary_key value.
-         Close Database Connection
+        Delete rows and close database connection. Returns number of rows deleted
+
+    execute_chunks(self):
+        generator deleting one chunk at a time and yielding number of rows deleted so far
 ------------------------------------------------------------------------------------
 """
+import collections
+import itertools
 import sqlite3
+import threading
+from Modules.persistance_layer import connection_pool
+from Modules.persistance_layer import query_cache
+from Modules.persistance_layer import row_cache
+from Modules.persistance_layer import schema_registry
 
 class DatabaseController():
     """A Helper class controlling connection to a database with 'connection' and 'cursor' objects.
+        Connections are borrowed from (and returned to) the shared connection pool for the
+        database so a connection is not opened and closed for every query.
 
     Attributes:
     -----------------
     database_name: str
         name of the database to connect to, also serves as path to database
          file if not present in current directory
+    connection_pool: connection_pool.ConnectionPool
+        shared pool connections are borrowed from
     connection: class:sq3lite: Connection
         object to connect to database
     cursor: class:sqlite3.Cursor
@@ -156,12 +377,12 @@ class DatabaseController():
         for sqlite3
 
     open_connection_and_create_cursor(self):
-        attempts to create connection to specified database or create database
-        if not present. Creates cursor object to database and returns cursor or
+        attempts to borrow connection to specified database from connection pool (creating
+        database if not present). Creates cursor object to database and returns cursor or
         'None' if successful connection is not made
 
     close_connection(self):
-        attempts to close connection to current database. Any class using 'DataBaseController'
+        returns borrowed connection to connection pool. Any class using 'DataBaseController'
         instance MUST call this method.
     """
 
@@ -175,11 +396,13 @@ class DatabaseController():
             name of database connection will be made to or create
         """
         self.database_name = database_name
+        self.connection_pool = connection_pool.ConnectionPool.for_database(database_name)
         self.connection = None
         self.cursor = None
 
     def open_connection_and_create_cursor(self):
-        """Attempt to create connection to specified database and return a cursor object.
+        """Attempt to borrow connection to specified database from the connection pool and
+            return a cursor object.
 
         Return:
         ----------
@@ -189,11 +412,11 @@ class DatabaseController():
         Exceptions:
         -------------
         sqlite3.OperationalError:
-            Raised if connection to database cannot be made
+            Raised if connection to database cannot be made or pool has no free connection
         """
         try:
-            # attempt to make connection to database. Creates database if not present.
-            self.connection = sqlite3.connect(self.database_name)
+            # attempt to borrow connection to database. Creates database if not present.
+            self.connection = self.connection_pool.checkout()
             # retrieve cursor object from data_base connection
             self.cursor = self.connection.cursor()
             return self.cursor
@@ -205,19 +428,26 @@ class DatabaseController():
             return None
 
     def close_connection(self):
-        """Complusory Function used to close connection to database. All classes utilising this
-           class must ensure this function is called.
+        """Complusory Function used to return connection to the connection pool. All classes
+           utilising this class must ensure this function is called.
 
         Exceptions:
         -------------
         sqlite3.DatabaseError
-            Raised if connection to database cannot be closed
+            Raised if cursor cannot be closed
         """
+        if self.connection is None:
+            return
         try:
-            self.connection.close()
+            self.cursor.close()
         except sqlite3.DatabaseError as data_error:
-            print("Error closing database connection")
+            print("Error closing database cursor")
             print(data_error)
+        finally:
+            # hand connection back to pool, connection must not be used after return
+            self.connection_pool.checkin(self.connection)
+            self.connection = None
+            self.cursor = None
 
 
 # -------------------------------------------------------------------------------------------------
@@ -238,10 +468,12 @@ class DataBaseQueryClass():
         file if not present in current directory
     table_name: str
         name of new table to create in database
+    transaction: Transaction
+        open transaction query is executed in (None for query to commit on its own)
 
     Methods:
     -----------
-    __init__(self, database_name, table_name):
+    __init__(self, database_name, table_name, transaction):
         instantiate instance of class
 
     execute(self):
@@ -249,9 +481,33 @@ class DataBaseQueryClass():
 
     create_database_connection(self):
         attempt to create database connection and initialize "connection" and "cursor" objects
-    """
 
-    def __init__(self, database_name, table_name):
+    commit(self):
+        commit changes made by query (left to 'transaction' if query is part of one)
+
+    commit_connection(connection, database_name): 'staticmethod'
+        commit connection, attributing the commit with the cache watcher
+
+    rollback(self):
+        undo changes of a failed query (whole 'transaction' if query is part of one)
+
+    close_connection(self):
+        close cursor and return connection to pool (connection is kept by 'transaction')
+
+    invalidate_cached_rows(self, key_field, key_values):
+        drop rows changed by query from row cache and make cached search results stale
+
+    cached_sql(self, shape, build_sql):
+        return SQL text of operation shape, calling 'build_sql()' only for a new shape
+    """
+    # SQL text of queries keyed by operation shape, shared by all Persistance Controllers so
+    # repeated operations skip building their text and pass sqlite3 the identical string its
+    # per-connection compiled statement cache is keyed by. Oldest shape dropped above size
+    SQL_CACHE_SIZE = 1024
+    _sql_cache = {}
+    _sql_cache_lock = threading.Lock()
+
+    def __init__(self, database_name, table_name, transaction=None):
         """Constructor to initialise object.
 
         Arguments:
@@ -261,6 +517,10 @@ class DataBaseQueryClass():
             file if not present in current directory
         table_name: str
             name of new table to create in database
+        transaction: Transaction (Default = None)
+            open transaction (inside its 'with' block) to execute query in. Query then uses the
+            transaction's connection and its changes are committed or rolled back with the
+            transaction instead of on their own
 
         Attributes:
         -----------
@@ -273,6 +533,7 @@ class DataBaseQueryClass():
         """
         self.database_name = database_name
         self.table_name = table_name
+        self.transaction = transaction
         self.database_controller = DatabaseController(self.database_name)
         self.connection = None
         self.cursor = None
@@ -283,13 +544,221 @@ class DataBaseQueryClass():
 
     def create_database_connection(self):
         """attempt to retrieve sqlite3.Cursor and sqlite3.Connection objects using 
-            database controller objects"""
+            database controller objects, or the connection of 'transaction' if given"""
+        if self.transaction is not None:
+            if self.transaction.connection is None:
+                print(f"Error Log - Transaction for {self.database_name} is not open")
+                return
+            self.connection = self.transaction.connection
+            self.cursor = self.connection.cursor()
+            return
+
         self.cursor = self.database_controller.open_connection_and_create_cursor()
 
         if self.cursor is not None:
             # connection to database was successful, retrieve connection object
             self.connection = self.database_controller.connection
 
+    def commit(self):
+        """Commit changes made by query. Changes of a query in a transaction are committed
+            once by the transaction when its 'with' block ends."""
+        if self.transaction is None:
+            self.commit_connection(self.connection, self.database_name)
+
+    @staticmethod
+    def commit_connection(connection, database_name):
+        """Commit 'connection' of the application between 'begin_commit()' and 'end_commit()'
+            of the data_version watcher shared by the row and query caches, so the commit is not
+            taken for a change made by another process (which clears the caches) unless the
+            watcher cannot prove it is the application's own. Versions are not read if neither
+            cache watches them."""
+        caches = (row_cache.RowCache.for_database(database_name),
+                  query_cache.QueryCache.for_database(database_name))
+        if not any(cache.enabled and cache.watch_data_version for cache in caches):
+            connection.commit()
+            return
+        watcher = row_cache.DataVersionWatcher.for_database(database_name)
+        commit_version = watcher.begin_commit(connection)
+        try:
+            connection.commit()
+        finally:
+            watcher.end_commit(connection, commit_version)
+
+    def rollback(self):
+        """Undo changes of a failed query. A query in a transaction marks the transaction to be
+            rolled back when its 'with' block ends, so none of its queries' changes are kept."""
+        if self.transaction is None:
+            self.connection.rollback()
+        else:
+            self.transaction.rollback_only = True
+
+    def close_connection(self):
+        """Close cursor and return connection to connection pool. Connection of a transaction
+            is only returned when the transaction ends."""
+        if self.transaction is None:
+            self.database_controller.close_connection()
+        elif self.cursor is not None:
+            self.cursor.close()
+            self.cursor = None
+
+    def invalidate_cached_rows(self, key_field=None, key_values=None):
+        """Drop rows changed by query from the database's row cache ('row_cache.RowCache') and
+            bump the table generation of the query cache ('query_cache.QueryCache'), making
+            every cached search result of the table stale. Rows for 'key_values' are dropped if
+            'key_field' is the table primary_key, otherwise every cached row of table is dropped
+            (an empty 'key_values' drops no rows, for queries only adding rows). Caches are
+            invalidated again when a transaction commits, as rows may be read (and cached)
+            before the commit."""
+        if key_values is not None:
+            key_values = list(key_values)
+            registry = schema_registry.SchemaRegistry.for_database(self.database_name)
+            if key_values and key_field != registry.primary_key(self.connection,
+                                                                self.table_name):
+                key_values = None
+        if key_values != []:
+            row_cache.RowCache.for_database(self.database_name).invalidate(self.table_name,
+                                                                           key_values)
+        query_cache.QueryCache.for_database(self.database_name).invalidate(self.table_name)
+        if self.transaction is not None:
+            self.transaction.cached_row_changes.append((self.table_name, key_values))
+
+    def cached_sql(self, shape, build_sql):
+        """Return SQL text of operation 'shape', calling 'build_sql()' to create it only the
+            first time a shape is seen.
+
+        Arguments:
+        ----------
+        shape: tuple
+            everything the SQL text depends on: kind of query, table_name and field names (not
+            parameter values, which are bound with '?')
+        build_sql: callable
+            function without arguments returning SQL text of the operation
+
+        Return:
+        -------
+        str - SQL text (the same string object for every operation of the same shape)
+        """
+        sql = DataBaseQueryClass._sql_cache.get(shape)
+        if sql is None:
+            sql = build_sql()
+            with DataBaseQueryClass._sql_cache_lock:
+                if len(DataBaseQueryClass._sql_cache) >= self.SQL_CACHE_SIZE:
+                    del DataBaseQueryClass._sql_cache[next(iter(DataBaseQueryClass._sql_cache))]
+                DataBaseQueryClass._sql_cache[shape] = sql
+        return sql
+
+
+# -------------------------------------------------------------------------------------------------
+class Transaction:
+    """Unit of work grouping several queries in one database transaction. A connection is
+        borrowed from the connection pool and 'BEGIN IMMEDIATE' taken (reserving the write lock
+        so joined queries cannot fail part way through waiting for another writer) when the
+        'with' block is entered. Queries created with the transaction use its connection and do
+        not commit; all of their changes are committed with a single commit (one sync to disk)
+        when the block ends, or rolled back if an exception was raised in the block or a
+        joined query failed.
+
+    Attributes:
+    -----------
+    database_name: str
+        name of database transaction is made against
+    connection_pool: connection_pool.ConnectionPool
+        shared pool connection is borrowed from
+    connection: class:sqlite3.Connection
+        connection holding the open transaction (None outside 'with' block or if it could not
+        be opened)
+    rollback_only: bool
+        set by a joined query that failed, transaction is then rolled back instead of committed
+    committed: bool
+        True once transaction has been committed
+    cached_row_changes: list of tuples
+        (table_name, primary_key values or None for whole table) changed by joined queries,
+        invalidated in row and query caches again on commit
+
+    Methods:
+    --------
+    __init__(self, database_name):
+        initialise transaction for database
+
+    __enter__(self):
+        borrow connection and begin transaction
+
+    __exit__(self, exc_type, exc_value, traceback):
+        commit (or roll back) transaction and return connection to pool
+    """
+
+    def __init__(self, database_name):
+        """Constructor initialising transaction, connection is only borrowed when entering
+            'with' block.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database to connect to, also serves as path to database
+            file if not present in current directory
+        """
+        self.database_name = database_name
+        self.connection_pool = connection_pool.ConnectionPool.for_database(database_name)
+        self.connection = None
+        self.rollback_only = False
+        self.committed = False
+        self.cached_row_changes = []
+
+    def __enter__(self):
+        """Borrow connection from connection pool and begin transaction. If this fails an error
+            is printed and queries joining the transaction return None on 'execute()'.
+
+        Exceptions:
+        -----------
+        sqlite3.OperationalError:
+            raised if no connection is available or database is locked by another writer for
+            longer than the connection busy_timeout
+        """
+        try:
+            self.connection = self.connection_pool.checkout()
+            self.connection.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as operational_error:
+            print(f"Error starting transaction on Database {self.database_name}")
+            print(operational_error)
+            if self.connection is not None:
+                self.connection_pool.checkin(self.connection)
+                self.connection = None
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Commit transaction if 'with' block completed and no joined query failed, otherwise
+            roll back. Connection is returned to pool. Exceptions raised in block are not
+            suppressed.
+
+        Exceptions:
+        -----------
+        sqlite3.DatabaseError:
+            raised if commit fails, transaction is then rolled back
+        """
+        if self.connection is None:
+            return False
+
+        try:
+            if exc_type is None and not self.rollback_only:
+                DataBaseQueryClass.commit_connection(self.connection, self.database_name)
+                self.committed = True
+                rows = row_cache.RowCache.for_database(self.database_name)
+                results = query_cache.QueryCache.for_database(self.database_name)
+                for table_name, key_values in self.cached_row_changes:
+                    if key_values != []:
+                        rows.invalidate(table_name, key_values)
+                    results.invalidate(table_name)
+            else:
+                self.connection.rollback()
+        except sqlite3.DatabaseError as database_error:
+            print(f"Error committing transaction on Database {self.database_name}")
+            print(database_error)
+            self.connection.rollback()
+        finally:
+            self.connection_pool.checkin(self.connection)
+            self.connection = None
+        return False
+
 
 # -------------------------------------------------------------------------------------------------
 class CreateTableSingleKey(DataBaseQueryClass):
@@ -306,10 +775,18 @@ class CreateTableSingleKey(DataBaseQueryClass):
         list containing names of fields that would hold strings (TEXT)
     float-list: list
         list containing names of fields that would hold floats (REAL)
+    index_list: list
+        list containing names of fields to create a (non-unique) index for
+    unique_list: list
+        list containing names of fields (or tuples of field names for a composite index) to
+        create a unique index for
+    partial_index_list: list of tuples
+        (field name, level) for each partial index of rows with field at or below level
 
     Methods:
     ----------------
-    __init__(self, database_name, table_name, primary_key, int_list, text_list, float_list):
+    __init__(self, database_name, table_name, primary_key, int_list, text_list, float_list,
+             index_list, unique_list, partial_index_list):
         Initialize CreateTableSingleKey and parent DataBaseQueryClass objects allowing
         for sqlite3 connection. Parent contructor attempts to create connection to database.
 
@@ -318,7 +795,8 @@ class CreateTableSingleKey(DataBaseQueryClass):
     """
 
     def __init__(self, database_name, table_name, primary_key, int_list=None,
-                 text_list=None, float_list=None):
+                 text_list=None, float_list=None, index_list=None, unique_list=None,
+                 partial_index_list=None):
         """Constructor initialising CreateTableSingleKey and parent DataBaseQueryClass objects.
 
         Arguments:
@@ -331,12 +809,22 @@ class CreateTableSingleKey(DataBaseQueryClass):
             list containing names of fields that would hold strings (TEXT)
         float-list: list (Optional - set to None as Default)
             list containing names of fields that would hold floats (REAL)  
+        index_list: list (Optional - set to None as Default)
+            list containing names of fields to create a (non-unique) index for
+        unique_list: list (Optional - set to None as Default)
+            list containing names of fields (or tuples of field names for a composite index)
+            to create a unique index for
+        partial_index_list: list of tuples (Optional - set to None as Default)
+            (field name, level) for each partial index of rows with field at or below level
         """
         super().__init__(database_name, table_name)
         self.primary_key = primary_key
         self.int_list = int_list
         self.text_list = text_list
         self.float_list = float_list
+        self.index_list = index_list
+        self.unique_list = unique_list
+        self.partial_index_list = partial_index_list
 
         # attempt to make connection to database (through super class)
         # successful connection will initialise 'cursor' and 'connection' objects
@@ -387,6 +875,16 @@ class CreateTableSingleKey(DataBaseQueryClass):
             # cursor in parent class
             self.cursor.execute(query)
 
+            # create indexes for fields searched on, kept in same transaction as table
+            for index_query in CreateIndexes.index_queries(self.table_name, self.index_list,
+                                                           self.unique_list,
+                                                           self.partial_index_list):
+                self.cursor.execute(index_query)
+            self.commit()
+
+            # table has been created, cached schema for database is no longer valid
+            schema_registry.SchemaRegistry.for_database(self.database_name).invalidate()
+
         except sqlite3.OperationalError as operation_error:
             print(
                 f"An error has occured trying to create table {self.table_name}")
@@ -395,31 +893,42 @@ class CreateTableSingleKey(DataBaseQueryClass):
             print(database_error)
         finally:
             # close connection within method call to parent class
-            self.database_controller.close_connection()
+            self.close_connection()
 
 # -------------------------------------------------------------------------------------------------
-class VerifyTable(DataBaseQueryClass):
-    """Verify if a table exists in specified database.
-    
+class CreateIndexes(DataBaseQueryClass):
+    """Create any missing indexes and unique indexes on fields of an existing table. Index
+        creation uses 'IF NOT EXISTS' so class may be executed against any table at start up
+        to migrate tables created before fields were marked as indexed.
+
     Attributes:
     -----------
-    database_name: str
-        name of database to connect to
-    table_name: str
-        name of table in above database
+    index_list: list
+        list containing names of fields to create a (non-unique) index for
+    unique_list: list
+        list containing names of fields (or tuples of field names for a composite index) to
+        create a unique index for
+    partial_index_list: list of tuples
+        (field name, level) for each partial index of rows with field at or below level
 
     Methods:
     --------
-    __init__(self, database_name, table_name):
-        Constructor initialising VerifyTable and DataBaseQueryClass parent objects
+    __init__(self, database_name, table_name, index_list, unique_list, partial_index_list):
+        Initialize CreateIndexes and parent DataBaseQueryClass objects
+
+    index_queries(table_name, index_list, unique_list, partial_index_list): 'staticmethod'
+        return list of 'CREATE INDEX IF NOT EXISTS' queries for desired fields
 
     execute(self):
-        Connect to database, create SQL query to return count of tables in database
-         with name equal to 'table_name'. Close Database Connection.
+        Create missing indexes in a single transaction and close database connection.
+
+    report_duplicates(self, fields):
+        print number of values shared by rows that prevent a unique index on 'fields'
     """
 
-    def __init__(self, database_name, table_name):
-        """Constructor initialising VerifyTable and DataBaseQueryClass parent objects.
+    def __init__(self, database_name, table_name, index_list=None, unique_list=None,
+                 partial_index_list=None):
+        """Constructor initialising CreateIndexes and DataBaseQueryClass parent objects.
 
         Arguments:
         ---------------
@@ -427,80 +936,145 @@ class VerifyTable(DataBaseQueryClass):
             name of the database to connect to, also serves as path to database
             file if not present in current directory
         table_name: str
-            name of table to connect to in database
+            name of table in above database
+        index_list: list (Optional - set to None as Default)
+            list containing names of fields to create a (non-unique) index for
+        unique_list: list (Optional - set to None as Default)
+            list containing names of fields (or tuples of field names for a composite index)
+            to create a unique index for
+        partial_index_list: list of tuples (Optional - set to None as Default)
+            (field name, level) for each partial index of rows with field at or below level
         """
         super().__init__(database_name, table_name)
+        self.index_list = index_list
+        self.unique_list = unique_list
+        self.partial_index_list = partial_index_list
         # attempt to make connection to database (through super class)
         # successful connection will initialise 'cursor' and 'connection' objects
         self.create_database_connection()
 
+    @staticmethod
+    def index_queries(table_name, index_list=None, unique_list=None, partial_index_list=None):
+        """Return list of queries creating an index named '<table>_<field>_index' for each field
+            in 'index_list', a unique index named '<table>_<field>_unique' for each field in
+            'unique_list' ('<table>_<field>_<field>_unique' over the fields of a tuple of field
+            names) and a partial index named '<table>_<field>_at_most_<level>_index' of
+            rows with field at or below level for each (field, level) in 'partial_index_list'.
+            Any list may be None.
+
+            A partial index holds only the few rows at or below its level (for example books
+            low on stock) so it stays small however many rows are above it. sqlite only uses it
+            for a query which repeats its 'field <= level' condition (see 'ReadData')."""
+        queries = []
+        if index_list is not None:
+            for field in index_list:
+                queries.append(f"CREATE INDEX IF NOT EXISTS {table_name}_{field}_index " +
+                               f"ON {table_name}({field})")
+        if unique_list is not None:
+            for fields in unique_list:
+                if isinstance(fields, str):
+                    fields = (fields,)
+                queries.append("CREATE UNIQUE INDEX IF NOT EXISTS " +
+                               f"{table_name}_{'_'.join(fields)}_unique " +
+                               f"ON {table_name}({', '.join(fields)})")
+        if partial_index_list is not None:
+            # level is part of index name so a changed level creates a new index
+            for field, level in partial_index_list:
+                queries.append("CREATE INDEX IF NOT EXISTS " +
+                               f"{table_name}_{field}_at_most_{int(level)}_index " +
+                               f"ON {table_name}({field}) WHERE {field} <= {int(level)}")
+        return queries
+
     def execute(self):
-        """Connect to database, create SQL query to return count of tables in database
-            with name equal to 'table_name'. Close Database Connection.
+        """Create missing indexes for table in a single transaction. Close Database Connection.
+            A unique index declared after rows sharing its values were added cannot be made: it
+            is reported (with the number of values shared) and left out while the other indexes
+            are still created. Rows can only be merged on its fields ('UpsertData') once the
+            duplicated rows have been merged and the index created on a later start up.
 
         Return:
-        -----------
-        Returns None if there was an error when attempting to connect to database
-        Returns True if table count is 1 (table exists)
-        Returns False if table count is 0 (table does not exist)
+        ---------
+        Returns None if connection to database could not be made
+        Returns True if all indexes exist after execution, False if an index could not be made
 
         Exceptions:
         -----------
+        sqlite.IntegrityError:
+            raised by sqlite for existing duplicate values preventing creation of a unique index
+            (handled per index)
         sqlite.OperationalError:
             raised if SQL query is not correctly constructed and executed
         sqlite.DatabaseError:
-            raised for errors in closing connection or errors not caught by: sqlite.OperationalError
+            raised for errors not caught by: sqlite.OperationalError
         """
-        # check if connection (in parent class) to database was successful,
         if self.connection is None:
             return None
-        try:
-            # create and execute query to return number of tables with name equal to 'table_name'
-            # Referenced from Python Examples on 18 July 2023
-            # Available from: https://pythonexamples.org/python-sqlite3-check-if-table-exists/
-            table_count = self.cursor.execute("SELECT count(name) FROM sqlite_master WHERE " +
-                                              f"type='table' AND name=\'{self.table_name}\'").\
-                fetchone()
 
-            # if a table was found with matching name, return True. If not, return False
-            return True if table_count[0] == 1 else False
+        try:
+            all_created = True
+            for fields in self.unique_list or []:
+                fields = (fields,) if isinstance(fields, str) else fields
+                query = self.index_queries(self.table_name, unique_list=[fields])[0]
+                try:
+                    self.cursor.execute(query)
+                except sqlite3.IntegrityError:
+                    self.report_duplicates(fields)
+                    all_created = False
+            queries = self.index_queries(self.table_name, self.index_list,
+                                         partial_index_list=self.partial_index_list)
+            for query in queries:
+                self.cursor.execute(query)
+            self.commit()
+            return all_created
 
         except sqlite3.OperationalError as operational_error:
-            print(
-                f"An error has occured trying to confirm existence of table {self.table_name}")
+            print(f"An error has occured trying to create indexes on {self.table_name}")
             print(operational_error)
-            return None
+            return False
         except sqlite3.DatabaseError as database_error:
             print(database_error)
-            return None
+            return False
         finally:
             # close connection to database with parent class
-            self.database_controller.close_connection()
+            self.close_connection()
+
+    def report_duplicates(self, fields):
+        """Print that unique index on 'fields' could not be created and how many values of
+            'fields' are shared by more than one row."""
+        field_list = ", ".join(fields)
+        duplicate_count = self.cursor.execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM {self.table_name} GROUP BY {field_list} " +
+            "HAVING COUNT(*) > 1)").fetchone()[0]
+        print(f"Error - unique index on ({field_list}) of {self.table_name} not created, " +
+              f"{duplicate_count} values are shared by more than one row. Merge these rows to " +
+              f"match rows on ({field_list})")
 
 
 # -------------------------------------------------------------------------------------------------
-class InsertData(DataBaseQueryClass):
-    """Allows for insertion of single or multiple rows to table in database.
+class CreateFullTextIndex(DataBaseQueryClass):
+    """Create an sqlite FTS5 full-text index named '<table>_fts' over text fields of a table.
+        Index stores no copy of the text (external content table) and is kept in sync with the
+        table by insert, delete and update triggers. Existing rows are indexed when the full-text
+        table is first created, executing against a table that already has an index does nothing.
 
     Attributes:
-    -----------------
-    row_data_list: list of tuples
-        list containing at least one tuple with values to be inserted into table.
-         table must exist in database with values checked to match type and count 
-         of table fields
+    -----------
+    primary_key: str
+        name of integer primary_key field of table (used as full-text rowid)
+    full_text_list: list
+        names of text fields to include in full-text index
 
     Methods:
-    ----------------
-    __init__(self, database_name, table_name, row_data_list):
-        Initialize InsertData and parent DataBaseQueryClass objects allowing
-        for sqlite3 connection. Parent contructor attempts to create connection to database.
+    --------
+    __init__(self, database_name, table_name, primary_key, full_text_list):
+        Initialize CreateFullTextIndex and parent DataBaseQueryClass objects
 
     execute(self):
-        Use values in tuples of row_data_list to add row(s) to table and close database connection
+        Create full-text table and triggers, populating index from existing rows when created
     """
 
-    def __init__(self, database_name, table_name, row_data_list):
-        """Constructor initialising InsertData and parent DataBaseQueryClass objects object.
+    def __init__(self, database_name, table_name, primary_key, full_text_list):
+        """Constructor initialising CreateFullTextIndex and DataBaseQueryClass parent objects.
 
         Arguments:
         ---------------
@@ -508,103 +1082,1075 @@ class InsertData(DataBaseQueryClass):
             name of the database to connect to, also serves as path to database
             file if not present in current directory
         table_name: str
-            name of table to connect to in database
-        row_data_list: list of tuples (containing at least one)
-            values to add in row(s) inserted into table
-            NOTE: values MUST be added in same order as those used when table was created
+            name of table in above database
+        primary_key: str
+            name of integer primary_key field of table
+        full_text_list: list
+            names of text fields to include in full-text index
         """
         super().__init__(database_name, table_name)
-        self.row_data_list = row_data_list
+        self.primary_key = primary_key
+        self.full_text_list = full_text_list
         # attempt to make connection to database (through super class)
         # successful connection will initialise 'cursor' and 'connection' objects
         self.create_database_connection()
 
     def execute(self):
-        """Connect to database, create SQL query to insert new row(s) into existing table and
-            commit change. Close Database Connection.
+        """Create full-text table '<table>_fts' and triggers if not present and index existing
+            rows. Close Database Connection.
 
         Return:
         ---------
-        Returns None only if connection to database could not be made
-        Return True for more than one row added, False for no rows added
+        Returns None if connection to database could not be made
+        Returns True if full-text index exists after execution, False if it could not be made
 
         Exceptions:
         -----------
         sqlite.OperationalError:
-            raised if SQL query is not correctly constructed and executed
+            raised if SQL query is not correctly constructed and executed or sqlite has been
+            built without FTS5
         sqlite.DatabaseError:
-            raised for errors in closing connection or errors not caught by: sqlite.OperationalError
+            raised for errors not caught by: sqlite.OperationalError
         """
-        # check if connection (in parent class) to database in __init__() was successful,
-        # it not return None
         if self.connection is None:
             return None
 
-        try:
-            # begin query construction for row(s) insertion
-            query = f"INSERT INTO {self.table_name} VALUES( "
-            # retrieve first tuple to determine number of fields in table
-            tup = self.row_data_list[0]
-            for i in range(len(tup)):
-                # create corresponding number of '?' according to number of fields in table
-                query += "?"
-                # stop adding commas for '?' separation
-                if i != (len(tup) - 1):
-                    query += ", "
-            # close query string
-            query += ")"
-
-            if len(self.row_data_list) == 1:
-                # execute for single row insertion (one tuple)
-                self.cursor.execute(query, self.row_data_list[0])
-            else:
-                # execute for multiple row insertions with cursor in parent class
-                self.cursor.executemany(query, self.row_data_list)
-            self.connection.commit()
+        fts_table = f"{self.table_name}_fts"
+        fields = ", ".join(self.full_text_list)
+        new_values = ", ".join([f"new.{field}" for field in self.full_text_list])
+        old_values = ", ".join([f"old.{field}" for field in self.full_text_list])
 
-            # determine number of affected rows and return True if more than one row
-            # was affected with database query
-            affected_rows = self.cursor.rowcount
-            return True if affected_rows > 0 else False
+        try:
+            registry = schema_registry.SchemaRegistry.for_database(self.database_name)
+            if registry.table_exists(self.connection, fts_table):
+                return True
+
+            self.cursor.execute(f"CREATE VIRTUAL TABLE {fts_table} USING fts5({fields}, " +
+                                f"content='{self.table_name}', " +
+                                f"content_rowid='{self.primary_key}')")
+            # triggers keeping full-text index in sync with table. Update trigger only fires
+            # for changes to indexed text fields (not for stock quantity changes)
+            self.cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON " +
+                f"{self.table_name} BEGIN INSERT INTO {fts_table}(rowid, {fields}) " +
+                f"VALUES (new.{self.primary_key}, {new_values}); END")
+            self.cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON " +
+                f"{self.table_name} BEGIN INSERT INTO {fts_table}({fts_table}, rowid, " +
+                f"{fields}) VALUES ('delete', old.{self.primary_key}, {old_values}); END")
+            self.cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {fields} ON " +
+                f"{self.table_name} BEGIN INSERT INTO {fts_table}({fts_table}, rowid, " +
+                f"{fields}) VALUES ('delete', old.{self.primary_key}, {old_values}); " +
+                f"INSERT INTO {fts_table}(rowid, {fields}) " +
+                f"VALUES (new.{self.primary_key}, {new_values}); END")
+            # index rows already present in table
+            self.cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+            self.commit()
+            registry.invalidate()
+            return True
 
         except sqlite3.OperationalError as operational_error:
-            print(
-                f"An error has occured trying to insert data into {self.table_name}")
+            print(f"An error has occured trying to create full-text index on {self.table_name}")
             print(operational_error)
+            return False
         except sqlite3.DatabaseError as database_error:
             print(database_error)
+            return False
         finally:
-            # close connection within method call to parent class
-            self.database_controller.close_connection()
+            # close connection to database with parent class
+            self.close_connection()
 
 
 # -------------------------------------------------------------------------------------------------
-class ReadData(DataBaseQueryClass):
-    """Allows for reading of desired values from table using multiple fields to
-        perform check of matching attributes. Returns matching row(s).
-
+class VerifyTable(DataBaseQueryClass):
+    """Verify if a table exists in specified database. Table names are read from the shared
+        'SchemaRegistry' cache which only queries 'sqlite_master' when the database schema has
+        changed.
+    
     Attributes:
-    -----------------
-    fields_list: list of field names as strings
-        desired fields to return values (provide '*' for all)
-    where_fields_list: list of fields as strings
-        field names used in WHERE part of query to perform checks on
-    search_vals: tuple with entities matching type corresponding to entity in where_fields_list
-        values to be checked for match
+    -----------
+    database_name: str
+        name of database to connect to
+    table_name: str
+        name of table in above database
 
     Methods:
-    ----------------
-    __init__(self, database_name, table_name, fields_list, where_field_list, search_vals):
-        Initialize ReadData and parent DataBaseQueryClass objects allowing
-        for sqlite3 connection. Parent contructor attempts to create connection to database.
+    --------
+    __init__(self, database_name, table_name, transaction):
+        Constructor initialising VerifyTable and DataBaseQueryClass parent objects
 
     execute(self):
-        Search for and return matching row from table and close database connection
+        Connect to database, check cached schema for a table with name equal to 'table_name'.
+         Close Database Connection.
     """
 
+    def __init__(self, database_name, table_name, transaction=None):
+        """Constructor initialising VerifyTable and DataBaseQueryClass parent objects.
+
+        Arguments:
+        ---------------
+        database_name: str
+            name of the database to connect to, also serves as path to database
+            file if not present in current directory
+        table_name: str
+            name of table to connect to in database
+        transaction: Transaction (Default = None)
+            open transaction to execute in, committed or rolled back with the transaction
+        """
+        super().__init__(database_name, table_name, transaction)
+        # attempt to make connection to database (through super class)
+        # successful connection will initialise 'cursor' and 'connection' objects
+        self.create_database_connection()
+
+    def execute(self):
+        """Connect to database, check cached schema (reloaded only if database schema_version
+            has changed) for a table with name equal to 'table_name'. Close Database Connection.
+
+        Return:
+        -----------
+        Returns None if there was an error when attempting to connect to database
+        Returns True if table exists
+        Returns False if table does not exist
+
+        Exceptions:
+        -----------
+        sqlite.OperationalError:
+            raised if SQL query is not correctly constructed and executed
+        sqlite.DatabaseError:
+            raised for errors in closing connection or errors not caught by: sqlite.OperationalError
+        """
+        # check if connection (in parent class) to database was successful,
+        if self.connection is None:
+            return None
+        try:
+            # check cached table names for database. Cache only queries 'sqlite_master' when
+            # first loaded or when 'PRAGMA schema_version' shows the schema has changed
+            return schema_registry.SchemaRegistry.for_database(self.database_name).\
+                table_exists(self.connection, self.table_name)
+
+        except sqlite3.OperationalError as operational_error:
+            print(
+                f"An error has occured trying to confirm existence of table {self.table_name}")
+            print(operational_error)
+            return None
+        except sqlite3.DatabaseError as database_error:
+            print(database_error)
+            return None
+        finally:
+            # close connection to database with parent class
+            self.close_connection()
+
+
+# -------------------------------------------------------------------------------------------------
+class InsertData(DataBaseQueryClass):
+    """Allows for insertion of single or multiple rows to table in database.
+
+    Attributes:
+    -----------------
+    row_data_list: list of tuples
+        list containing at least one tuple with values to be inserted into table.
+         table must exist in database with values checked to match type and count 
+         of table fields
+    field_names: list of strings (or None)
+        names of fields values in each tuple are for. None for values of all fields
+    new_row_id: int
+        rowid (integer primary_key value) of last row inserted, None before execution
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, row_data_list, field_names, transaction):
+        Initialize InsertData and parent DataBaseQueryClass objects allowing
+        for sqlite3 connection. Parent contructor attempts to create connection to database.
+
+    execute(self):
+        Use values in tuples of row_data_list to add row(s) to table and close database connection
+
+    build_query(self):
+        return INSERT query string for 'field_names' and number of values in a row
+    """
+
+    def __init__(self, database_name, table_name, row_data_list, field_names=None,
+                 transaction=None):
+        """Constructor initialising InsertData and parent DataBaseQueryClass objects object.
+
+        Arguments:
+        ---------------
+        database_name: str
+            name of the database to connect to, also serves as path to database
+            file if not present in current directory
+        table_name: str
+            name of table to connect to in database
+        row_data_list: list of tuples (containing at least one)
+            values to add in row(s) inserted into table
+            NOTE: values MUST be added in same order as those used when table was created
+             or in order of 'field_names' if given
+        field_names: list of strings (Optional - set to None as Default)
+            names of fields values are inserted into. Omitting an integer primary_key here lets
+            sqlite allocate the next primary_key value atomically within the insert
+        transaction: Transaction (Default = None)
+            open transaction to execute in, committed or rolled back with the transaction
+        """
+        super().__init__(database_name, table_name, transaction)
+        self.row_data_list = row_data_list
+        self.field_names = field_names
+        self.new_row_id = None
+        # attempt to make connection to database (through super class)
+        # successful connection will initialise 'cursor' and 'connection' objects
+        self.create_database_connection()
+
+    def execute(self):
+        """Connect to database, create SQL query to insert new row(s) into existing table and
+            commit change. Close Database Connection.
+
+        Return:
+        ---------
+        Returns None only if connection to database could not be made
+        Return True for more than one row added, False for no rows added
+        NOTE: rowid of last inserted row is stored in attribute 'new_row_id'
+
+        Exceptions:
+        -----------
+        sqlite.OperationalError:
+            raised if SQL query is not correctly constructed and executed
+        sqlite.DatabaseError:
+            raised for errors in closing connection or errors not caught by: sqlite.OperationalError
+        """
+        # check if connection (in parent class) to database in __init__() was successful,
+        # it not return None
+        if self.connection is None:
+            return None
+
+        try:
+            # query for row(s) insertion, built once for each table, fields and value count
+            field_names = tuple(self.field_names) if self.field_names is not None else None
+            query = self.cached_sql(
+                ("insert", self.table_name, field_names, len(self.row_data_list[0])),
+                self.build_query)
+
+            if len(self.row_data_list) == 1:
+                # execute for single row insertion (one tuple)
+                self.cursor.execute(query, self.row_data_list[0])
+            else:
+                # execute for multiple row insertions with cursor in parent class
+                self.cursor.executemany(query, self.row_data_list)
+            # primary_key allocated by sqlite for row inserted by 'execute' above, read before
+            # commit on same connection so value cannot be affected by other writers
+            self.new_row_id = self.cursor.lastrowid
+            self.commit()
+
+            # determine number of affected rows and return True if more than one row
+            # was affected with database query
+            affected_rows = self.cursor.rowcount
+
+            # drop any cached rows for primary_key values given in rows (rows given no
+            # primary_key value are new rows and cannot be cached yet), cached search results
+            # of table are made stale
+            primary_key = schema_registry.SchemaRegistry.for_database(
+                self.database_name).primary_key(self.connection, self.table_name)
+            if self.field_names is None:
+                self.invalidate_cached_rows()
+            elif primary_key in self.field_names:
+                key_index = self.field_names.index(primary_key)
+                self.invalidate_cached_rows(primary_key,
+                                            [row[key_index] for row in self.row_data_list])
+            else:
+                self.invalidate_cached_rows(primary_key, [])
+            return True if affected_rows > 0 else False
+
+        except sqlite3.OperationalError as operational_error:
+            self.rollback()
+            print(
+                f"An error has occured trying to insert data into {self.table_name}")
+            print(operational_error)
+        except sqlite3.DatabaseError as database_error:
+            self.rollback()
+            print(database_error)
+        finally:
+            # close connection within method call to parent class
+            self.close_connection()
+
+    def build_query(self):
+        """Return INSERT query naming 'field_names' (if given) with one '?' for each value of
+            the first row in 'row_data_list'."""
+        query = f"INSERT INTO {self.table_name}"
+        if self.field_names is not None:
+            query += f"({', '.join(self.field_names)})"
+        # '?' for each value, number of values taken from first row
+        return query + f" VALUES({', '.join(['?'] * len(self.row_data_list[0]))})"
+
+
+# -------------------------------------------------------------------------------------------------
+class BulkInsertData(DataBaseQueryClass):
+    """Insert rows from an iterator (for example a file being read) in chunks, each chunk added
+        with one 'executemany' in its own transaction. Rows rejected by the database (constraint
+        errors) are reported by row number without losing the other rows of their chunk.
+
+    Attributes:
+    -----------------
+    row_iterator: iterable of tuples
+        pairs of (row_number, row_values) where 'row_number' identifies the row in its source
+        (such as a file line number) for error reports and 'row_values' is a tuple of values
+    field_names: list of strings (or None)
+        names of fields values in each tuple are for. None for values of all fields
+    chunk_size: int
+        number of rows inserted in each transaction
+    inserted_count: int
+        number of rows added to table
+    row_errors: list of tuples
+        (row_number, error message) for each row the database rejected
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, row_iterator, field_names, chunk_size):
+        Initialize BulkInsertData and parent DataBaseQueryClass objects
+
+    execute(self): 'override'
+        Insert all rows from 'row_iterator' chunk by chunk and close database connection
+
+    insert_query(self, value_count):
+        return INSERT query for rows holding 'value_count' values
+
+    insert_chunk(self, query, chunk):
+        insert and commit one chunk of rows, recording any rows rejected by the database
+    """
+
+    def __init__(self, database_name, table_name, row_iterator, field_names=None,
+                 chunk_size=5000):
+        """Constructor initialising BulkInsertData and parent DataBaseQueryClass objects.
+
+        Arguments:
+        ---------------
+        database_name: str
+            name of the database to connect to, also serves as path to database
+            file if not present in current directory
+        table_name: str
+            name of table to insert rows into
+        row_iterator: iterable of (row_number, tuple) pairs
+            rows to insert. Iterator is only consumed one chunk at a time
+            NOTE: values MUST be in order of 'field_names' or of table fields if not given
+        field_names: list of strings (Optional - set to None as Default)
+            names of fields values are inserted into. Omitting an integer primary_key here lets
+            sqlite allocate primary_key values within the insert
+        chunk_size: int (Default = 5000)
+            number of rows inserted and committed together
+        """
+        super().__init__(database_name, table_name)
+        self.row_iterator = row_iterator
+        self.field_names = field_names
+        self.chunk_size = chunk_size
+        self.inserted_count = 0
+        self.row_errors = []
+        # attempt to make connection to database (through super class)
+        # successful connection will initialise 'cursor' and 'connection' objects
+        self.create_database_connection()
+
+    def execute(self):
+        """Read rows from 'row_iterator' a chunk at a time and insert each chunk in a single
+            transaction. If the database rejects a chunk, it is rolled back and its rows inserted
+            one at a time (in one transaction) so only the offending rows are left out and
+            reported in 'row_errors'. Close Database Connection.
+
+        Return:
+        ---------
+        Returns None only if connection to database could not be made
+        Return True for at least one row added, False for no rows added
+        NOTE: number of rows added is stored in attribute 'inserted_count'
+
+        Exceptions:
+        -----------
+        sqlite.IntegrityError:
+            raised by sqlite for rows breaking a table constraint (handled per row)
+        sqlite.OperationalError:
+            raised if SQL query is not correctly constructed and executed
+        sqlite.DatabaseError:
+            raised for errors not caught by: sqlite.OperationalError
+        """
+        if self.connection is None:
+            return None
+
+        try:
+            query = None
+            chunk = []
+            for row in self.row_iterator:
+                chunk.append(row)
+                if len(chunk) == self.chunk_size:
+                    query = query or self.insert_query(len(row[1]))
+                    self.insert_chunk(query, chunk)
+                    chunk = []
+            # insert remaining rows (last chunk smaller than 'chunk_size')
+            if chunk:
+                query = query or self.insert_query(len(chunk[0][1]))
+                self.insert_chunk(query, chunk)
+            return self.inserted_count > 0
+
+        except sqlite3.OperationalError as operational_error:
+            self.connection.rollback()
+            print(
+                f"An error has occured trying to insert data into {self.table_name}")
+            print(operational_error)
+        except sqlite3.DatabaseError as database_error:
+            self.connection.rollback()
+            print(database_error)
+        finally:
+            # close connection within method call to parent class
+            self.close_connection()
+
+    def insert_query(self, value_count):
+        """Return INSERT query for rows of 'value_count' values into 'field_names'."""
+        query = f"INSERT INTO {self.table_name}"
+        if self.field_names is not None:
+            query += f"({', '.join(self.field_names)})"
+        return query + f" VALUES({', '.join(['?'] * value_count)})"
+
+    def insert_chunk(self, query, chunk):
+        """Insert and commit 'chunk' of (row_number, values) pairs, falling back to row by row
+            insertion to find rows rejected by the database if the whole chunk fails. Rows are
+            added to a full-text index of the table by its insert trigger, which is never
+            dropped (DDL would change the schema_version, making every connection recompile its
+            statements, and let rows of other writers go unindexed)."""
+        try:
+            self.cursor.executemany(query, [values for _, values in chunk])
+            self.commit_connection(self.connection, self.database_name)
+            self.inserted_count += len(chunk)
+            # new rows change search results but no cached row
+            self.invalidate_cached_rows(key_values=[])
+            return
+        except sqlite3.IntegrityError:
+            self.connection.rollback()
+
+        for row_number, values in chunk:
+            try:
+                self.cursor.execute(query, values)
+                self.inserted_count += 1
+            except sqlite3.IntegrityError as integrity_error:
+                self.row_errors.append((row_number, str(integrity_error)))
+        self.commit_connection(self.connection, self.database_name)
+        self.invalidate_cached_rows(key_values=[])
+
+
+# -------------------------------------------------------------------------------------------------
+class UpsertData(BulkInsertData):
+    """Child class of BulkInsertData merging rows into a table with 'INSERT ... ON CONFLICT DO
+        UPDATE': rows whose 'conflict_field' value is new are inserted and rows matching an
+        existing row update it in the same statement (no lookup per row). Fields in
+        'add_fields' are added to the existing value (e.g. stock quantity of a restock) and
+        fields in 'replace_fields' are overwritten. Rows are merged chunk by chunk as in
+        BulkInsertData with rows rejected by the database reported by row number.
+
+    Attributes:
+    -----------------
+    conflict_field: str or tuple of strings
+        primary_key or field with a unique index rows are matched by (or fields of a composite
+        unique index)
+    add_fields: list of strings
+        fields whose value in row is added to value of existing row
+    replace_fields: list of strings
+        fields whose value in row replaces value of existing row
+    (see BulkInsertData for other attributes, 'inserted_count' holds rows inserted or updated)
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, row_iterator, field_names, conflict_field,
+             add_fields, replace_fields, chunk_size):
+        Initialize UpsertData and parent BulkInsertData objects
+
+    execute(self): 'override'
+        check rows can be matched on 'conflict_field', then merge all rows as BulkInsertData
+
+    conflict_index_exists(self):
+        return True if 'conflict_field' is the primary_key or fields of a unique index
+
+    insert_query(self, value_count): 'override'
+        return INSERT query with ON CONFLICT clause merging rows into existing rows
+
+    insert_chunk(self, query, chunk): 'override'
+        merge and commit one chunk of rows, dropping table's cached rows
+    """
+
+    def __init__(self, database_name, table_name, row_iterator, field_names, conflict_field,
+                 add_fields=None, replace_fields=None, chunk_size=5000):
+        """Constructor initialising UpsertData and parent BulkInsertData objects.
+
+        Arguments:
+        ---------------
+        database_name: str
+            name of the database to connect to, also serves as path to database
+            file if not present in current directory
+        table_name: str
+            name of table to merge rows into
+        row_iterator: iterable of (row_number, tuple) pairs
+            rows to merge, values in order of 'field_names'. An integer primary_key value of
+            None inserts the row with a primary_key allocated by sqlite
+        field_names: list of strings
+            names of fields values in each tuple are for (must include 'conflict_field')
+        conflict_field: str or tuple of strings
+            primary_key or field with a unique index rows are matched by, or tuple of the
+            fields of a composite unique index (e.g. ('title', 'author'))
+        add_fields: list of strings (Default = None)
+            fields added to existing value when a row matches (e.g. ['qty'])
+        replace_fields: list of strings (Default = None)
+            fields overwritten when a row matches. Fields in neither list keep their value,
+            a matching row is left unchanged if both lists are empty
+        chunk_size: int (Default = 5000)
+            number of rows merged and committed together
+        """
+        super().__init__(database_name, table_name, row_iterator, field_names, chunk_size)
+        self.conflict_field = conflict_field
+        self.add_fields = add_fields or []
+        self.replace_fields = replace_fields or []
+
+    def execute(self):
+        """Merge rows as BulkInsertData once rows are known to be matchable on
+            'conflict_field'. A table made before its unique index was declared has no such
+            index while its rows share values of 'conflict_field' ('CreateIndexes' reports
+            them), sqlite would then reject every row so none is read.
+
+        Return:
+        ---------
+        Returns None if connection to database could not be made or table has no unique index
+        on 'conflict_field'
+        Return True for at least one row added or updated, False for no rows added or updated
+        """
+        if self.connection is None:
+            return None
+        try:
+            if not self.conflict_index_exists():
+                conflict_fields = ((self.conflict_field,) if isinstance(self.conflict_field, str)
+                                   else self.conflict_field)
+                print(f"Error - rows cannot be merged into {self.table_name}, there is no " +
+                      f"unique index on ({', '.join(conflict_fields)}). Rows sharing these " +
+                      "values must be merged before the index can be created")
+                self.close_connection()
+                return None
+        except sqlite3.DatabaseError as database_error:
+            print(database_error)
+            self.close_connection()
+            return None
+        return super().execute()
+
+    def conflict_index_exists(self):
+        """Return True if 'conflict_field' is the primary_key of table or holds the fields of
+            one of its unique indexes (read through the schema registry)."""
+        conflict_fields = ((self.conflict_field,) if isinstance(self.conflict_field, str)
+                           else tuple(self.conflict_field))
+        registry = schema_registry.SchemaRegistry.for_database(self.database_name)
+        if conflict_fields == (registry.primary_key(self.connection, self.table_name),):
+            return True
+        return any(set(index) == set(conflict_fields)
+                   for index in registry.unique_indexes(self.connection, self.table_name))
+
+    def insert_query(self, value_count):
+        """Return 'INSERT ... ON CONFLICT(conflict_field) DO UPDATE' query adding 'add_fields'
+            and replacing 'replace_fields' of an existing row ('excluded' holds row values)."""
+        assignments = ([f"{field} = {field} + excluded.{field}" for field in self.add_fields] +
+                       [f"{field} = excluded.{field}" for field in self.replace_fields])
+        conflict_fields = ((self.conflict_field,) if isinstance(self.conflict_field, str)
+                           else self.conflict_field)
+        query = (super().insert_query(value_count) +
+                 f" ON CONFLICT({', '.join(conflict_fields)}) ")
+        if not assignments:
+            return query + "DO NOTHING"
+        return query + "DO UPDATE SET " + ", ".join(assignments)
+
+    def insert_chunk(self, query, chunk):
+        """Merge and commit 'chunk' as BulkInsertData, then drop cached rows of table (rows
+            matched on 'conflict_field' may have been changed)."""
+        super().insert_chunk(query, chunk)
+        self.invalidate_cached_rows()
+
+
+# -------------------------------------------------------------------------------------------------
+class ReadData(DataBaseQueryClass):
+    """Allows for reading of desired values from table using multiple fields to
+        perform check of matching attributes. Returns matching row(s).
+
+    Attributes:
+    -----------------
+    fields_list: list of field names as strings
+        desired fields to return values (provide '*' for all)
+    where_fields_list: list of fields as strings
+        field names used in WHERE part of query to perform checks on
+    search_vals: tuple with entities matching type corresponding to entity in where_fields_list
+        values to be checked for match
+    use_cache: bool
+        class attribute, if True searches read through the row cache (primary_key alone) or
+        the query cache (other searches)
+    cached_rows: list
+        result found in a cache when initialised (None if result is read from database)
+    row_factory: str or class
+        type of returned rows, one of 'ROW_FACTORIES' ("tuple", "namedtuple") or a class
+        (or function) called with the values of a row, for example a '__slots__' record class
+        ('book.FieldControl.record_class()')
+    where_operators: list of str (or None)
+        comparison of each field in where_fields_list with its search value, one of
+        'WHERE_OPERATORS'. None compares every field with '='
+    order_by: list of str (or None)
+        names of fields rows are ordered by (ascending)
+    limit: int (or None)
+        maximum number of rows returned, None for all matching rows
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, fields_list, where_field_list, search_vals,
+             transaction, row_factory, where_operators, order_by, limit):
+        Initialize ReadData and parent DataBaseQueryClass objects allowing
+        for sqlite3 connection. Parent contructor attempts to create connection to database.
+
+    execute(self):
+        Search for and return matching row from table and close database connection
+
+    execute_stream(self, arraysize):
+        generator yielding header and matching rows fetched in chunks of 'arraysize' rows,
+        closing database connection when exhausted or closed
+
+    build_query(self):
+        return query string and parameters for desired fields and 'where' conditions
+
+    build_sql(self):
+        return SQL text of query, built once for each query shape (see 'cached_sql()')
+
+    read_cache(self):
+        return result of search held in row cache or query cache, else None
+
+    cached_row_key(self):
+        return primary_key value searched for if row read may be stored in row cache, else None
+
+    cached_query_key(self):
+        return key of search if result read may be stored in query cache, else None
+
+    make_rows(self, fields_and_values):
+        return result with each row built by 'row_factory', header tuple kept first
+
+    row_class(self, field_names):
+        return class (or function) building one row from its values for 'row_factory'
+
+    is_key_lookup(self):
+        return True if where fields are only compared for equality and rows are not limited
+
+    where_conditions(self):
+        return conditions of where fields and their parameters ('BETWEEN' takes two)
+
+    build_conditions(where_fields_list, where_operators, search_vals): 'staticmethod'
+        return conditions and parameters for where fields compared by their operators
+    """
+    # searches read through the database's 'row_cache.RowCache' (primary_key alone) or
+    # 'query_cache.QueryCache' (other searches)
+    use_cache = True
+    # names of row factories built in, any class called with the values of a row may be given
+    ROW_FACTORIES = ("tuple", "namedtuple")
+    # comparisons of a where field with its search value ('BETWEEN' takes a (low, high) pair)
+    WHERE_OPERATORS = ("=", "<", "<=", ">", ">=", "BETWEEN")
+    # named tuple classes generated for each table and projected fields, shared by all reads
+    _namedtuple_classes = {}
+
     def __init__(self, database_name, table_name, fields_list, where_field_list=None,
+                 search_vals=None, transaction=None, row_factory="tuple", where_operators=None,
+                 order_by=None, limit=None):
+        """Constructor initialising ReadData and parent DataBaseQueryClass objects.
+
+        Arguments:
+        ---------------
+        database_name: str
+            name of the database to connect to, also serves as path to database
+            file if not present in current directory
+        table_name: str
+            name of table to connect to in database
+        fields_list: list of field names as strings
+            desired fields to return values from
+        where_fields_list: list of fields as strings        
+            field names used in WHERE part of query to perform checks on
+        search_vals: tuple with entities matching type corresponding to entity in where_fields_list
+            values to be checked for match 
+        transaction: Transaction (Default = None)
+            open transaction to read in (reads changes not yet committed by the transaction)
+        row_factory: str or class (Default = "tuple")
+            "tuple" for rows as read from sqlite3, "namedtuple" for named tuples with a field
+            for each projected field, or a class (or function) called with the values of each
+            row in projected field order
+        where_operators: list of str (Default = None)
+            comparison of each field in where_fields_list with its search value: '=', '<',
+            '<=', '>', '>=' or 'BETWEEN' (search value is a (low, high) pair, both inclusive).
+            None compares every field with '='
+        order_by: list of str (Default = None)
+            names of fields rows are ordered by (ascending), None for no ordering
+        limit: int (Default = None)
+            maximum number of rows returned, None for all matching rows
+        """
+        super().__init__(database_name, table_name, transaction)
+        self.fields_list = fields_list
+        self.where_fields_list = where_field_list
+        self.search_vals = search_vals
+        self.row_factory = row_factory
+        self.where_operators = where_operators
+        self.order_by = order_by
+        self.limit = limit
+        self.cached_rows = None
+        if isinstance(row_factory, str) and row_factory not in self.ROW_FACTORIES:
+            print(f"Error Log - Unknown row factory '{row_factory}', " +
+                  f"use one of {self.ROW_FACTORIES} or a class")
+            return
+        if where_operators is not None and (
+                len(where_operators) != len(where_field_list or ()) or
+                any(operator not in self.WHERE_OPERATORS for operator in where_operators)):
+            print(f"Error Log - Where operators {where_operators} must be one of " +
+                  f"{self.WHERE_OPERATORS} for each where field")
+            return
+        # result of search is looked up in row or query cache first, a connection is only
+        # borrowed if result is not held there
+        self.cached_rows = self.read_cache()
+        if self.cached_rows is None:
+            # attempt to make connection to database (through super class)
+            # successful connection will initialise 'cursor' and 'connection' objects
+            self.create_database_connection()
+
+    def execute(self):
+        """Create SQL query to read row from table based on desired fields and values.
+            Close Database Connection. A result found in the row or query cache is returned
+            without a query.
+
+        Return:
+        -----------
+        Match Found - List with header Tuple (names of projected fields) followed by row(s)
+            built by 'row_factory' (Tuples by default)
+        No Match - Empty List
+        None - Field list does not have matching value count, connection could not be made,
+            'row_factory' is unknown or 'where_operators' are invalid
+
+        Exceptions:
+        -----------
+        sqlite.OperationalError:
+            raised if SQL query is not correctly constructed and executed
+        sqlite.DatabaseError:
+            raised for errors in closing connection or errors not caught by: sqlite.OperationalError
+        """
+        if self.cached_rows is not None:
+            return self.make_rows(self.cached_rows)
+        # check if connection (in parent class) to database in __init__() was successful,
+        if self.connection is None:
+            return None
+
+        try:
+            # a row read by primary_key is stored in row cache and other results in query
+            # cache for following identical searches
+            key_value = self.cached_row_key()
+            query_key = self.cached_query_key() if key_value is None else None
+            # generation is read before query, result is not stored if table is written to
+            # while it is being read
+            if key_value is not None:
+                cache = row_cache.RowCache.for_database(self.database_name)
+                generation = cache.generation
+            elif query_key is not None:
+                cache = query_cache.QueryCache.for_database(self.database_name)
+                generation = cache.generation(self.table_name)
+
+            # execute query and store returned row(s)
+            query, parameters = self.build_query()
+            rows_returned = self.cursor.execute(query, parameters).fetchall()
+
+            # if at least one row was returned, retrieve field names from description of the
+            # query just executed so header matches projected 'fields_list' (no second query)
+            # Referenced from AlixaProDev on 19 July 2023
+            # Available from:
+            # https://www.alixaprodev.com/how-to-get-column-names-from-sqlite-database-table-in-python/
+            if len(rows_returned) > 0:
+                field_names = tuple([description[0]
+                                    for description in self.cursor.description])
+
+                # combine field_names tuple and returned database rows
+                fields_and_values = []
+                fields_and_values.append(field_names)
+                fields_and_values.extend(rows_returned)
+                if key_value is not None:
+                    cache.put(self.table_name, self.where_fields_list[0], key_value,
+                              tuple(self.fields_list), fields_and_values, generation)
+                elif query_key is not None:
+                    cache.put(self.table_name, query_key, fields_and_values, generation)
+                # return field_names and row(s) returned from database, caches hold the
+                # tuples read so every reader may ask for its own type of row
+                return self.make_rows(fields_and_values)
+            # no rows were returned, return empty list
+            else:
+                if query_key is not None:
+                    cache.put(self.table_name, query_key, rows_returned, generation)
+                return rows_returned
+
+        except sqlite3.OperationalError as read_error:
+            print(
+                f"An error has occured trying to retrieve data from {self.table_name}")
+            print(read_error)
+        except sqlite3.DatabaseError as database_error:
+            print(database_error)
+        finally:
+            # close connection to database with parent class
+            self.close_connection()
+
+    def execute_stream(self, arraysize=500):
+        """Generator executing same query as 'execute()' but fetching matching rows from the
+            cursor in chunks of 'arraysize' rows as they are consumed, so memory used does not
+            grow with number of rows returned. Connection is returned to the connection pool
+            when generator is exhausted or closed. A result found in the row or query cache is
+            yielded from the cache without a query.
+
+        Arguments:
+        ----------
+        arraysize: int (Default = 500)
+            number of rows fetched from database at a time with 'fetchmany()'
+
+        Yield:
+        ------
+        header Tuple (names of projected fields) followed by each matching row built by
+        'row_factory'. Nothing is yielded if there are no matching rows or connection could not
+        be made
+
+        Exceptions:
+        -----------
+        sqlite.OperationalError:
+            raised if SQL query is not correctly constructed and executed
+        sqlite.DatabaseError:
+            raised for errors not caught by: sqlite.OperationalError
+        """
+        if self.cached_rows is not None:
+            yield from self.make_rows(self.cached_rows)
+            return
+        if self.connection is None:
+            return
+
+        try:
+            query, parameters = self.build_query()
+            self.cursor.arraysize = arraysize
+            self.cursor.execute(query, parameters)
+
+            rows_returned = self.cursor.fetchmany()
+            # header is only yielded if at least one row matches (as 'execute()')
+            if rows_returned:
+                field_names = tuple([description[0] for description in self.cursor.description])
+                row_class = self.row_class(field_names)
+                yield field_names
+            while rows_returned:
+                if row_class is None:
+                    yield from rows_returned
+                else:
+                    yield from itertools.starmap(row_class, rows_returned)
+                rows_returned = self.cursor.fetchmany()
+
+        except sqlite3.OperationalError as read_error:
+            print(
+                f"An error has occured trying to retrieve data from {self.table_name}")
+            print(read_error)
+        except sqlite3.DatabaseError as database_error:
+            print(database_error)
+        finally:
+            # close connection to database with parent class
+            self.close_connection()
+
+    def build_query(self):
+        """Return query string reading desired fields from table with a 'field = ?' condition
+            for each field in 'where_fields_list' (or its operator in 'where_operators')
+            together with tuple of query parameters. Query string is built once for each table,
+            fields, where fields and operators, fields ordered by and use of a limit."""
+        query = self.cached_sql(("read", self.table_name, tuple(self.fields_list),
+                                 tuple(self.where_fields_list or ()),
+                                 tuple(self.where_operators or ()), tuple(self.order_by or ()),
+                                 self.limit is not None), self.build_sql)
+        parameters = self.where_conditions()[1]
+        if self.limit is not None:
+            parameters += (self.limit,)
+        return query, parameters
+
+    def build_sql(self):
+        """Return SQL text of query built by 'build_query()'."""
+        # start of query, add desired fields to be returned in row
+        query = f"SELECT {', '.join(self.fields_list)} FROM {self.table_name}"
+
+        # Conditions for row to match (may be none) joined with 'AND'
+        conditions = self.where_conditions()[0]
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if self.order_by:
+            query += " ORDER BY " + ", ".join(self.order_by)
+        if self.limit is not None:
+            query += " LIMIT ?"
+        return query
+
+    def read_cache(self):
+        """Return result of search held in row cache (search on the primary_key rows of table
+            are cached by) or query cache (other searches). None if not cached or search is
+            in a transaction (a transaction may read its own uncommitted changes). Needs no
+            database connection."""
+        if not self.use_cache or self.transaction is not None:
+            return None
+        if self.where_fields_list is not None and len(self.where_fields_list) == 1 and \
+                self.is_key_lookup():
+            rows = row_cache.RowCache.for_database(self.database_name)
+            if self.where_fields_list[0] == rows.key_field(self.table_name):
+                return rows.get(self.table_name, self.where_fields_list[0],
+                                tuple(self.search_vals)[0], tuple(self.fields_list))
+        query_key = self.cached_query_key()
+        if query_key is None:
+            return None
+        return query_cache.QueryCache.for_database(self.database_name).get(self.table_name,
+                                                                           query_key)
+
+    def cached_row_key(self):
+        """Return primary_key value searched for if query reads one row by primary_key alone
+            outside of a transaction, so the row read may be stored in the row cache.
+            Otherwise return None."""
+        if (not self.use_cache or self.transaction is not None or
+                self.where_fields_list is None or len(self.where_fields_list) != 1 or
+                not self.is_key_lookup() or
+                not row_cache.RowCache.for_database(self.database_name).enabled):
+            return None
+        registry = schema_registry.SchemaRegistry.for_database(self.database_name)
+        if self.where_fields_list[0] != registry.primary_key(self.connection, self.table_name):
+            return None
+        return tuple(self.search_vals)[0]
+
+    def cached_query_key(self):
+        """Return key of search ('query_cache.QueryCache.query_key()') if its result may be
+            served from and stored in the query cache (outside of a transaction). Otherwise
+            return None."""
+        if (not self.use_cache or self.transaction is not None or
+                not query_cache.QueryCache.for_database(self.database_name).enabled):
+            return None
+        try:
+            return query_cache.QueryCache.query_key(self.fields_list, self.where_fields_list,
+                                                    self.search_vals, self.where_operators,
+                                                    self.order_by, self.limit)
+        except TypeError:
+            return None
+
+    def make_rows(self, fields_and_values):
+        """Return result of 'execute()' ('fields_and_values': header tuple followed by row
+            tuples) with each row built by 'row_factory'. Result is returned unchanged for
+            "tuple" rows or if empty."""
+        if not fields_and_values:
+            return fields_and_values
+        row_class = self.row_class(fields_and_values[0])
+        if row_class is None:
+            return fields_and_values
+        rows = [fields_and_values[0]]
+        rows.extend(itertools.starmap(row_class,
+                                      itertools.islice(fields_and_values, 1, None)))
+        return rows
+
+    def row_class(self, field_names):
+        """Return class (or function) called with the values of a row to build it for
+            'row_factory', None for tuple rows.
+
+        Arguments:
+        ----------
+        field_names: tuple of str
+            names of projected fields (header of result)
+
+        Return:
+        -------
+        None for "tuple", a named tuple class with 'field_names' (generated once for each table
+        and projected fields) for "namedtuple", otherwise 'row_factory' itself
+        """
+        if self.row_factory == "tuple":
+            return None
+        if self.row_factory != "namedtuple":
+            return self.row_factory
+        shape = (self.table_name, tuple(field_names))
+        namedtuple_class = ReadData._namedtuple_classes.get(shape)
+        if namedtuple_class is None:
+            namedtuple_class = collections.namedtuple("Row", field_names)
+            ReadData._namedtuple_classes[shape] = namedtuple_class
+        return namedtuple_class
+
+    def is_key_lookup(self):
+        """Return True if where fields are only compared for equality and rows are not
+            limited, so a search on the primary_key alone reads exactly one row."""
+        return (self.limit is None and
+                (self.where_operators is None or set(self.where_operators) <= {"="}))
+
+    def where_conditions(self):
+        """Return list of 'field = ?' conditions (or comparison in 'where_operators') for each
+            field in 'where_fields_list' (empty if None) and tuple of matching parameters from
+            'search_vals', 'BETWEEN' conditions taking two parameters."""
+        return self.build_conditions(self.where_fields_list, self.where_operators,
+                                     self.search_vals)
+
+    @staticmethod
+    def build_conditions(where_fields_list, where_operators, search_vals):
+        """Return list of conditions comparing each field in 'where_fields_list' with its
+            operator in 'where_operators' ('=' for every field if None) and tuple of matching
+            parameters from 'search_vals'. Shared with 'BulkDeleteData' so rows are deleted by
+            the same conditions they are searched by.
+
+        Return:
+        -------
+        tuple of (list of condition strings with '?' parameters, tuple of parameters), empty
+        list and tuple if 'where_fields_list' is None
+        """
+        if where_fields_list is None:
+            return [], ()
+        if where_operators is None:
+            return ([f"{where_field} = ?" for where_field in where_fields_list],
+                    tuple(search_vals))
+
+        conditions = []
+        parameters = []
+        for where_field, operator, search_value in zip(where_fields_list, where_operators,
+                                                       search_vals):
+            if operator == "BETWEEN":
+                conditions.append(f"{where_field} BETWEEN ? AND ?")
+                parameters.extend(search_value)
+            else:
+                conditions.append(f"{where_field} {operator} ?")
+                parameters.append(search_value)
+        return conditions, tuple(parameters)
+
+
+# -------------------------------------------------------------------------------------------------
+class ReadPage(ReadData):
+    """Read one page of rows ordered by a sort field using keyset (seek) pagination. Rather than
+        skipping rows with OFFSET, the page is located with a '(sort_field, primary_key) > (?, ?)'
+        comparison against the last row of the previous page, so an indexed sort field allows
+        any page to be read in the same time regardless of its depth.
+
+    Attributes:
+    -----------------
+    primary_key: str
+        name of primary_key field (unique tie-breaker for rows with equal sort values)
+    sort_field: str
+        field rows are ordered by (primary_key or an indexed field recommended)
+    page_size: int
+        maximum number of rows in page
+    after_key: tuple (or None)
+        key of row that page starts after (next page)
+    before_key: tuple (or None)
+        key of row that page ends before (previous page)
+    first_key: tuple
+        key of first row in page read (None before execution or for empty page)
+    last_key: tuple
+        key of last row in page read (None before execution or for empty page)
+    has_more: bool
+        True if further rows exist beyond page read in direction of paging
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, fields_list, primary_key, sort_field, page_size,
+             after_key, before_key, where_field_list, search_vals):
+        Initialize ReadPage and parent ReadData objects
+
+    execute(self): 'override'
+        Read and return page of rows and close database connection
+
+    build_query(self): 'override'
+        return query string and parameters for page of rows
+
+    build_sql(self): 'override'
+        return SQL text of page query for page direction
+    """
+    # pages carry key fields appended to each row and are never served from a cache
+    use_cache = False
+
+    def __init__(self, database_name, table_name, fields_list, primary_key, sort_field=None,
+                 page_size=20, after_key=None, before_key=None, where_field_list=None,
                  search_vals=None):
-        """Constructor initialising ReadData and parent DataBaseQueryClass objects.
+        """Constructor initialising ReadPage and parent ReadData objects.
 
         Arguments:
         ---------------
@@ -614,97 +2160,339 @@ class ReadData(DataBaseQueryClass):
         table_name: str
             name of table to connect to in database
         fields_list: list of field names as strings
-            desired fields to return values from
-        where_fields_list: list of fields as strings        
+            desired fields to return values from (provide '*' for all)
+        primary_key: str
+            name of primary_key field
+        sort_field: str (Optional - primary_key used if None)
+            field rows are ordered by
+        page_size: int (Default = 20)
+            maximum number of rows in page
+        after_key: tuple (Optional - set to None as Default)
+            'last_key' of previous page to read following page
+        before_key: tuple (Optional - set to None as Default)
+            'first_key' of current page to read preceding page (ignored if 'after_key' is given)
+        where_fields_list: list of fields as strings (Optional - set to None as Default)
             field names used in WHERE part of query to perform checks on
-        search_vals: tuple with entities matching type corresponding to entity in where_fields_list
-            values to be checked for match 
+        search_vals: tuple (Optional - set to None as Default)
+            values to be checked for match with 'where_fields_list'
         """
-        super().__init__(database_name, table_name)
+        self.primary_key = primary_key
+        self.sort_field = primary_key if sort_field is None else sort_field
+        self.page_size = page_size
+        self.after_key = after_key
+        self.before_key = before_key
+        self.first_key = None
+        self.last_key = None
+        self.has_more = False
+        # fields making up a row's key, primary_key breaks ties between equal sort values
+        if self.sort_field == primary_key:
+            self.key_fields = [primary_key]
+        else:
+            self.key_fields = [self.sort_field, primary_key]
+        super().__init__(database_name, table_name, fields_list, where_field_list, search_vals)
+
+    def execute(self):
+        """Read page of rows (in ascending sort order) and set 'first_key', 'last_key' and
+            'has_more' attributes. Close Database Connection.
+
+        Return:
+        -----------
+        Rows Found - List with header Tuple (names of projected fields) followed by row Tuple(s)
+        No Rows - Empty List
+        None - connection could not be made or query could not be executed
+        """
+        rows = super().execute()
+        if not rows:
+            return rows
+
+        # separate key fields appended to each row by 'build_query()' from requested fields
+        key_count = len(self.key_fields)
+        header = rows[0][:-key_count]
+        rows = rows[1:]
+
+        # one row more than page_size is read to determine if more rows follow
+        self.has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        # previous page is read in descending order, restore ascending order for display
+        if self.after_key is None and self.before_key is not None:
+            rows.reverse()
+
+        self.first_key = tuple(rows[0][-key_count:])
+        self.last_key = tuple(rows[-1][-key_count:])
+        return [header] + [row[:-key_count] for row in rows]
+
+    def build_query(self):
+        """Return query string and parameters reading up to 'page_size' + 1 rows after
+            'after_key' (or before 'before_key') with key fields appended to each row. Query
+            string is built once for each table, fields, where fields and page direction."""
+        parameters = self.where_conditions()[1]
+        if self.after_key is not None:
+            direction = "after"
+            parameters += tuple(self.after_key)
+        elif self.before_key is not None:
+            direction = "before"
+            parameters += tuple(self.before_key)
+        else:
+            direction = "first"
+        query = self.cached_sql(("page", self.table_name, tuple(self.fields_list),
+                                 tuple(self.key_fields), tuple(self.where_fields_list or ()),
+                                 direction), self.build_sql)
+        return query, parameters + (self.page_size + 1,)
+
+    def build_sql(self):
+        """Return SQL text of page query built by 'build_query()'."""
+        key_columns = ", ".join(self.key_fields)
+        query = (f"SELECT {', '.join(self.fields_list)}, {key_columns} " +
+                 f"FROM {self.table_name}")
+
+        conditions = self.where_conditions()[0]
+        # row value comparison against key of page boundary row
+        key_placeholders = ", ".join(["?"] * len(self.key_fields))
+        if self.after_key is not None:
+            conditions.append(f"({key_columns}) > ({key_placeholders})")
+            order = "ASC"
+        elif self.before_key is not None:
+            conditions.append(f"({key_columns}) < ({key_placeholders})")
+            order = "DESC"
+        else:
+            order = "ASC"
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return (query + " ORDER BY " +
+                ", ".join([f"{field} {order}" for field in self.key_fields]) + " LIMIT ?")
+
+
+# -------------------------------------------------------------------------------------------------
+class KeysetPager:
+    """Helper holding position of a user moving forwards and backwards through pages of a table
+        (optionally filtered) using 'ReadPage'. Each page is read with a new 'ReadPage' so no
+        database connection is held between pages.
+
+    Attributes:
+    -----------
+    database_name, table_name, fields_list, primary_key, sort_field, page_size,
+    where_fields_list, search_vals:
+        as 'ReadPage' constructor arguments
+    page_number: int
+        number of page last read (1 for first page, 0 before first read)
+    has_next: bool
+        True if a page follows page last read
+    has_previous: bool
+        True if a page precedes page last read
+
+    Methods:
+    --------
+    __init__(self, database_name, table_name, fields_list, primary_key, sort_field, page_size,
+             where_field_list, search_vals):
+        Initialise pager positioned before first page
+
+    first_page(self):
+        read and return first page
+
+    next_page(self):
+        read and return page after page last read (None if there is no next page)
+
+    previous_page(self):
+        read and return page before page last read (None if there is no previous page)
+    """
+
+    def __init__(self, database_name, table_name, fields_list, primary_key, sort_field=None,
+                 page_size=20, where_field_list=None, search_vals=None):
+        """Initialise pager positioned before first page. Arguments as 'ReadPage'."""
+        self.database_name = database_name
+        self.table_name = table_name
         self.fields_list = fields_list
+        self.primary_key = primary_key
+        self.sort_field = sort_field
+        self.page_size = page_size
         self.where_fields_list = where_field_list
         self.search_vals = search_vals
+        self.page_number = 0
+        self.has_next = False
+        self.has_previous = False
+        self._first_key = None
+        self._last_key = None
+
+    def first_page(self):
+        """Read and return first page (list with header and rows, empty list if no rows)."""
+        page, has_more = self._read_page()
+        if page:
+            self.page_number = 1
+            self.has_next = has_more
+            self.has_previous = False
+        return page
+
+    def next_page(self):
+        """Read and return page following page last read, None if there is no next page."""
+        if not self.has_next:
+            return None
+        page, has_more = self._read_page(after_key=self._last_key)
+        if page:
+            self.page_number += 1
+            self.has_next = has_more
+            self.has_previous = True
+        return page
+
+    def previous_page(self):
+        """Read and return page preceding page last read, None if there is no previous page."""
+        if not self.has_previous:
+            return None
+        page, has_more = self._read_page(before_key=self._first_key)
+        if page:
+            self.page_number -= 1
+            # page was read backwards, 'has_more' shows if earlier pages remain
+            self.has_previous = has_more
+            self.has_next = True
+        return page
+
+    def _read_page(self, after_key=None, before_key=None):
+        """Internal, read page with 'ReadPage' and store keys of its first and last rows.
+            Return page and 'has_more' flag of 'ReadPage'."""
+        read_page = ReadPage(self.database_name, self.table_name, self.fields_list,
+                             self.primary_key, self.sort_field, self.page_size, after_key,
+                             before_key, self.where_fields_list, self.search_vals)
+        page = read_page.execute()
+        if page:
+            self._first_key = read_page.first_key
+            self._last_key = read_page.last_key
+        return page, read_page.has_more
+
+
+# -------------------------------------------------------------------------------------------------
+class FullTextSearch(DataBaseQueryClass):
+    """Search full-text index '<table>_fts' created by 'CreateFullTextIndex' and return best
+        matching rows of table ranked by bm25 (most relevant first).
+
+    Attributes:
+    -----------------
+    fields_list: list of field names as strings
+        desired fields to return values (provide '*' for all)
+    primary_key: str
+        name of integer primary_key field of table
+    search_text: str
+        text entered by user to search for
+    search_mode: str
+        "token" - rows containing all words, "prefix" - rows containing words starting with
+        each word entered, "phrase" - rows containing words entered as an exact phrase
+    result_limit: int
+        maximum number of rows to return
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, fields_list, primary_key, search_text,
+             search_mode, result_limit):
+        Initialize FullTextSearch and parent DataBaseQueryClass objects
+
+    match_expression(search_text, search_mode): 'staticmethod'
+        return FTS5 MATCH expression for user search text and search mode
+
+    execute(self):
+        Search for and return ranked matching rows and close database connection
+    """
+
+    def __init__(self, database_name, table_name, fields_list, primary_key, search_text,
+                 search_mode="token", result_limit=20):
+        """Constructor initialising FullTextSearch and parent DataBaseQueryClass objects.
+
+        Arguments:
+        ---------------
+        database_name: str
+            name of the database to connect to, also serves as path to database
+            file if not present in current directory
+        table_name: str
+            name of table (with full-text index) in database
+        fields_list: list of field names as strings
+            desired fields to return values from (provide '*' for all)
+        primary_key: str
+            name of integer primary_key field of table
+        search_text: str
+            text entered by user to search for
+        search_mode: str (Default = "token")
+            one of "token", "prefix" or "phrase"
+        result_limit: int (Default = 20)
+            maximum number of rows to return
+        """
+        super().__init__(database_name, table_name)
+        self.fields_list = fields_list
+        self.primary_key = primary_key
+        self.search_text = search_text
+        self.search_mode = search_mode
+        self.result_limit = result_limit
         # attempt to make connection to database (through super class)
         # successful connection will initialise 'cursor' and 'connection' objects
         self.create_database_connection()
 
+    @staticmethod
+    def match_expression(search_text, search_mode):
+        """Return FTS5 MATCH expression for 'search_text'. Each word is quoted so characters
+            with a meaning in FTS5 query syntax entered by a user are searched for as text.
+
+        Return:
+        -------
+        str - MATCH expression, None for unknown 'search_mode' or text without words
+        """
+        words = ['"' + word.replace('"', '""') + '"' for word in search_text.split()]
+        if not words:
+            return None
+        if search_mode == "token":
+            return " ".join(words)
+        if search_mode == "prefix":
+            return " ".join([word + "*" for word in words])
+        if search_mode == "phrase":
+            return '"' + " ".join(search_text.split()).replace('"', '""') + '"'
+        return None
+
     def execute(self):
-        """Create SQL query to read row from table based on desired fields and values.
+        """Create and execute full-text query returning rows ranked by relevance.
             Close Database Connection.
 
         Return:
         -----------
-        Match Found - List with row as Tuple
+        Match Found - List with header Tuple (names of projected fields) followed by row Tuple(s)
         No Match - Empty List
-        None - Field list does not have matching value count or connection could not be made
+        None - invalid search mode or connection could not be made
 
         Exceptions:
         -----------
         sqlite.OperationalError:
-            raised if SQL query is not correctly constructed and executed
+            raised if SQL query is not correctly constructed and executed or full-text index
+            does not exist
         sqlite.DatabaseError:
-            raised for errors in closing connection or errors not caught by: sqlite.OperationalError
+            raised for errors not caught by: sqlite.OperationalError
         """
-        # check if connection (in parent class) to database in __init__() was successful,
         if self.connection is None:
             return None
 
         try:
-            # start of query, add desired fields to be returned in row
-            query = f"SELECT {', '.join(self.fields_list)} FROM {self.table_name}"
-
-            # Conditions for row to match (may be none)
-            # Add name of field and specified value to query
-            if self.where_fields_list is not None:
-                query += " WHERE "
-                for count, where_field in enumerate(self.where_fields_list):
-                    # add each required field name for checking
-                    query += f"{where_field} = ? "
-                    # append 'AND' for multiple queries if supplied
-                    if count != len(self.where_fields_list) - 1:
-                        query += " AND "
-
-            # execute query and store returned row(s)
-            # Case 1: Return all rows (no 'where' condition)
-            if self.where_fields_list is None:
-                rows_returned = self.cursor.execute(query).fetchall()
-            # Case 2: Single 'where' condition - manually add comma for tuple
-            elif len(self.where_fields_list) == 1:
-                rows_returned = self.cursor.execute(
-                    query, (self.search_vals), ).fetchall()
-            # Case 3: Multiple 'where' conditions, use search_vals tuple as is
-            else:
-                rows_returned = self.cursor.execute(
-                    query, self.search_vals).fetchall()
+            match = self.match_expression(self.search_text, self.search_mode)
+            if match is None:
+                print(f"Error Log - Invalid full-text search of '{self.search_text}' " +
+                      f"with mode '{self.search_mode}'")
+                return None
+
+            fts_table = f"{self.table_name}_fts"
+            # qualify returned fields with table name (full-text table has same field names)
+            fields = ", ".join([f"{self.table_name}.{field}" for field in self.fields_list])
+            query = (f"SELECT {fields} FROM {fts_table} JOIN {self.table_name} ON " +
+                     f"{self.table_name}.{self.primary_key} = {fts_table}.rowid " +
+                     f"WHERE {fts_table} MATCH ? ORDER BY bm25({fts_table}) LIMIT ?")
+            rows_returned = self.cursor.execute(query, (match, self.result_limit)).fetchall()
 
-            # if at least one row was returned, retrieve field names
-            # Referenced from AlixaProDev on 19 July 2023
-            # Available from:
-            # https://www.alixaprodev.com/how-to-get-column-names-from-sqlite-database-table-in-python/
             if len(rows_returned) > 0:
-                self.cursor.execute(f"SELECT * FROM {self.table_name}")
                 field_names = tuple([description[0]
-                                    for description in self.cursor.description])
-
-                # combine field_names tuple and returned database rows
-                fields_and_values = []
-                fields_and_values.append(field_names)
-                fields_and_values.extend(rows_returned)
-                # return field_names and row(s) returned from database
-                return fields_and_values
-            # no rows were returned, return empty list
-            else:
-                return rows_returned
+                                     for description in self.cursor.description])
+                return [field_names] + rows_returned
+            return rows_returned
 
         except sqlite3.OperationalError as read_error:
-            print(
-                f"An error has occured trying to retrieve data from {self.table_name}")
+            print(f"An error has occured trying to search text in {self.table_name}")
             print(read_error)
         except sqlite3.DatabaseError as database_error:
             print(database_error)
         finally:
             # close connection to database with parent class
-            self.database_controller.close_connection()
+            self.close_connection()
 
 
 # -------------------------------------------------------------------------------------------------
@@ -720,7 +2508,7 @@ class UpdateData(DataBaseQueryClass):
 
     Methods:
     ----------------
-    __init__(self, database_name, table_name, field_names, update_tuple):
+    __init__(self, database_name, table_name, field_names, update_tuple, transaction):
         Initialize UpdateData and parent DataBaseQueryClass objects allowing
         for sqlite3 connection. Parent contructor attempts to create connection to database.
 
@@ -728,7 +2516,7 @@ class UpdateData(DataBaseQueryClass):
         Attempt to update value in a row and close database connection
     """
 
-    def __init__(self, database_name, table_name, field_names, update_tuple):
+    def __init__(self, database_name, table_name, field_names, update_tuple, transaction=None):
         """Constructor initialising UpdateData and parent DataBaseQueryClass objects.
 
         Arguments:
@@ -742,8 +2530,10 @@ class UpdateData(DataBaseQueryClass):
             string1 - field to change, string2 - primary_key field
         update_tuple: tuple
             contains new_value to assign, old value for row determination
+        transaction: Transaction (Default = None)
+            open transaction to execute in, committed or rolled back with the transaction
         """
-        super().__init__(database_name, table_name)
+        super().__init__(database_name, table_name, transaction)
         self.field_names = field_names
         self.update_tuple = update_tuple
         # attempt to make connection to database (through super class)
@@ -770,26 +2560,365 @@ class UpdateData(DataBaseQueryClass):
             return None
 
         try:
-            # create and execute query using field names and desired values
-            query = (f"UPDATE {self.table_name} SET {self.field_names[0]} = ? " +
-                     f"WHERE {self.field_names[1]}  = ?")
+            # create and execute query using field names and desired values, query is built
+            # once for each table, field updated and field matched
+            query = self.cached_sql(("update", self.table_name, self.field_names[0],
+                                     self.field_names[1]),
+                                    lambda: (f"UPDATE {self.table_name} SET " +
+                                             f"{self.field_names[0]} = ? " +
+                                             f"WHERE {self.field_names[1]} = ?"))
             self.cursor.execute(query, self.update_tuple)
-            self.connection.commit()
+            self.commit()
 
             # retrieve number of affected rows after update query has been executed
             affected_rows = self.cursor.rowcount
+            self.invalidate_cached_rows(self.field_names[1], [self.update_tuple[1]])
             # if at least one row was updated, return True to confirm deletion
             return True if affected_rows > 0 else False
 
         except sqlite3.OperationalError as update_error:
+            self.rollback()
             print(
                 f"An error has occured trying to update data in {self.table_name}")
             print(update_error)
         except sqlite3.DatabaseError as database_error:
+            self.rollback()
             print(database_error)
         finally:
             # close connection to database with parent class
-            self.database_controller.close_connection()
+            self.close_connection()
+
+
+# -------------------------------------------------------------------------------------------------
+class BatchUpdateData(DataBaseQueryClass):
+    """Apply many changes of the form (primary_key value, {field_name: new value}) in one
+        transaction. Changes are read a chunk at a time, grouped by the set of fields they
+        change and each group executed as one 'executemany' of the same UPDATE query. Rows that
+        do not exist or that the database rejects are reported by primary_key value.
+
+    Attributes:
+    -----------------
+    primary_key: str
+        name of primary_key field rows are updated by
+    changes: iterable of tuples
+        (primary_key value, dictionary of field name to new value) for each row to change
+    chunk_size: int
+        number of changes read and grouped at a time
+    updated_count: int
+        number of rows changed (changes to the same row within a chunk are merged and counted
+        once)
+    row_errors: list of tuples
+        (primary_key value, reason) for each change not applied
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, primary_key, changes, chunk_size, transaction):
+        Initialize BatchUpdateData and parent DataBaseQueryClass objects
+
+    execute(self): 'override'
+        Apply all changes in one transaction and close database connection
+
+    group_changes(chunk): 'staticmethod'
+        return changes in chunk merged per primary_key value and grouped by the (ordered) field
+        names they change
+
+    update_chunk(self, chunk):
+        execute each group of changes in chunk, recording changes that were not applied
+    """
+
+    def __init__(self, database_name, table_name, primary_key, changes, chunk_size=10000,
+                 transaction=None):
+        """Constructor initialising BatchUpdateData and parent DataBaseQueryClass objects.
+
+        Arguments:
+        ---------------
+        database_name: str
+            name of the database to connect to, also serves as path to database
+            file if not present in current directory
+        table_name: str
+            name of table in above database
+        primary_key: str
+            name of primary_key field rows are updated by
+        changes: iterable of (primary_key value, dict) pairs
+            new values for each row, keyed by field name. Iterator is consumed one chunk at a
+            time so changes may be read from a file as they are applied
+        chunk_size: int (Default = 10000)
+            number of changes grouped and executed together
+        transaction: Transaction (Default = None)
+            open transaction to execute in. Without one a transaction is begun and committed
+            by 'execute()'
+        """
+        super().__init__(database_name, table_name, transaction)
+        self.primary_key = primary_key
+        self.changes = changes
+        self.chunk_size = chunk_size
+        self.updated_count = 0
+        self.row_errors = []
+        # attempt to make connection to database (through super class)
+        # successful connection will initialise 'cursor' and 'connection' objects
+        self.create_database_connection()
+
+    def execute(self):
+        """Apply changes chunk by chunk within a single transaction, committed once when all
+            changes have been applied. Close Database Connection.
+
+        Return:
+        ---------
+        Returns None if connection to database could not be made or the batch failed (all
+        changes are then rolled back)
+        Return True for at least one row updated, False for no rows updated
+        NOTE: changes not applied are stored with their reason in attribute 'row_errors'
+
+        Exceptions:
+        -----------
+        sqlite.OperationalError:
+            raised if SQL query is not correctly constructed (e.g. unknown field name) or
+            database is locked by another writer
+        sqlite.DatabaseError:
+            raised for errors not caught by: sqlite.OperationalError
+        """
+        if self.connection is None:
+            return None
+
+        try:
+            if self.transaction is None:
+                self.cursor.execute("BEGIN IMMEDIATE")
+            chunk = []
+            for change in self.changes:
+                chunk.append(change)
+                if len(chunk) == self.chunk_size:
+                    self.update_chunk(chunk)
+                    chunk = []
+            if chunk:
+                self.update_chunk(chunk)
+            self.commit()
+            self.invalidate_cached_rows()
+            return self.updated_count > 0
+
+        except sqlite3.OperationalError as operational_error:
+            self.rollback()
+            print(f"An error has occured trying to update data in {self.table_name}")
+            print(operational_error)
+        except sqlite3.DatabaseError as database_error:
+            self.rollback()
+            print(database_error)
+        finally:
+            # close connection to database with parent class
+            self.close_connection()
+
+    @staticmethod
+    def group_changes(chunk):
+        """Return dictionary of tuple of field names (sorted) to list of (primary_key value,
+            tuple of new values in order of field names) for changes in 'chunk'. Changes to the
+            same primary_key value are merged first (a later value of a field replaces an
+            earlier one), so each key is updated once and appears in only one group. Each group
+            is ordered by primary_key value so rows (and their index entries) are visited in
+            table order rather than jumping between pages."""
+        merged = {}
+        for key_value, new_values in chunk:
+            merged.setdefault(key_value, {}).update(new_values)
+        groups = {}
+        for key_value, new_values in merged.items():
+            field_names = tuple(sorted(new_values))
+            groups.setdefault(field_names, []).append(
+                (key_value, tuple(new_values[field] for field in field_names)))
+        for group in groups.values():
+            group.sort(key=lambda change: change[0])
+        return groups
+
+    def update_chunk(self, chunk):
+        """Execute each group of changes in 'chunk' with one 'executemany' inside a savepoint.
+            If the database rejects a group it is rolled back to the savepoint and applied one
+            row at a time so only rejected rows are left out. Primary_key values of changes
+            that did not match a row are found with one query per group."""
+        for field_names, group in self.group_changes(chunk).items():
+            if not field_names:
+                self.row_errors.extend((key_value, "no fields to update")
+                                       for key_value, _ in group)
+                continue
+            query = self.cached_sql(("batch_update", self.table_name, field_names,
+                                     self.primary_key),
+                                    lambda: (f"UPDATE {self.table_name} SET " +
+                                             ", ".join([f"{field} = ?" for field in field_names]) +
+                                             f" WHERE {self.primary_key} = ?"))
+            parameters = [values + (key_value,) for key_value, values in group]
+
+            self.cursor.execute("SAVEPOINT batch_update")
+            try:
+                self.cursor.executemany(query, parameters)
+                updated = self.cursor.rowcount
+            except sqlite3.IntegrityError:
+                self.cursor.execute("ROLLBACK TO batch_update")
+                updated = 0
+                for key_value, values in group:
+                    try:
+                        self.cursor.execute(query, values + (key_value,))
+                    except sqlite3.IntegrityError as integrity_error:
+                        self.row_errors.append((key_value, str(integrity_error)))
+                        continue
+                    if self.cursor.rowcount > 0:
+                        updated += 1
+                    else:
+                        self.row_errors.append((key_value, "no row found"))
+                self.cursor.execute("RELEASE batch_update")
+                self.updated_count += updated
+                continue
+            self.cursor.execute("RELEASE batch_update")
+            self.updated_count += updated
+
+            # fewer rows updated than keys given (each key once in a group), find changes
+            # without a matching row
+            if updated < len(group):
+                keys = [key_value for key_value, _ in group]
+                existing = {row[0] for row in self.cursor.execute(
+                    f"SELECT {self.primary_key} FROM {self.table_name} WHERE " +
+                    f"{self.primary_key} IN ({', '.join(['?'] * len(keys))})", keys)}
+                self.row_errors.extend((key_value, "no row found") for key_value, _ in group
+                                       if key_value not in existing)
+
+
+# -------------------------------------------------------------------------------------------------
+class AdjustQuantity(DataBaseQueryClass):
+    """Add to (or subtract from) a numeric field of one row in a single statement
+        ('field = field + ?'), so concurrent adjustments cannot overwrite each other as a read
+        followed by an update of the new value could. Adjustment is only made if the new value
+        stays within an allowed range and the new value is returned by the same statement.
+
+    Attributes:
+    -----------------
+    field_name: str
+        name of numeric field to adjust
+    primary_key: str
+        name of primary_key field
+    key_value: type specific to table
+        primary_key value of row to adjust
+    change: int or float
+        amount added to field (negative to subtract)
+    minimum: int or float (or None)
+        smallest value allowed for field after adjustment
+    maximum: int or float (or None)
+        largest value allowed for field after adjustment
+    current_value: int or float
+        value of field when an adjustment was refused (None if row does not exist)
+
+    Methods:
+    ----------------
+    __init__(self, database_name, table_name, field_name, primary_key, key_value, change,
+             minimum, maximum, transaction):
+        Initialize AdjustQuantity and parent DataBaseQueryClass objects
+
+    execute(self): 'override'
+        Adjust field value, returning new value, and close database connection
+
+    build_query(self):
+        Return guarded UPDATE ... RETURNING query for fields and range bounds set
+    """
+
+    def __init__(self, database_name, table_name, field_name, primary_key, key_value, change,
+                 minimum=0, maximum=None, transaction=None):
+        """Constructor initialising AdjustQuantity and parent DataBaseQueryClass objects.
+
+        Arguments:
+        ---------------
+        database_name: str
+            name of the database to connect to, also serves as path to database
+            file if not present in current directory
+        table_name: str
+            name of table in above database
+        field_name: str
+            name of numeric field to adjust
+        primary_key: str
+            name of primary_key field
+        key_value: type specific to table
+            primary_key value of row to adjust
+        change: int or float
+            amount added to field (negative to subtract)
+        minimum: int or float (Default = 0)
+            smallest value allowed after adjustment (None for no minimum)
+        maximum: int or float (Default = None)
+            largest value allowed after adjustment (None for no maximum)
+        transaction: Transaction (Default = None)
+            open transaction to execute in, committed or rolled back with the transaction
+        """
+        super().__init__(database_name, table_name, transaction)
+        self.field_name = field_name
+        self.primary_key = primary_key
+        self.key_value = key_value
+        self.change = change
+        self.minimum = minimum
+        self.maximum = maximum
+        self.current_value = None
+        # attempt to make connection to database (through super class)
+        # successful connection will initialise 'cursor' and 'connection' objects
+        self.create_database_connection()
+
+    def execute(self):
+        """Create and execute 'UPDATE ... SET field = field + ? ... RETURNING field' for row with
+            primary_key value, guarded so the new value stays within 'minimum' and 'maximum'.
+            Close Database Connection.
+
+        Return:
+        -----------
+        None if there was an error when attempting to connect to database or execute query
+        New value of field if row was adjusted
+        False if row does not exist or new value would be outside allowed range (value of
+        field is then stored in attribute 'current_value', None if row does not exist)
+
+        Exceptions:
+        -----------
+        sqlite.OperationalError:
+            raised if SQL query is not correctly constructed and executed
+        sqlite.DatabaseError:
+            raised for errors not caught by: sqlite.OperationalError
+        """
+        if self.connection is None:
+            return None
+
+        try:
+            query = self.cached_sql(("adjust", self.table_name, self.field_name, self.primary_key,
+                                     self.minimum is not None, self.maximum is not None),
+                                    self.build_query)
+            parameters = [self.change, self.key_value]
+            if self.minimum is not None:
+                parameters += [self.change, self.minimum]
+            if self.maximum is not None:
+                parameters += [self.change, self.maximum]
+
+            row = self.cursor.execute(query, parameters).fetchone()
+            self.commit()
+            if row is not None:
+                self.invalidate_cached_rows(self.primary_key, [self.key_value])
+                return row[0]
+
+            # no row adjusted, read value for reason to report (row missing or out of range)
+            current = self.cursor.execute(
+                f"SELECT {self.field_name} FROM {self.table_name} WHERE {self.primary_key} = ?",
+                (self.key_value,)).fetchone()
+            self.current_value = current[0] if current is not None else None
+            return False
+
+        except sqlite3.OperationalError as operational_error:
+            self.rollback()
+            print(f"An error has occured trying to adjust {self.field_name} in {self.table_name}")
+            print(operational_error)
+        except sqlite3.DatabaseError as database_error:
+            self.rollback()
+            print(database_error)
+        finally:
+            # close connection to database with parent class
+            self.close_connection()
+
+    def build_query(self):
+        """Return 'UPDATE ... SET field = field + ? ... RETURNING field' query with a range
+            guard in WHERE clause for each of 'minimum' and 'maximum' that is set."""
+        query = (f"UPDATE {self.table_name} SET {self.field_name} = {self.field_name} + ? " +
+                 f"WHERE {self.primary_key} = ?")
+        # range guard is part of WHERE clause so check and change happen in one statement
+        if self.minimum is not None:
+            query += f" AND {self.field_name} + ? >= ?"
+        if self.maximum is not None:
+            query += f" AND {self.field_name} + ? <= ?"
+        return query + f" RETURNING {self.field_name}"
 
 
 # -------------------------------------------------------------------------------------------------
@@ -805,7 +2934,7 @@ class DeleteData(DataBaseQueryClass):
 
     Methods:
     ----------------
-    __init__(self, database_name, table_name, primary_key, key_value):
+    __init__(self, database_name, table_name, primary_key, key_value, transaction):
         Initialize DeleteData and parent DataBaseQueryClass objects allowing
         for sqlite3 connection. Parent contructor attempts to create connection to database.
 
@@ -814,7 +2943,7 @@ class DeleteData(DataBaseQueryClass):
         to confirm deletion of a row(s)
     """
 
-    def __init__(self, database_name, table_name, primary_key, key_value):
+    def __init__(self, database_name, table_name, primary_key, key_value, transaction=None):
         """Constructor initialising DeleteData and DataBaseQueryClass parent objects.
 
         Arguments:
@@ -828,8 +2957,10 @@ class DeleteData(DataBaseQueryClass):
             name of primary_key field
         key_value: type specific to table (cannot be composite) 
             unique value determining row to delete
+        transaction: Transaction (Default = None)
+            open transaction to execute in, committed or rolled back with the transaction
         """
-        super().__init__(database_name, table_name)
+        super().__init__(database_name, table_name, transaction)
         self.primary_key = primary_key
         self.key_value = key_value
         # attempt to make connection to database (through super class)
@@ -857,52 +2988,81 @@ class DeleteData(DataBaseQueryClass):
             return None
         try:
             # create and execute query using primary_key field and value to delete desired row
-            query = f"DELETE FROM {self.table_name} WHERE {self.primary_key} = ?"
+            query = self.cached_sql(("delete", self.table_name, self.primary_key),
+                                    lambda: (f"DELETE FROM {self.table_name} " +
+                                             f"WHERE {self.primary_key} = ?"))
             # convert received value for primary_key into tuple for query execution
             self.cursor.execute(query, (self.key_value,))
-            self.connection.commit()
+            self.commit()
 
             # retrieve number of affected rows after deletion query has been executed
             affected_rows = self.cursor.rowcount
+            self.invalidate_cached_rows(self.primary_key, [self.key_value])
             # if at least one row was deleted, return True to confirm deletion
             return True if affected_rows > 0 else False
 
         except sqlite3.OperationalError as operational_error:
+            self.rollback()
             print(
                 f"An error has occured trying to delete data from {self.table_name}")
             print(operational_error)
         except sqlite3.DatabaseError as database_error:
+            self.rollback()
             print(database_error)
         finally:
             # close connection to database with parent class
-            self.database_controller.close_connection()
+            self.close_connection()
 
 
 # -------------------------------------------------------------------------------------------------
-class ReturnLastId(DataBaseQueryClass):
-    """Retrieve primary_key value in last row of table in database.
-    
-    Atrributes:
-    -----------
-    database_name: str
-        name of database to connect to
-    table_name: str
-        name of table in above database
+class BulkDeleteData(DataBaseQueryClass):
+    """Delete many rows, either by a list of primary_key values or by all rows matching
+        conditions on fields ('field = value' or a comparison in 'where_operators'), in chunks
+        of at most 'chunk_size' rows. Each chunk is
+        committed on its own so a long purge only holds the database write lock for one chunk
+        at a time and other connections may write between chunks.
+
+    Attributes:
+    -----------------
     primary_key: str
         name of primary_key field
+    key_values: iterable
+        primary_key values of rows to delete (None to delete by conditions)
+    where_fields_list: list of strings
+        field names rows to delete must match (used when 'key_values' is None)
+    search_vals: tuple
+        values for fields in 'where_fields_list'
+    where_operators: list of str (or None)
+        comparison of each field in 'where_fields_list' with its value, one of
+        'ReadData.WHERE_OPERATORS'. None compares every field with '='
+    chunk_size: int
+        largest number of rows deleted in one transaction
+    deleted_count: int
+        number of rows deleted so far
 
     Methods:
-    --------
-    __init__(self, database_name, table_name, primary_key):
-        Constructor initialising ReturnLastId and DataBaseQueryClass parent objects.
+    ----------------
+    __init__(self, database_name, table_name, primary_key, key_values, where_field_list,
+             search_vals, chunk_size, where_operators):
+        Initialize BulkDeleteData and parent DataBaseQueryClass objects
 
-    execute(self):
-        Connect to database, create SQL query to retrieve last row primary_key value.
-         Close Database Connection
+    execute(self): 'override'
+        Delete all rows and close database connection, returning number of rows deleted
+
+    execute_chunks(self):
+        generator deleting one chunk at a time, yielding number of rows deleted so far
+
+    delete_by_keys(self), delete_by_conditions(self):
+        generators performing each kind of chunked deletion
+
+    delete_chunk(self, chunk):
+        delete and commit rows for one chunk of primary_key values
     """
 
-    def __init__(self, database_name, table_name, primary_key):
-        """Constructor initialising ReturnLastId and DataBaseQueryClass parent objects.
+    def __init__(self, database_name, table_name, primary_key, key_values=None,
+                 where_field_list=None, search_vals=None, chunk_size=1000,
+                 where_operators=None):
+        """Constructor initialising BulkDeleteData and parent DataBaseQueryClass objects.
 
         Arguments:
         ---------------
@@ -910,56 +3070,137 @@ class ReturnLastId(DataBaseQueryClass):
             name of the database to connect to, also serves as path to database
             file if not present in current directory
         table_name: str
-            name of table to connect to in database
+            name of table in above database
         primary_key: str
             name of primary_key field
+        key_values: iterable (Default = None)
+            primary_key values of rows to delete, consumed one chunk at a time
+        where_field_list: list of strings (Default = None)
+            field names rows to delete must match, used only if 'key_values' is None
+            NOTE: at least one field must be given, conditions are never left empty
+        search_vals: tuple (Default = None)
+            values for fields in 'where_field_list'
+        chunk_size: int (Default = 1000)
+            largest number of rows deleted in one transaction
+        where_operators: list of str (Default = None)
+            comparison of each field in 'where_field_list' with its value: '=', '<', '<=',
+            '>', '>=' or 'BETWEEN' (value is a (low, high) pair, both inclusive) as in
+            'ReadData'. None compares every field with '='
         """
         super().__init__(database_name, table_name)
         self.primary_key = primary_key
+        self.key_values = key_values
+        self.where_fields_list = where_field_list
+        self.search_vals = search_vals
+        self.where_operators = where_operators
+        self.chunk_size = chunk_size
+        self.deleted_count = 0
+        if where_operators is not None and (
+                len(where_operators) != len(where_field_list or ()) or
+                any(operator not in ReadData.WHERE_OPERATORS for operator in where_operators)):
+            print(f"Error Log - Where operators {where_operators} must be one of " +
+                  f"{ReadData.WHERE_OPERATORS} for each where field")
+            return
         # attempt to make connection to database (through super class)
         # successful connection will initialise 'cursor' and 'connection' objects
         self.create_database_connection()
 
     def execute(self):
-        """Connect to database, create SQL query to retrieve last row primary_key value.
-            Close Database Connection.
+        """Delete all rows chunk by chunk. Close Database Connection.
 
         Return:
         -----------
-        Returns None if there was an error when attempting to connect to database
-        Returns 0 if table in database is empty (default primary_key value for Integer type)
-        Returns primary_key value for last row in non-empty table
+        None if there was an error connecting to database
+        Number of rows deleted (rows deleted before an error remain deleted, 0 if neither
+        primary_key values nor fields were given)
+        None if 'where_operators' are invalid
+        """
+        if self.connection is None:
+            return None
+        for _ in self.execute_chunks():
+            pass
+        return self.deleted_count
+
+    def execute_chunks(self):
+        """Generator deleting rows one chunk (one transaction) at a time. Connection is returned
+            to the connection pool when generator is exhausted or closed, chunks already
+            committed stay deleted if generator is closed early.
+
+        Yield:
+        ------
+        number of rows deleted so far, after each committed chunk
 
         Exceptions:
         -----------
         sqlite.OperationalError:
             raised if SQL query is not correctly constructed and executed
         sqlite.DatabaseError:
-            raised for errors in closing connection or errors not caught by: sqlite.OperationalError
+            raised for errors not caught by: sqlite.OperationalError
         """
-        # check if connection (in parent class) to database was successful,
         if self.connection is None:
-            return None
+            return
+
         try:
-            # create and execute query using primary_key field_name to return last row in database
-            row = self.cursor.execute(f"SELECT * FROM {self.table_name} ORDER BY " +
-                                      f"{self.primary_key} DESC LIMIT 1").fetchall()
-
-            # if table is empty, return 0
-            if len(row) == 0:
-                return 0
-            # return primary key value of last row in table
+            if self.key_values is not None:
+                yield from self.delete_by_keys()
+            elif self.where_fields_list:
+                yield from self.delete_by_conditions()
             else:
-                return row[0][0]
+                # refuse to delete every row when no conditions were given
+                print("Error Log - Bulk delete needs primary_key values or at least one field")
 
         except sqlite3.OperationalError as operational_error:
-            print(
-                f"An error has occured trying to retrieve last row id from {self.table_name}")
+            self.rollback()
+            print(f"An error has occured trying to delete data from {self.table_name}")
             print(operational_error)
-            return None
         except sqlite3.DatabaseError as database_error:
+            self.rollback()
             print(database_error)
-            return None
         finally:
             # close connection to database with parent class
-            self.database_controller.close_connection()
+            self.close_connection()
+
+    def delete_by_keys(self):
+        """Generator deleting rows whose primary_key is in 'key_values', 'chunk_size' values
+            per DELETE and transaction, yielding number of rows deleted so far."""
+        chunk = []
+        for key_value in self.key_values:
+            chunk.append(key_value)
+            if len(chunk) == self.chunk_size:
+                yield self.delete_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield self.delete_chunk(chunk)
+
+    def delete_chunk(self, chunk):
+        """Delete and commit rows with primary_key values in 'chunk', return rows deleted so far."""
+        self.cursor.execute(f"DELETE FROM {self.table_name} WHERE {self.primary_key} IN " +
+                            f"({', '.join(['?'] * len(chunk))})", chunk)
+        self.commit()
+        self.deleted_count += self.cursor.rowcount
+        self.invalidate_cached_rows(self.primary_key, chunk)
+        return self.deleted_count
+
+    def delete_by_conditions(self):
+        """Generator deleting at most 'chunk_size' rows matching conditions per DELETE and
+            transaction until no matching rows remain, yielding number of rows deleted so far.
+            Conditions are built as for 'ReadData' searches ('ReadData.build_conditions()') and
+            matching rows are found with the conditions' index (if any) for each chunk."""
+        conditions, parameters = ReadData.build_conditions(
+            self.where_fields_list, self.where_operators, self.search_vals)
+        query = (f"DELETE FROM {self.table_name} WHERE {self.primary_key} IN " +
+                 f"(SELECT {self.primary_key} FROM {self.table_name} WHERE " +
+                 f"{' AND '.join(conditions)} LIMIT ?)")
+        parameters += (self.chunk_size,)
+        while True:
+            self.cursor.execute(query, parameters)
+            self.commit()
+            deleted = self.cursor.rowcount
+            self.deleted_count += deleted
+            if deleted == 0:
+                break
+            self.invalidate_cached_rows()
+            yield self.deleted_count
+            # a short chunk was the last of the matching rows
+            if deleted < self.chunk_size:
+                break
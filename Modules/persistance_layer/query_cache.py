@@ -0,0 +1,381 @@
+"""Module holding a per-database, in-process cache of search results so that identical searches
+    repeated within a short time (for example author = "Tolkien" from several terminals) are
+    answered from memory instead of executing the same query again.
+
+Results are keyed by (table_name, fields read, where fields, search values) and tagged with the
+generation of their table when stored. Every write through the Persistance Controllers bumps the
+generation of the table written to with 'invalidate()', which makes all results cached for the
+table stale at once without searching the cache for them (stale results are discarded when next
+looked up or evicted). Commits made outside the application (another process) are counted by
+the 'row_cache.DataVersionWatcher' ('PRAGMA data_version') shared with the row cache and make
+every cached result stale. Commits of the application's own connections are attributed by the
+watcher when it can prove no other connection committed at the same time, so they only make
+results of the table written to stale; any commit that cannot be attributed clears the cache.
+Results are bounded by number ('max_size', least recently used evicted first), by size (results
+of more than 'max_rows' rows are not cached) and optionally by age ('ttl').
+
+Module Usage:
+-------------
+Use of this module should be through 'QueryCache.for_database(database_name)' which returns the
+single shared cache for a database. 'QueryCache.configure(database_name, ...)' may be called
+before first use to change bounds, disable version checks or disable the cache.
+
+Classes:
+--------
+QueryCache:
+    Bounded least recently used cache of search results validated against per-table generation
+    counters, with hit and miss statistics.
+
+    Methods:
+    --------
+    __init__(self, database_name, max_size, max_rows, ttl, watch_data_version, enabled):
+        initialise empty cache for 'database_name'
+
+    for_database(cls, database_name): 'classmethod'
+        return shared cache for 'database_name', creating cache on first call
+
+    configure(cls, database_name, **settings): 'classmethod'
+        create or reconfigure shared cache for 'database_name' with desired settings
+
+    close_all_caches(cls): 'classmethod'
+        clear every shared cache and close watcher connections (application shutdown)
+
+    query_key(fields, where_fields, search_values, where_operators, order_by, limit):
+            'staticmethod'
+        return normalised key of a search
+
+    generation(self, table_name):
+        return current generation of table, read before a search result is read from database
+
+    get(self, table_name, query_key):
+        return cached result of search, or None if not cached or stale
+
+    put(self, table_name, query_key, rows, generation):
+        store result of search unless table has been written to since 'generation'
+
+    invalidate(self, table_name):
+        make every cached result of table stale (all tables if None)
+
+    clear(self):
+        drop every cached result
+
+    close(self):
+        clear cache (shared watcher connection is closed by 'close_all_caches()')
+
+    statistics(self):
+        return dictionary of cache counters for monitoring and testing
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from Modules.persistance_layer import row_cache
+
+
+class QueryCache:
+    """Bounded least recently used cache of search results keyed by (table_name, query_key) and
+        validated against a generation counter per table.
+
+    Attributes:
+    -----------
+    database_name: str
+        name of database results are cached for
+    max_size: int
+        maximum number of results held, least recently used result is evicted first
+    max_rows: int
+        results with more rows than this are not cached
+    ttl: float
+        seconds a cached result may be served for (None for no age limit)
+    watch_data_version: bool
+        if True, commits not made by the application are checked for before each lookup and
+        make every cached result stale
+    enabled: bool
+        if False, lookups always miss and nothing is stored
+
+    Methods:
+    --------
+    __init__(self, database_name, max_size, max_rows, ttl, watch_data_version, enabled):
+        initialise empty cache for 'database_name'
+
+    for_database(cls, database_name): 'classmethod'
+        return shared cache for 'database_name', creating cache on first call
+
+    configure(cls, database_name, **settings): 'classmethod'
+        create or reconfigure shared cache for 'database_name' with desired settings
+
+    close_all_caches(cls): 'classmethod'
+        clear every shared cache and close watcher connections
+
+    query_key(fields, where_fields, search_values, where_operators, order_by, limit):
+            'staticmethod'
+        return normalised key of a search
+
+    generation(self, table_name):
+        return current generation of table
+
+    get(self, table_name, query_key):
+        return cached result of search or None
+
+    put(self, table_name, query_key, rows, generation):
+        store result of search
+
+    invalidate(self, table_name):
+        make every cached result of table stale
+
+    clear(self):
+        drop every cached result
+
+    close(self):
+        clear cache (shared watcher connection is closed by 'close_all_caches()')
+
+    statistics(self):
+        return dictionary of cache counters
+    """
+    # shared caches (one per database_name) and lock guarding their creation
+    _caches = {}
+    _caches_lock = threading.Lock()
+
+    def __init__(self, database_name, max_size=256, max_rows=1000, ttl=None,
+                 watch_data_version=True, enabled=True):
+        """Constructor initialising an empty cache, watcher connection is opened on first use.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database results are cached for, also serves as path to database file
+        max_size: int (Default = 256)
+            maximum number of results held (must be at least 1)
+        max_rows: int (Default = 1000)
+            results with more rows than this are not cached
+        ttl: float (Default = None)
+            seconds a cached result may be served for. None for no age limit (results are
+            still made stale by writes)
+        watch_data_version: bool (Default = True)
+            detect commits made by other processes with 'PRAGMA data_version'
+        enabled: bool (Default = True)
+            set to False to bypass cache
+        """
+        if max_size < 1:
+            raise ValueError("QueryCache max_size must be at least 1")
+
+        self.database_name = database_name
+        self.max_size = max_size
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.watch_data_version = watch_data_version
+        self.enabled = enabled
+
+        # (table_name, query_key) with (generation, rows, time stored) as value, least
+        # recently used first
+        self._results = OrderedDict()
+        # generation counter of each table written to, and counter bumped for every table
+        # (commit by another connection or cache cleared). A table generation is the pair
+        self._table_generations = {}
+        self._epoch = 0
+        # counts commits not made by the application, shared with the row cache (count read
+        # now, commits made before cache was created do not concern it)
+        self._watcher = row_cache.DataVersionWatcher.for_database(database_name)
+        self._changes_seen = self._watcher.changes() if watch_data_version else None
+        self._lock = threading.Lock()
+
+        # usage counters returned by 'statistics()'
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "stale": 0, "evictions": 0,
+                       "expirations": 0, "too_large": 0, "invalidations": 0,
+                       "version_changes": 0}
+
+    @classmethod
+    def for_database(cls, database_name):
+        """Return shared cache for 'database_name', creating one with default settings on
+            first call."""
+        with cls._caches_lock:
+            cache = cls._caches.get(database_name)
+            if cache is None:
+                cache = cls(database_name)
+                cls._caches[database_name] = cache
+            return cache
+
+    @classmethod
+    def configure(cls, database_name, **settings):
+        """Create or reconfigure shared cache for 'database_name'. Cached results are dropped.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of database the shared cache is for
+        settings: keyword arguments
+            any of 'max_size', 'max_rows', 'ttl', 'watch_data_version' or 'enabled' as in
+            constructor
+
+        Return:
+        -------
+        QueryCache - the shared cache for 'database_name'
+        """
+        cache = cls.for_database(database_name)
+        with cache._lock:
+            for setting, value in settings.items():
+                if setting not in ("max_size", "max_rows", "ttl", "watch_data_version",
+                                   "enabled"):
+                    raise ValueError(f"Unknown QueryCache setting '{setting}'")
+                if setting == "max_size" and value < 1:
+                    raise ValueError("QueryCache max_size must be at least 1")
+                setattr(cache, setting, value)
+            cache._drop_all()
+        return cache
+
+    @classmethod
+    def close_all_caches(cls):
+        """Clear every shared cache and close the shared watcher connections (application
+            shutdown)."""
+        with cls._caches_lock:
+            caches = list(cls._caches.values())
+            cls._caches.clear()
+        for cache in caches:
+            cache.close()
+        row_cache.DataVersionWatcher.close_all_watchers()
+
+    @staticmethod
+    def query_key(fields, where_fields=None, search_values=None, where_operators=None,
+                  order_by=None, limit=None):
+        """Return key of a search: tuple of fields read, tuple of where fields, tuple of
+            search values, tuple of comparison operators of where fields, tuple of fields
+            ordered by (empty tuples if None) and limit of rows. Searches differing only in the
+            type of a sequence (list or tuple) share a key.
+
+        Exceptions:
+        -----------
+        TypeError:
+            raised if a search value cannot be used in a key (unhashable value)
+        """
+        key = (tuple(fields), tuple(where_fields or ()), tuple(search_values or ()),
+               tuple(where_operators or ()), tuple(order_by or ()), limit)
+        hash(key)
+        return key
+
+    def generation(self, table_name):
+        """Return current generation of 'table_name'. Read before a result is read from the
+            database and passed to 'put()' so a result read during a write is not stored."""
+        with self._lock:
+            return (self._epoch, self._table_generations.get(table_name, 0))
+
+    def get(self, table_name, query_key):
+        """Return result cached for search 'query_key' on 'table_name' if no write to table (and
+            no commit by another connection) has happened since it was stored and it is not
+            older than 'ttl'. Needs no database connection.
+
+        Arguments:
+        ----------
+        table_name: str
+            name of table searched
+        query_key: tuple
+            key of search returned by 'query_key()'
+
+        Return:
+        -------
+        list of header tuple followed by row tuples (new list on each call), or None if not
+        cached
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._check_data_version()
+            entry = self._results.get((table_name, query_key))
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry[0] != (self._epoch, self._table_generations.get(table_name, 0)):
+                # table written to since result was stored
+                del self._results[(table_name, query_key)]
+                self._stats["stale"] += 1
+                self._stats["misses"] += 1
+                return None
+            if self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                del self._results[(table_name, query_key)]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._results.move_to_end((table_name, query_key))
+            self._stats["hits"] += 1
+            return list(entry[1])
+
+    def put(self, table_name, query_key, rows, generation):
+        """Store result 'rows' of search 'query_key' on 'table_name', evicting least recently
+            used results above 'max_size'. Result is not stored if it has more than 'max_rows'
+            rows or the table has been written to since 'generation' was read.
+
+        Arguments:
+        ----------
+        table_name: str
+            name of table searched
+        query_key: tuple
+            key of search returned by 'query_key()'
+        rows: list
+            header tuple followed by row tuples as returned by 'ReadData.execute()' (empty
+            list for no matching rows)
+        generation: tuple
+            value returned by 'generation()' before result was read from database
+        """
+        if not self.enabled:
+            return
+        if len(rows) > self.max_rows:
+            with self._lock:
+                self._stats["too_large"] += 1
+            return
+        with self._lock:
+            if generation != (self._epoch, self._table_generations.get(table_name, 0)):
+                return
+            self._results[(table_name, query_key)] = (generation, tuple(rows), time.monotonic())
+            self._results.move_to_end((table_name, query_key))
+            self._stats["stores"] += 1
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, table_name=None):
+        """Make every cached result of 'table_name' (of all tables if None) stale by bumping its
+            generation. Stale results are removed when next looked up or evicted."""
+        with self._lock:
+            self._stats["invalidations"] += 1
+            if table_name is None:
+                self._epoch += 1
+            else:
+                self._table_generations[table_name] = \
+                    self._table_generations.get(table_name, 0) + 1
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._drop_all()
+
+    def close(self):
+        """Drop every cached result. Shared watcher connection is closed by
+            'close_all_caches()'."""
+        with self._lock:
+            self._drop_all()
+
+    def statistics(self):
+        """Return dictionary of cache counters together with current cache occupancy."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_results"] = len(self._results)
+            stats["max_size"] = self.max_size
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+            return stats
+
+    def _drop_all(self):
+        """Internal, drop every cached result and make results being read stale. Caller must
+            hold cache lock."""
+        self._results.clear()
+        self._epoch += 1
+
+    def _check_data_version(self):
+        """Internal, drop every cached result if the watcher has counted a commit not made by
+            the application since last lookup. Caller must hold cache lock."""
+        if not self.watch_data_version:
+            return
+        changes = self._watcher.changes()
+        if changes != self._changes_seen:
+            self._changes_seen = changes
+            if self._results:
+                self._stats["version_changes"] += 1
+            self._drop_all()
@@ -0,0 +1,536 @@
+"""Module holding a per-database, in-process LRU cache of table rows read by primary_key so that
+    repeated lookups of the same row ('Search Entity' on the primary_key) are served from memory
+    instead of a query against the database.
+
+Entries are bounded by number ('max_size', least recently used entry evicted first) and by age
+('ttl' seconds). Persistance Controllers writing to a table drop the rows they change with
+'invalidate()'. Changes committed outside the application (another process) are detected by
+reading 'PRAGMA data_version' on a dedicated watcher connection before each lookup: sqlite
+changes this value whenever another connection commits to the database, the whole cache is then
+cleared. Persistance Controllers commit between 'DataVersionWatcher.begin_commit()' and
+'end_commit()', which record the new version as the application's own only when the version of
+the committing connection proves no other connection committed in between, so commits of the
+application's connections (pool, session and writer thread) only drop the rows they change and
+any change that cannot be attributed clears the cache. A read of 'data_version' does not touch
+any table and costs far less than the query it replaces.
+
+Module Usage:
+-------------
+Use of this module should be through 'RowCache.for_database(database_name)' which returns the
+single shared cache for a database. 'RowCache.configure(database_name, ...)' may be called before
+first use to change size and age bounds, disable version checks (application is the only writer)
+or disable the cache.
+
+Classes:
+--------
+DataVersionWatcher:
+    Dedicated sqlite3 connection reading 'PRAGMA data_version' to count commits not made by the
+    application, shared by 'RowCache' and 'query_cache.QueryCache' of a database
+
+    Methods:
+    --------
+    __init__(self, database_name):
+        initialise watcher for 'database_name' (connection is opened on first check)
+
+    for_database(cls, database_name): 'classmethod'
+        return shared watcher for 'database_name', creating watcher on first call
+
+    close_all_watchers(cls): 'classmethod'
+        close connection of every shared watcher (application shutdown)
+
+    changes(self):
+        return number of commits counted that were not made by the application
+
+    begin_commit(self, connection):
+        read versions just before a connection of the application commits
+
+    end_commit(self, connection, commit_version):
+        record commit as the application's own, or count a change if that cannot be proven
+
+    close(self):
+        close watcher connection (reopened on next check)
+
+RowCache:
+    Bounded least recently used cache of rows keyed by (table_name, primary_key value) with hit
+    and miss statistics.
+
+    Methods:
+    --------
+    __init__(self, database_name, max_size, ttl, watch_data_version, enabled):
+        initialise empty cache for 'database_name'
+
+    for_database(cls, database_name): 'classmethod'
+        return shared cache for 'database_name', creating cache on first call
+
+    configure(cls, database_name, **settings): 'classmethod'
+        create or reconfigure shared cache for 'database_name' with desired settings
+
+    close_all_caches(cls): 'classmethod'
+        clear every shared cache and close watcher connections (application shutdown)
+
+    key_field(self, table_name):
+        return name of primary_key field rows of table are cached by (None if none cached)
+
+    get(self, table_name, key_field, key_value, fields):
+        return cached rows for primary_key value read with 'fields', or None if not cached
+
+    put(self, table_name, key_field, key_value, fields, rows, generation):
+        store rows read for primary_key value unless cache was invalidated since 'generation'
+
+    invalidate(self, table_name, key_values):
+        drop cached rows for primary_key values of table (all rows of table if None)
+
+    clear(self):
+        drop every cached row
+
+    close(self):
+        clear cache (shared watcher connection is closed by 'close_all_caches()')
+
+    statistics(self):
+        return dictionary of cache counters for monitoring and testing
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class DataVersionWatcher:
+    """Dedicated connection (never used for queries) reading 'PRAGMA data_version', which sqlite
+        changes whenever a connection other than this one commits to the database. One watcher
+        is shared by the row and query caches of a database and counts every change it cannot
+        attribute to a commit of the application's own connections. Thread safe.
+
+    Attributes:
+    -----------
+    database_name: str
+        name of database watched, also serves as path to database file
+    change_count: int
+        number of changes counted, caches are cleared when it differs from the count they saw
+
+    Methods:
+    --------
+    __init__(self, database_name):
+        initialise watcher for 'database_name'
+
+    for_database(cls, database_name): 'classmethod'
+        return shared watcher for 'database_name', creating watcher on first call
+
+    close_all_watchers(cls): 'classmethod'
+        close connection of every shared watcher
+
+    changes(self):
+        return 'change_count' after reading current version
+
+    begin_commit(self, connection):
+        read versions just before 'connection' of the application commits
+
+    end_commit(self, connection, commit_version):
+        read versions after commit, counting a change unless the commit is proven own
+
+    close(self):
+        close watcher connection
+    """
+    # shared watchers (one per database_name) and lock guarding their creation
+    _watchers = {}
+    _watchers_lock = threading.Lock()
+
+    def __init__(self, database_name):
+        """Constructor initialising watcher, connection is opened on first version read."""
+        self.database_name = database_name
+        self.change_count = 0
+        self._connection = None
+        self._data_version = None
+        # commits between 'begin_commit()' and 'end_commit()', and whether one of them could
+        # not be attributed to the application
+        self._commits = 0
+        self._unattributed = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_database(cls, database_name):
+        """Return shared watcher for 'database_name', creating one on first call."""
+        with cls._watchers_lock:
+            watcher = cls._watchers.get(database_name)
+            if watcher is None:
+                watcher = cls(database_name)
+                cls._watchers[database_name] = watcher
+            return watcher
+
+    @classmethod
+    def close_all_watchers(cls):
+        """Close connection of every shared watcher (reopened, counting a change, if used
+            again)."""
+        with cls._watchers_lock:
+            watchers = list(cls._watchers.values())
+        for watcher in watchers:
+            watcher.close()
+
+    def changes(self):
+        """Return 'change_count' after counting a change if 'PRAGMA data_version' differs from
+            the version last read. A change is always counted on first call and whenever the
+            version cannot be read, so callers discard anything they hold. While an
+            application commit is in progress the version is not read, the commit being
+            attributed (or counted) by 'end_commit()'."""
+        with self._lock:
+            if self._commits == 0:
+                self._count_change()
+            return self.change_count
+
+    def begin_commit(self, connection):
+        """Read versions just before 'connection' of the application commits, while it holds
+            the write lock: any change not yet seen is counted (none can be made until the
+            commit).
+
+        Return:
+        -------
+        'PRAGMA data_version' of 'connection' to pass to 'end_commit()' (None if not read)
+        """
+        with self._lock:
+            if self._commits == 0:
+                self._count_change()
+            self._commits += 1
+        try:
+            return connection.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def end_commit(self, connection, commit_version):
+        """Read versions after 'connection' committed (or failed to). The version of
+            'connection' only changes when another connection commits, if it is still
+            'commit_version' once the watcher version has been read no other commit can have
+            been made since 'begin_commit()' and the new version is recorded as the
+            application's own. Otherwise (another process, or another thread of the
+            application, committed in between) a change is counted."""
+        with self._lock:
+            self._commits -= 1
+            watcher_version = self._read_version()
+            try:
+                attributed = (commit_version is not None and watcher_version is not None and
+                              connection.execute("PRAGMA data_version").fetchone()[0] ==
+                              commit_version)
+            except sqlite3.Error:
+                attributed = False
+            if not attributed:
+                self._unattributed = True
+            if self._commits == 0:
+                if self._unattributed:
+                    self.change_count += 1
+                self._unattributed = False
+                self._data_version = watcher_version
+
+    def close(self):
+        """Close watcher connection, next version read reopens it (counting a change)."""
+        with self._lock:
+            self._close_connection()
+
+    def _count_change(self):
+        """Internal, count a change if version differs from version last read. Caller must
+            hold watcher lock."""
+        data_version = self._read_version()
+        if data_version is None or data_version != self._data_version:
+            self.change_count += 1
+        self._data_version = data_version
+
+    def _read_version(self):
+        """Internal, return 'PRAGMA data_version' of watcher connection, None if it cannot be
+            read (connection is then closed). Caller must hold watcher lock."""
+        try:
+            if self._connection is None:
+                self._connection = sqlite3.connect(self.database_name, check_same_thread=False)
+            return self._connection.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            self._close_connection()
+            return None
+
+    def _close_connection(self):
+        """Internal, close watcher connection. Caller must hold watcher lock."""
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except sqlite3.Error:
+                pass
+        self._connection = None
+        self._data_version = None
+
+
+# -------------------------------------------------------------------------------------------------
+class RowCache:
+    """Bounded least recently used cache of rows keyed by (table_name, primary_key value).
+
+    Attributes:
+    -----------
+    database_name: str
+        name of database rows are cached for
+    max_size: int
+        maximum number of rows held, least recently used row is evicted first
+    ttl: float
+        seconds a cached row may be served for (None for no age limit)
+    watch_data_version: bool
+        if True, 'PRAGMA data_version' is checked before each lookup and the cache is cleared
+        when a commit not made by the application has been made to the database
+    enabled: bool
+        if False, lookups always miss and nothing is stored
+    generation: int
+        incremented on every invalidation, a row read before an invalidation is not stored
+
+    Methods:
+    --------
+    __init__(self, database_name, max_size, ttl, watch_data_version, enabled):
+        initialise empty cache for 'database_name'
+
+    for_database(cls, database_name): 'classmethod'
+        return shared cache for 'database_name', creating cache on first call
+
+    configure(cls, database_name, **settings): 'classmethod'
+        create or reconfigure shared cache for 'database_name' with desired settings
+
+    close_all_caches(cls): 'classmethod'
+        clear every shared cache and close watcher connections
+
+    get(self, table_name, key_field, key_value, fields):
+        return cached rows for primary_key value or None
+
+    put(self, table_name, key_field, key_value, fields, rows, generation):
+        store rows read for primary_key value
+
+    invalidate(self, table_name, key_values):
+        drop cached rows for primary_key values of table
+
+    clear(self):
+        drop every cached row
+
+    close(self):
+        clear cache (shared watcher connection is closed by 'close_all_caches()')
+
+    statistics(self):
+        return dictionary of cache counters
+    """
+    # shared caches (one per database_name) and lock guarding their creation
+    _caches = {}
+    _caches_lock = threading.Lock()
+
+    def __init__(self, database_name, max_size=1024, ttl=30.0, watch_data_version=True,
+                 enabled=True):
+        """Constructor initialising an empty cache, watcher connection is opened on first use.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database rows are cached for, also serves as path to database file
+        max_size: int (Default = 1024)
+            maximum number of rows held (must be at least 1)
+        ttl: float (Default = 30.0)
+            seconds a cached row may be served for. None for no age limit
+        watch_data_version: bool (Default = True)
+            detect commits made by other processes with 'PRAGMA data_version'. May be set to
+            False when all writes go through this application's Persistance Controllers (which
+            invalidate the rows they change)
+        enabled: bool (Default = True)
+            set to False to bypass cache
+        """
+        if max_size < 1:
+            raise ValueError("RowCache max_size must be at least 1")
+
+        self.database_name = database_name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.watch_data_version = watch_data_version
+        self.enabled = enabled
+        self.generation = 0
+
+        # (table_name, key_value) with (fields, rows, time stored) as value, least recently
+        # used first
+        self._rows = OrderedDict()
+        # table_name with name of primary_key field rows of table were cached by
+        self._key_fields = {}
+        # counts commits not made by the application, cache is cleared when count changes
+        # (count read now, commits made before cache was created do not concern it)
+        self._watcher = DataVersionWatcher.for_database(database_name)
+        self._changes_seen = self._watcher.changes() if watch_data_version else None
+        self._lock = threading.Lock()
+
+        # usage counters returned by 'statistics()'
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expirations": 0,
+                       "invalidations": 0, "version_changes": 0}
+
+    @classmethod
+    def for_database(cls, database_name):
+        """Return shared cache for 'database_name', creating one with default settings on
+            first call."""
+        with cls._caches_lock:
+            cache = cls._caches.get(database_name)
+            if cache is None:
+                cache = cls(database_name)
+                cls._caches[database_name] = cache
+            return cache
+
+    @classmethod
+    def configure(cls, database_name, **settings):
+        """Create or reconfigure shared cache for 'database_name'. Cached rows are dropped.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of database the shared cache is for
+        settings: keyword arguments
+            any of 'max_size', 'ttl', 'watch_data_version' or 'enabled' as in constructor
+
+        Return:
+        -------
+        RowCache - the shared cache for 'database_name'
+        """
+        cache = cls.for_database(database_name)
+        with cache._lock:
+            for setting, value in settings.items():
+                if setting not in ("max_size", "ttl", "watch_data_version", "enabled"):
+                    raise ValueError(f"Unknown RowCache setting '{setting}'")
+                if setting == "max_size" and value < 1:
+                    raise ValueError("RowCache max_size must be at least 1")
+                setattr(cache, setting, value)
+            cache._drop_all()
+        return cache
+
+    @classmethod
+    def close_all_caches(cls):
+        """Clear every shared cache and close the shared watcher connections (application
+            shutdown)."""
+        with cls._caches_lock:
+            caches = list(cls._caches.values())
+            cls._caches.clear()
+        for cache in caches:
+            cache.close()
+        DataVersionWatcher.close_all_watchers()
+
+    def key_field(self, table_name):
+        """Return name of primary_key field rows of 'table_name' are cached by, None if no rows
+            of table have been cached since cache was last cleared."""
+        return self._key_fields.get(table_name)
+
+    def get(self, table_name, key_field, key_value, fields):
+        """Return rows cached for 'key_value' of 'table_name' if they were read with the same
+            'fields', are not older than 'ttl' and no other connection has committed since.
+            Needs no database connection, so a cached row is returned without borrowing one.
+
+        Arguments:
+        ----------
+        table_name: str
+            name of table row was read from
+        key_field: str
+            name of field searched, rows are only returned for the field they were cached by
+            (the table primary_key)
+        key_value: int, float or str
+            primary_key value of row
+        fields: tuple of strings
+            fields the row was read with
+
+        Return:
+        -------
+        list of header tuple and row tuple (new list on each call) or None if not cached
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._check_data_version()
+            # search on a field other than the primary_key rows were cached by
+            if self._key_fields.get(table_name, key_field) != key_field:
+                return None
+            entry = self._rows.get((table_name, key_value))
+            if entry is None or entry[0] != fields:
+                self._stats["misses"] += 1
+                return None
+            if self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                del self._rows[(table_name, key_value)]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._rows.move_to_end((table_name, key_value))
+            self._stats["hits"] += 1
+            return list(entry[1])
+
+    def put(self, table_name, key_field, key_value, fields, rows, generation):
+        """Store 'rows' read for 'key_value' of 'table_name', evicting least recently used rows
+            above 'max_size'. Rows are not stored if the cache has been invalidated since
+            'generation' was read (row may have been changed while it was being read).
+
+        Arguments:
+        ----------
+        table_name: str
+            name of table row was read from
+        key_field: str
+            name of primary_key field of table
+        key_value: int, float or str
+            primary_key value of row
+        fields: tuple of strings
+            fields the row was read with
+        rows: list
+            header tuple followed by row tuple as returned by 'ReadData.execute()'
+        generation: int
+            value of 'generation' read before the row was read from database
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._key_fields[table_name] = key_field
+            self._rows[(table_name, key_value)] = (fields, tuple(rows), time.monotonic())
+            self._rows.move_to_end((table_name, key_value))
+            self._stats["stores"] += 1
+            while len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, table_name, key_values=None):
+        """Drop cached rows of 'table_name' for each primary_key value in 'key_values', or every
+            cached row of 'table_name' if 'key_values' is None."""
+        with self._lock:
+            self.generation += 1
+            self._stats["invalidations"] += 1
+            if key_values is None:
+                for cache_key in [cache_key for cache_key in self._rows
+                                  if cache_key[0] == table_name]:
+                    del self._rows[cache_key]
+                return
+            for key_value in key_values:
+                self._rows.pop((table_name, key_value), None)
+
+    def clear(self):
+        """Drop every cached row."""
+        with self._lock:
+            self._drop_all()
+
+    def close(self):
+        """Drop every cached row. Shared watcher connection is closed by
+            'close_all_caches()'."""
+        with self._lock:
+            self._drop_all()
+
+    def statistics(self):
+        """Return dictionary of cache counters together with current cache occupancy."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_rows"] = len(self._rows)
+            stats["max_size"] = self.max_size
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+            return stats
+
+    def _drop_all(self):
+        """Internal, drop every cached row. Caller must hold cache lock."""
+        self._rows.clear()
+        self._key_fields.clear()
+        self.generation += 1
+
+    def _check_data_version(self):
+        """Internal, clear cache if the watcher has counted a commit not made by the
+            application since last lookup (or the data_version could not be read). Caller must
+            hold cache lock."""
+        if not self.watch_data_version:
+            return
+        changes = self._watcher.changes()
+        if changes != self._changes_seen:
+            self._changes_seen = changes
+            if self._rows:
+                self._stats["version_changes"] += 1
+            self._drop_all()
@@ -0,0 +1,194 @@
+"""Module holding a per-database cache of table existence and column metadata used by the
+    Persistance Layer so that 'sqlite_master' does not need to be queried before every action.
+
+The cache is loaded once and is only reloaded when the database 'PRAGMA schema_version' changes
+(sqlite increments this value on every CREATE, DROP or ALTER) or when 'invalidate()' is called
+after DDL has been executed by this application. Reading 'schema_version' is a read of the
+database header and does not scan the schema catalog.
+
+Module Usage:
+-------------
+Use of this module should be through 'SchemaRegistry.for_database(database_name)' which returns
+the single shared registry for a database. Methods accept an open sqlite3 connection that is used
+to check the schema version and, if needed, reload the cached schema.
+
+Classes:
+--------
+SchemaRegistry:
+    Cache of table names and their column metadata for one database file.
+
+    Methods:
+    --------
+    __init__(self, database_name):
+        initialise empty registry for 'database_name'
+
+    for_database(cls, database_name): 'classmethod'
+        return shared registry for 'database_name', creating registry on first call
+
+    table_exists(self, connection, table_name):
+        return True if 'table_name' exists in database, False if not
+
+    table_columns(self, connection, table_name):
+        return tuple of column names for 'table_name' in table order (empty if no table)
+
+    primary_key(self, connection, table_name):
+        return name of single-field primary key of 'table_name' or None
+
+    unique_indexes(self, connection, table_name):
+        return tuple of field name tuples, one per unique index of 'table_name'
+
+    invalidate(self):
+        discard cached schema so it is reloaded on next use (call after DDL)
+"""
+import threading
+
+
+class SchemaRegistry:
+    """Cache of table names and column metadata for one database file, validated against
+        'PRAGMA schema_version'.
+
+    Attributes:
+    -----------
+    database_name: str
+        name of database schema is cached for
+    tables: dict
+        table_name (key) with tuple of column tuples (name, type, notnull, pk) as value
+    schema_version: int
+        value of 'PRAGMA schema_version' when 'tables' was loaded (None if not loaded)
+    indexes: dict
+        table_name (key) with tuple of field name tuples of its unique indexes as value, read
+        on first use for each table
+
+    Methods:
+    --------
+    __init__(self, database_name):
+        initialise empty registry for 'database_name'
+
+    for_database(cls, database_name): 'classmethod'
+        return shared registry for 'database_name', creating registry on first call
+
+    table_exists(self, connection, table_name):
+        return True if 'table_name' exists in database, False if not
+
+    table_columns(self, connection, table_name):
+        return tuple of column names for 'table_name' in table order
+
+    primary_key(self, connection, table_name):
+        return name of single-field primary key of 'table_name' or None
+
+    unique_indexes(self, connection, table_name):
+        return tuple of field name tuples, one per unique index of 'table_name'
+
+    invalidate(self):
+        discard cached schema so it is reloaded on next use
+    """
+    # shared registries (one per database_name) and lock guarding their creation
+    _registries = {}
+    _registries_lock = threading.Lock()
+
+    def __init__(self, database_name):
+        """Constructor initialising an empty registry, schema is loaded on first use.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database schema is cached for
+        """
+        self.database_name = database_name
+        self.tables = {}
+        self.indexes = {}
+        self.schema_version = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_database(cls, database_name):
+        """Return shared registry for 'database_name', creating one on first call."""
+        with cls._registries_lock:
+            registry = cls._registries.get(database_name)
+            if registry is None:
+                registry = cls(database_name)
+                cls._registries[database_name] = registry
+            return registry
+
+    def table_exists(self, connection, table_name):
+        """Return True if 'table_name' exists in database, False if not.
+
+        Arguments:
+        ----------
+        connection: class:sqlite3.Connection
+            open connection to database used to validate cached schema
+
+        Exceptions:
+        -----------
+        sqlite3.DatabaseError:
+            raised by sqlite3 if schema version or catalog cannot be read
+        """
+        return table_name in self._current_tables(connection)
+
+    def table_columns(self, connection, table_name):
+        """Return tuple of column names for 'table_name' in table order (empty if no table)."""
+        columns = self._current_tables(connection).get(table_name, ())
+        return tuple(column[0] for column in columns)
+
+    def primary_key(self, connection, table_name):
+        """Return name of single-field primary key for 'table_name', None if table does not
+            exist or has no (or a composite) primary key."""
+        columns = self._current_tables(connection).get(table_name, ())
+        key_columns = [column[0] for column in columns if column[3] > 0]
+        return key_columns[0] if len(key_columns) == 1 else None
+
+    def unique_indexes(self, connection, table_name):
+        """Return tuple of field name tuples, one for each unique index of 'table_name' (UNIQUE
+            constraints and a primary_key other than an INTEGER PRIMARY KEY included, partial
+            indexes left out as they cannot match every row). Empty if table does not exist or
+            has no unique index."""
+        self._current_tables(connection)
+        with self._lock:
+            indexes = self.indexes.get(table_name)
+        if indexes is None:
+            indexes = self._load_unique_indexes(connection, table_name)
+            with self._lock:
+                self.indexes[table_name] = indexes
+        return indexes
+
+    def invalidate(self):
+        """Discard cached schema so that it is reloaded on next use (call after DDL)."""
+        with self._lock:
+            self.schema_version = None
+            self.tables = {}
+            self.indexes = {}
+
+    def _current_tables(self, connection):
+        """Internal, return cached tables dictionary, reloading it first if database
+            schema_version has changed since it was loaded."""
+        current_version = connection.execute("PRAGMA schema_version").fetchone()[0]
+        with self._lock:
+            if current_version != self.schema_version:
+                self.tables = self._load_tables(connection)
+                self.indexes = {}
+                self.schema_version = current_version
+            return self.tables
+
+    def _load_tables(self, connection):
+        """Internal, read all table names and their column metadata from database."""
+        tables = {}
+        table_names = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+        for (table_name,) in table_names:
+            # PRAGMA table_info rows: cid, name, type, notnull, default_value, pk
+            columns = connection.execute(f"PRAGMA table_info('{table_name}')").fetchall()
+            tables[table_name] = tuple((column[1], column[2], column[3], column[5])
+                                       for column in columns)
+        return tables
+
+    @staticmethod
+    def _load_unique_indexes(connection, table_name):
+        """Internal, read field names of every full unique index of 'table_name'."""
+        indexes = []
+        # PRAGMA index_list rows: seq, name, unique, origin, partial
+        for index in connection.execute(f"PRAGMA index_list('{table_name}')").fetchall():
+            if index[2] and not index[4]:
+                # PRAGMA index_info rows: seqno, cid, name
+                fields = connection.execute(f"PRAGMA index_info('{index[1]}')").fetchall()
+                indexes.append(tuple(field[2] for field in sorted(fields)))
+        return tuple(indexes)
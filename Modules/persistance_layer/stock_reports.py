@@ -0,0 +1,288 @@
+"""Module holding report queries of the Persistance Layer. Reports are computed by sqlite with
+    aggregate functions ('COUNT', 'SUM', 'GROUP BY') so only the few result rows of a report are
+    returned to Python, never every row of the table. Reports reading only the quantity field are
+    answered from the index on that field ('FieldControl.index_list') without reading the table.
+
+Report classes are child classes of 'persistence_classes_single_key.DataBaseQueryClass' and
+borrow connections in the same way as the other Persistance Controllers (the database session
+connection when run on the application thread).
+
+Module Usage:
+-------------
+Use of this module should be through child classes of 'StockReport', each returning a list with
+a header tuple followed by result row tuples from 'execute()' (as 'ReadData'):
+
+    StockTotals(database_name, table_name, quantity_field).execute()
+    GroupStockTotals(database_name, table_name, group_field, quantity_field, limit).execute()
+    LowStockCounts(database_name, table_name, quantity_field, thresholds).execute()
+
+Classes:
+--------
+StockReport:
+    Parent class executing an aggregate query and returning its header and result rows
+
+    Methods:
+    --------
+    __init__(self, database_name, table_name, quantity_field, transaction):
+        initialise report and borrow database connection
+
+    execute(self): 'override'
+        execute report query, close database connection and return header and rows
+
+    build_query(self):
+        return query string and parameters of report. Must be overridden by child class
+
+StockTotals:
+    Number of rows (titles), total and average quantity held over whole table
+
+GroupStockTotals:
+    Number of titles and total quantity for each value of a group field (for example each
+    author), largest total quantity first
+
+LowStockCounts:
+    Number of titles and copies at or below each of several quantity thresholds, counted in one
+    pass over the table
+"""
+import sqlite3
+
+from Modules.persistance_layer import persistence_classes_single_key
+
+
+class StockReport(persistence_classes_single_key.DataBaseQueryClass):
+    """Parent class of reports executing one aggregate query against a table and returning the
+        header and result rows of the query.
+
+    Attributes:
+    -----------
+    quantity_field: str
+        name of integer field holding stock quantity
+
+    Methods:
+    --------
+    __init__(self, database_name, table_name, quantity_field, transaction):
+        initialise report and borrow database connection
+
+    execute(self): 'override'
+        execute report query, close database connection and return header and rows
+
+    build_query(self):
+        return query string and parameters of report. Must be overridden by child class
+    """
+
+    def __init__(self, database_name, table_name, quantity_field, transaction=None):
+        """Constructor initialising report and parent DataBaseQueryClass objects.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database to connect to, also serves as path to database file
+        table_name: str
+            name of table to report on
+        quantity_field: str
+            name of integer field holding stock quantity
+        transaction: Transaction (Default = None)
+            open transaction to read in (reads changes not yet committed by the transaction)
+        """
+        super().__init__(database_name, table_name, transaction)
+        self.quantity_field = quantity_field
+        # attempt to make connection to database (through super class)
+        # successful connection will initialise 'cursor' and 'connection' objects
+        self.create_database_connection()
+
+    def execute(self):
+        """Execute report query built by 'build_query()'. Close Database Connection.
+
+        Return:
+        -------
+        Result - List with header Tuple (names of report columns) followed by row Tuple(s)
+        No Result - Empty List (a grouped report of an empty table)
+        None - connection could not be made or query could not be executed
+
+        Exceptions:
+        -----------
+        sqlite.OperationalError:
+            raised if SQL query is not correctly constructed and executed
+        sqlite.DatabaseError:
+            raised for errors not caught by: sqlite.OperationalError
+        """
+        if self.connection is None:
+            return None
+
+        try:
+            query, parameters = self.build_query()
+            rows_returned = self.cursor.execute(query, parameters).fetchall()
+            if not rows_returned:
+                return []
+            header = tuple([description[0] for description in self.cursor.description])
+            return [header] + rows_returned
+
+        except sqlite3.OperationalError as operational_error:
+            print(f"An error has occured trying to create report of {self.table_name}")
+            print(operational_error)
+        except sqlite3.DatabaseError as database_error:
+            print(database_error)
+        finally:
+            # close connection to database with parent class
+            self.close_connection()
+
+    def build_query(self):
+        """Method to be overridden. Returns query string and tuple of parameters of report"""
+
+
+# -------------------------------------------------------------------------------------------------
+class StockTotals(StockReport):
+    """Number of titles (rows), total quantity and average quantity of whole table in one row.
+
+    Methods:
+    --------
+    build_query(self): 'override'
+        return 'COUNT', 'SUM' and 'AVG' query over table
+    """
+
+    def build_query(self):
+        """Return query counting rows and summing and averaging quantity field of table (an
+            empty table reports 0 for each)."""
+        query = self.cached_sql(
+            ("totals", self.table_name, self.quantity_field),
+            lambda: ("SELECT COUNT(*) AS titles, " +
+                     f"COALESCE(SUM({self.quantity_field}), 0) AS total_stock, " +
+                     f"COALESCE(ROUND(AVG({self.quantity_field}), 1), 0) AS average_stock " +
+                     f"FROM {self.table_name}"))
+        return query, ()
+
+
+# -------------------------------------------------------------------------------------------------
+class GroupStockTotals(StockReport):
+    """Number of titles and total quantity for each value of 'group_field' (for example each
+        author), ordered by total quantity (largest first) then group value.
+
+    Attributes:
+    -----------
+    group_field: str
+        name of field rows are grouped by
+    limit: int (or None)
+        maximum number of groups returned, None for all groups
+
+    Methods:
+    --------
+    __init__(self, database_name, table_name, group_field, quantity_field, limit, transaction):
+        initialise report and parent StockReport objects
+
+    build_query(self): 'override'
+        return 'GROUP BY' query totalling each group
+    """
+
+    def __init__(self, database_name, table_name, group_field, quantity_field, limit=None,
+                 transaction=None):
+        """Constructor initialising GroupStockTotals and parent StockReport objects.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database to connect to, also serves as path to database file
+        table_name: str
+            name of table to report on
+        group_field: str
+            name of field rows are grouped by (an indexed field is recommended)
+        quantity_field: str
+            name of integer field holding stock quantity
+        limit: int (Default = None)
+            maximum number of groups returned, None for all groups
+        transaction: Transaction (Default = None)
+            open transaction to read in
+        """
+        self.group_field = group_field
+        self.limit = limit
+        super().__init__(database_name, table_name, quantity_field, transaction)
+
+    def build_query(self):
+        """Return query grouping rows by 'group_field' with count of titles and total quantity
+            of each group and the limit of groups as parameter (-1 for no limit)."""
+        query = self.cached_sql(
+            ("group totals", self.table_name, self.group_field, self.quantity_field),
+            lambda: (f"SELECT {self.group_field}, COUNT(*) AS titles, " +
+                     f"SUM({self.quantity_field}) AS total_stock " +
+                     f"FROM {self.table_name} GROUP BY {self.group_field} " +
+                     f"ORDER BY total_stock DESC, {self.group_field} LIMIT ?"))
+        return query, (-1 if self.limit is None else self.limit,)
+
+
+# -------------------------------------------------------------------------------------------------
+class LowStockCounts(StockReport):
+    """Number of titles and copies with quantity at or below each threshold, counted with one
+        conditional aggregate per threshold in a single pass over the table. Returns one row for
+        each threshold (lowest first) rather than one column.
+
+    Attributes:
+    -----------
+    thresholds: list of int
+        quantities titles are counted at or below, sorted lowest first
+
+    Methods:
+    --------
+    __init__(self, database_name, table_name, quantity_field, thresholds, transaction):
+        initialise report and parent StockReport objects
+
+    execute(self): 'override'
+        execute report and return a row for each threshold
+
+    build_query(self): 'override'
+        return query with a 'COUNT' and 'SUM' of rows at or below each threshold
+    """
+
+    def __init__(self, database_name, table_name, quantity_field, thresholds, transaction=None):
+        """Constructor initialising LowStockCounts and parent StockReport objects.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database to connect to, also serves as path to database file
+        table_name: str
+            name of table to report on
+        quantity_field: str
+            name of integer field holding stock quantity
+        thresholds: list of int
+            quantities titles are counted at or below (e.g. [0, 5, 10], 0 counts titles out
+            of stock). Duplicates are ignored
+        transaction: Transaction (Default = None)
+            open transaction to read in
+        """
+        self.thresholds = sorted(set(thresholds))
+        super().__init__(database_name, table_name, quantity_field, transaction)
+
+    def execute(self):
+        """Execute report query and return one row for each threshold. Close Database Connection.
+
+        Return:
+        -------
+        List with header Tuple ('stock_at_most', 'titles', 'copies') followed by a row Tuple
+            for each threshold
+        Empty List - no thresholds were given
+        None - connection could not be made or query could not be executed
+        """
+        if not self.thresholds:
+            self.close_connection()
+            return []
+        counts = super().execute()
+        if counts is None:
+            return None
+        # single result row holds (titles, copies) for each threshold in turn
+        totals = counts[1]
+        return [("stock_at_most", "titles", "copies")] + [
+            (threshold, totals[2 * position], totals[2 * position + 1])
+            for position, threshold in enumerate(self.thresholds)]
+
+    def build_query(self):
+        """Return query with a conditional 'COUNT' (titles) and 'SUM' (copies) of rows with
+            quantity at or below each threshold, thresholds bound as parameters."""
+        query = self.cached_sql(
+            ("low stock", self.table_name, self.quantity_field, len(self.thresholds)),
+            lambda: ("SELECT " + ", ".join(
+                [f"COUNT(CASE WHEN {self.quantity_field} <= ? THEN 1 END), " +
+                 f"COALESCE(SUM(CASE WHEN {self.quantity_field} <= ? " +
+                 f"THEN {self.quantity_field} END), 0)"] * len(self.thresholds)) +
+                     f" FROM {self.table_name}"))
+        parameters = []
+        for threshold in self.thresholds:
+            parameters += [threshold, threshold]
+        return query, tuple(parameters)
@@ -0,0 +1,408 @@
+"""Module holding a per-database write queue serialising writes of the application through a
+    single writer thread. sqlite allows one writer at a time: writers on several connections
+    wait on each other's locks and fail with "database is locked" once their busy_timeout
+    runs out. Queued writes never compete for the write lock with each other, while reads are
+    made as before on any connection in parallel (WAL mode lets readers continue during a
+    write).
+
+The writer thread holds one long-lived connection (a private pool of size 1 bound to the
+thread with 'ConnectionPool.bind_to_thread()'). It takes every write request waiting in the
+queue and executes them in one 'Transaction' committed once (group commit), each request inside
+its own SAVEPOINT so a failed request is rolled back alone without undoing the other requests
+of the batch. A batch is closed once it holds 'max_batch' rows. With a 'commit_window' the
+writer waits up to that many seconds after the first request of a batch for more requests to
+arrive, trading that latency for one sync to disk per batch instead of one per request when
+rows are written continuously (receiving shifts, imports from several terminals). The caller of
+each request receives a 'WriteFuture' resolving to the value returned by the query's 'execute()':
+
+    future = WriteQueue.for_database(database_name).submit(
+        InsertData, database_name, table_name, [row], field_names)
+    if future.result():
+        new_id = future.query.new_row_id
+
+Module Usage:
+-------------
+Use of this module should be through 'WriteQueue.for_database(database_name)' which returns the
+single shared queue for a database (writer thread is started on first submit).
+'WriteQueue.configure(database_name, ...)' may be called before first use to change the
+batch size and commit window. Persistance Controllers accepting a 'transaction' ('InsertData',
+'UpdateData', 'BatchUpdateData', 'AdjustQuantity' and 'DeleteData') may be queued.
+
+Classes:
+--------
+WriteFuture:
+    'concurrent.futures.Future' of a queued write, also holding the executed Persistance
+    Controller in attribute 'query'
+
+WriteQueue:
+    Queue of write requests executed in group-committed batches by a single writer thread
+
+    Methods:
+    --------
+    __init__(self, database_name, max_batch, commit_window, pragma_profile):
+        initialise queue for 'database_name' (writer thread is started on first submit)
+
+    for_database(cls, database_name): 'classmethod'
+        return shared queue for 'database_name', creating queue on first call
+
+    configure(cls, database_name, **settings): 'classmethod'
+        create or replace shared queue for 'database_name' with desired settings
+
+    close_all_queues(cls): 'classmethod'
+        close every shared queue once queued writes are done (application shutdown)
+
+    submit(self, query_class, database_name, *arguments, **keyword_arguments):
+        queue write of Persistance Controller 'query_class' and return its 'WriteFuture'
+
+    close(self):
+        execute queued writes, stop writer thread and close its connection
+
+    statistics(self):
+        return dictionary of queue counters for monitoring and testing
+"""
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from Modules.persistance_layer import connection_pool
+from Modules.persistance_layer import persistence_classes_single_key
+
+
+class WriteFuture(Future):
+    """Future of a queued write resolving to the value returned by 'execute()' of its
+        Persistance Controller ('None' if the write could not be made or was not committed).
+
+    Attributes:
+    -----------
+    query: DataBaseQueryClass
+        executed Persistance Controller (None until executed), holding attributes set by its
+        'execute()' (for example 'new_row_id' of 'InsertData')
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.query = None
+
+
+# -------------------------------------------------------------------------------------------------
+class WriteQueue:
+    """Queue of write requests executed by a single writer thread on one long-lived connection,
+        requests waiting together being group-committed in one transaction.
+
+    Attributes:
+    -----------
+    database_name: str
+        name of database written to
+    max_batch: int
+        maximum number of rows (one per request, each row of an 'InsertData') committed
+        together in one transaction
+    commit_window: float
+        seconds writer waits after first request of a batch for more requests (0 commits the
+        requests already waiting)
+    pragma_profile: str
+        PRAGMA profile of writer connection ('ConnectionPool.PRAGMA_PROFILES')
+    connection_pool: connection_pool.ConnectionPool
+        private pool of one connection used by writer thread
+
+    Methods:
+    --------
+    __init__(self, database_name, max_batch, commit_window, pragma_profile):
+        initialise queue for 'database_name'
+
+    for_database(cls, database_name): 'classmethod'
+        return shared queue for 'database_name'
+
+    configure(cls, database_name, **settings): 'classmethod'
+        create or replace shared queue for 'database_name'
+
+    close_all_queues(cls): 'classmethod'
+        close every shared queue
+
+    submit(self, query_class, database_name, *arguments, **keyword_arguments):
+        queue write and return its 'WriteFuture'
+
+    close(self):
+        execute queued writes and stop writer thread
+
+    statistics(self):
+        return dictionary of queue counters
+    """
+    # Persistance Controllers that may be queued (accept a 'transaction' argument)
+    QUEUED_QUERY_CLASSES = (persistence_classes_single_key.InsertData,
+                            persistence_classes_single_key.UpdateData,
+                            persistence_classes_single_key.BatchUpdateData,
+                            persistence_classes_single_key.AdjustQuantity,
+                            persistence_classes_single_key.DeleteData)
+
+    # shared queues (one per database_name) and lock guarding their creation
+    _queues = {}
+    _queues_lock = threading.Lock()
+
+    def __init__(self, database_name, max_batch=100, commit_window=0.0, pragma_profile=None):
+        """Constructor initialising an empty queue, writer thread and its connection are only
+            started on first submit.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of the database to write to, also serves as path to database file
+        max_batch: int (Default = 100)
+            maximum number of rows committed together, counting one row per request and each
+            row of an 'InsertData' (must be at least 1, 1 commits every request on its own)
+        commit_window: float (Default = 0.0)
+            seconds to wait after first request of a batch for more requests, for example
+            0.005 for 5 milliseconds. 0 only adds requests already waiting
+        pragma_profile: str (Default = None)
+            PRAGMA profile of writer connection. None uses the profile of the shared
+            connection pool of the database
+        """
+        if max_batch < 1:
+            raise ValueError("WriteQueue max_batch must be at least 1")
+        if commit_window < 0:
+            raise ValueError("WriteQueue commit_window must not be negative")
+        shared_pool = connection_pool.ConnectionPool.for_database(database_name)
+        if pragma_profile is None:
+            pragma_profile = shared_pool.pragma_profile
+
+        self.database_name = database_name
+        self.max_batch = max_batch
+        self.commit_window = commit_window
+        self.pragma_profile = pragma_profile
+        self.connection_pool = connection_pool.ConnectionPool(
+            database_name, max_size=1, pragma_profile=pragma_profile,
+            cached_statements=shared_pool.cached_statements)
+
+        # (future, query_class, arguments, keyword_arguments, row_count) of waiting requests,
+        # None stops writer thread
+        self._requests = queue.Queue()
+        self._writer = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+        # usage counters returned by 'statistics()'
+        self._stats = {"requests": 0, "rows": 0, "batches": 0, "commits": 0,
+                       "failed_requests": 0, "failed_batches": 0, "largest_batch": 0}
+
+    @classmethod
+    def for_database(cls, database_name):
+        """Return shared queue for 'database_name', creating one with default settings if one
+            has not been created yet (or the last one was closed)."""
+        with cls._queues_lock:
+            write_queue = cls._queues.get(database_name)
+            if write_queue is None or write_queue._closed:
+                write_queue = cls(database_name)
+                cls._queues[database_name] = write_queue
+            return write_queue
+
+    @classmethod
+    def configure(cls, database_name, **settings):
+        """Create shared queue for 'database_name' with desired settings, replacing (and
+            closing once its queued writes are done) any existing queue.
+
+        Arguments:
+        ----------
+        database_name: str
+            name of database the shared queue is for
+        settings: keyword arguments
+            any of 'max_batch', 'commit_window' or 'pragma_profile' as in constructor
+
+        Return:
+        -------
+        WriteQueue - the shared queue for 'database_name'
+        """
+        for setting in settings:
+            if setting not in ("max_batch", "commit_window", "pragma_profile"):
+                raise ValueError(f"Unknown WriteQueue setting '{setting}'")
+        write_queue = cls(database_name, **settings)
+        with cls._queues_lock:
+            replaced = cls._queues.get(database_name)
+            cls._queues[database_name] = write_queue
+        if replaced is not None:
+            replaced.close()
+        return write_queue
+
+    @classmethod
+    def close_all_queues(cls):
+        """Close every shared queue once their queued writes are done (application shutdown)."""
+        with cls._queues_lock:
+            write_queues = list(cls._queues.values())
+            cls._queues.clear()
+        for write_queue in write_queues:
+            write_queue.close()
+
+    def submit(self, query_class, database_name, *arguments, **keyword_arguments):
+        """Queue a write made by Persistance Controller 'query_class', created with the given
+            arguments and the writer's transaction on the writer thread.
+
+        Arguments:
+        ----------
+        query_class: class
+            one of 'QUEUED_QUERY_CLASSES'
+        database_name: str
+            name of database written to (must be database of queue)
+        arguments, keyword_arguments:
+            remaining arguments of 'query_class' constructor (without 'transaction')
+
+        Return:
+        -------
+        WriteFuture - resolving to value returned by 'execute()' of the query once its batch
+        has been committed (None if the query failed or its batch could not be committed)
+
+        Exceptions:
+        -----------
+        ValueError:
+            raised if 'query_class' cannot be queued or 'database_name' is not database of queue
+        RuntimeError:
+            raised if queue has been closed
+        """
+        if query_class not in self.QUEUED_QUERY_CLASSES:
+            raise ValueError(f"{query_class.__name__} cannot be queued for the writer thread")
+        if database_name != self.database_name:
+            raise ValueError(f"Write to {database_name} queued for {self.database_name}")
+
+        row_count = 1
+        if query_class is persistence_classes_single_key.InsertData:
+            row_data_list = keyword_arguments.get(
+                "row_data_list", arguments[1] if len(arguments) > 1 else None)
+            row_count = max(len(row_data_list or ()), 1)
+
+        future = WriteFuture()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Write queue for {self.database_name} has been closed")
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, daemon=True,
+                                                name=f"writer-{self.database_name}")
+                self._writer.start()
+            self._stats["requests"] += 1
+            self._stats["rows"] += row_count
+            self._requests.put((future, query_class, arguments, keyword_arguments, row_count))
+        return future
+
+    def close(self):
+        """Execute writes already queued, stop writer thread and close its connection. Further
+            submits are refused."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            writer = self._writer
+            self._requests.put(None)
+        if writer is not None:
+            writer.join()
+        self.connection_pool.close()
+
+    def statistics(self):
+        """Return dictionary of queue counters together with number of waiting requests."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["waiting_requests"] = self._requests.qsize()
+        stats["max_batch"] = self.max_batch
+        stats["commit_window"] = self.commit_window
+        return stats
+
+    def _write_loop(self):
+        """Internal, body of writer thread. Waits for a request, then executes it together with
+            requests already waiting as one batch until stopped by None."""
+        connection_pool.ConnectionPool.bind_to_thread(self.connection_pool)
+        while True:
+            batch = self._next_batch()
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            if batch:
+                self._write_batch(batch)
+            if stop:
+                return
+
+    def _next_batch(self):
+        """Internal, wait for a request and return it with requests already waiting or
+            arriving within 'commit_window' seconds, until batch holds 'max_batch' rows. Stop
+            marker None ends a batch."""
+        batch = [self._requests.get()]
+        row_count = batch[0][4] if batch[0] is not None else 0
+        deadline = time.monotonic() + self.commit_window
+        while batch[-1] is not None and row_count < self.max_batch:
+            try:
+                wait = deadline - time.monotonic()
+                if wait > 0:
+                    batch.append(self._requests.get(timeout=wait))
+                else:
+                    batch.append(self._requests.get_nowait())
+            except queue.Empty:
+                break
+            if batch[-1] is not None:
+                row_count += batch[-1][4]
+        return batch
+
+    def _write_batch(self, batch):
+        """Internal, execute batch of requests in one transaction, each request in a savepoint
+            rolled back alone if its query fails, and resolve futures once committed."""
+        results = []
+        transaction = persistence_classes_single_key.Transaction(self.database_name)
+        try:
+            with transaction:
+                for future, query_class, arguments, keyword_arguments, _ in batch:
+                    if not future.set_running_or_notify_cancel():
+                        results.append((future, False, None))
+                        continue
+                    results.append(self._write_request(transaction, future, query_class,
+                                                       arguments, keyword_arguments))
+        except sqlite3.Error as database_error:
+            print(f"Error Log - write batch on Database {self.database_name} failed")
+            print(database_error)
+
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+            if transaction.committed:
+                self._stats["commits"] += 1
+            else:
+                self._stats["failed_batches"] += 1
+
+        for future, succeeded, outcome in results:
+            if future.cancelled():
+                continue
+            if not succeeded:
+                future.set_exception(outcome)
+            elif transaction.committed:
+                future.set_result(outcome)
+            else:
+                future.set_result(None)
+        # requests not reached before batch failed
+        for future, _, _, _, _ in batch[len(results):]:
+            if future.set_running_or_notify_cancel():
+                future.set_result(None)
+
+    def _write_request(self, transaction, future, query_class, arguments, keyword_arguments):
+        """Internal, create and execute one queued query in a savepoint of 'transaction'.
+
+        Return:
+        -------
+        tuple of (future, True, value returned by 'execute()') or (future, False, exception
+        raised by query)
+        """
+        if transaction.connection is None:
+            # transaction could not be opened, queries would only print the same error
+            return future, True, None
+
+        transaction.connection.execute("SAVEPOINT write_request")
+        try:
+            future.query = query_class(self.database_name, *arguments,
+                                       transaction=transaction, **keyword_arguments)
+            outcome = future.query.execute()
+            succeeded = True
+        except Exception as query_error:
+            outcome = query_error
+            succeeded = False
+
+        if not succeeded or transaction.rollback_only:
+            # undo this request only, remaining requests of batch are still committed
+            transaction.connection.execute("ROLLBACK TO write_request")
+            transaction.rollback_only = False
+            with self._lock:
+                self._stats["failed_requests"] += 1
+        transaction.connection.execute("RELEASE write_request")
+        return future, succeeded, outcome
@@ -14,13 +14,17 @@ BookStoreController
         initialise BookController object
 
     application_run() -> None
-        start application run
+        start application run, closing database session when user exits
 
 Components:
 -----------
 view_renderer: object
     instance controlling display of data, menus or information to user
 
+database_session: module
+    long-lived database connection shared by every query made while application runs,
+     closed (with all other Persistance Layer resources) when application ends
+
 entity_persistance_matcher_control: module
     contains classes to create a desired Entity matching user menu selection then
      matched to a Persistance Controller for database execution and data return
@@ -28,10 +32,13 @@ entity_persistance_matcher_control: module
     Requirements:
     -------------
     Desired user_action must be passed as string, being only one of:
-    'Create Default Table', 'Create Entity', 'Read Entity' or 'Search Entity' or
-     'Read All', 'Update Entity', 'Delete Entity'
+    'Create Default Table', 'Create Entity', 'Import Entities', 'Restock Entities',
+     'Read Entity' or 'Search Entity' or 'Read All', 'Text Search Entity', 'Browse Entity',
+     'Update Entity', 'Batch Update Entities', 'Adjust Stock Entity', 'Delete Entity',
+     'Bulk Delete Entities', 'Stock Report'
 """
 from Modules.business_logic import entity_persistance_matcher_control
+from Modules.persistance_layer import database_session
 
 class BookStoreController:
     """Application Main controller determining desired user_action that is then
@@ -46,6 +53,9 @@ class BookStoreController:
         name of table in above database
     - view_renderer: object
         instance controlling display of data, menus or information to user
+    - database_session: database_session.DatabaseSession
+        database session opened for application lifetime, used by every query made on the
+         application thread
     - entity_persistance_matcher_control: module
         classes using user menu selection (formatted to action string) for
          entity creation and database execution
@@ -61,17 +71,29 @@ class BookStoreController:
 
     application_run(self):
         start application run, printing main menu and passing matching user selection
-         to 'entity_persistance_matcher_control' component
+         to 'entity_persistance_matcher_control' component. Database session is closed when
+         run ends
+
+    run_main_menu(self):
+        display Main Menu and perform user selected actions until user exits
+
+    display_row_errors(self, header, row_errors):
+        display first rejected rows of an import or batch update
+
+    browse_pages(self, pager):
+        display pages from a pager, letting user move to next and previous pages
 
     Exceptions:
     -----------
     ValueError:
         User main menu input does not of valid Integer type
     """
+    # maximum number of rejected rows listed after a book import
+    ERROR_DISPLAY_LIMIT = 20
 
     def __init__(self, database_name, table_name, view_renderer):
-        """Initialise class with database and table names and view_render class
-            Check if desired table_name has been created.
+        """Initialise class with database and table names and view_render class, open database
+            session for application lifetime and check if desired table_name has been created.
 
         Arguments:
         ----------
@@ -85,6 +107,8 @@ class BookStoreController:
         self.database_name = database_name
         self.table_name = table_name
         self.view_renderer = view_renderer
+        # one connection kept open (page cache kept warm) for every action until user exits
+        self.database_session = database_session.DatabaseSession(database_name).open()
 
         # ensure table for book_clerk has been created and populated with fields
         self.create_default_table()
@@ -108,7 +132,16 @@ class BookStoreController:
 
 
     def application_run(self):
-        """Method used to run book application. Call is compulsory to start application."""
+        """Method used to run book application. Call is compulsory to start application.
+            Database session is closed when user exits (or run is interrupted)."""
+        try:
+            self.run_main_menu()
+        finally:
+            # commit queued writes and close every database connection
+            self.database_session.close()
+
+    def run_main_menu(self):
+        """Display Main Menu and perform actions selected by user until user selects 0."""
 
         # create and display application Main Title String
         self.view_renderer.display_title("BOOK STOCK MANAGER")
@@ -117,7 +150,15 @@ class BookStoreController:
             # construct main menu string
             main_menu = ("\nPlease Select an option number below:\n" +
                          "1 - Enter Book\n2 - Update Book\n3 - Delete Book" +
-                         "\n4 - Search Book\n5 - View All Books\n0 - Exit")
+                         "\n4 - Search Book\n5 - View All Books" +
+                         "\n6 - Search Book Titles and Authors" +
+                         "\n7 - Browse Books (page by page)" +
+                         "\n8 - Import Books from CSV or JSON Lines File" +
+                         "\n9 - Adjust Book Stock (sale or delivery)" +
+                         "\n10 - Batch Update Books from CSV or JSON Lines File" +
+                         "\n11 - Bulk Delete Books (from file or by field value)" +
+                         "\n12 - Restock Books from CSV or JSON Lines Feed" +
+                         "\n13 - Stock Report (totals, stock per author, low stock)\n0 - Exit")
             # display menu to user
             self.view_renderer.display_sub_title("Main Menu")
             self.view_renderer.display_formatted_string(main_menu)
@@ -128,9 +169,9 @@ class BookStoreController:
                     self.view_renderer.input_request("\nSelected Option: "))
 
                 # check user_input is within option range
-                if user_input < 0 or user_input > 5:
+                if user_input < 0 or user_input > 13:
                     self.view_renderer.display_formatted_string(
-                        "\nPlease enter an option number between 0 and 5")
+                        "\nPlease enter an option number between 0 and 13")
                     continue
 
                 # determine if user wishes to end application
@@ -142,16 +183,16 @@ class BookStoreController:
                 elif user_input == 1:
                     self.view_renderer.display_title("Create New Book")
                     # create Entity request for Book Creation and perform execution against
-                    #  database. Returns boolean for affected rows greater than 0
-                    successful_creation = entity_persistance_matcher_control.\
+                    #  database. Returns id of new book or False if no row was added
+                    new_book_id = entity_persistance_matcher_control.\
                         EntityPersistanceSingleKeyControl(
                             self.database_name, self.table_name, "Create Entity").\
                         create_and_execute_query()
 
                     # confirm to user if new book was added to database
-                    if successful_creation:
+                    if new_book_id:
                         self.view_renderer.display_sub_title(
-                            "New Book Added Successfully")
+                            f"New Book Added Successfully with id {new_book_id}")
                     else:
                         self.view_renderer.display_sub_title(
                             "New Book was not created")
@@ -197,14 +238,15 @@ class BookStoreController:
                     self.view_renderer.display_title("Book Search Menu")
                     # create Entity request for individual Book Search and perform execution against
                     #  database.
-                    #  Returns: Empty list for no match or list with field names and matching row(s)
+                    #  Returns: None or empty list for no match, or list with field names and
+                    #  matching row(s)
                     search_books = entity_persistance_matcher_control.\
                         EntityPersistanceSingleKeyControl(
                             self.database_name, self.table_name, "Search Entity").\
                         create_and_execute_query()
 
                     # display matching book row(s) data or message for no match found
-                    if len(search_books) == 0:
+                    if not search_books:
                         self.view_renderer.display_formatted_string(
                             "No Matching Books found")
                     else:
@@ -217,21 +259,246 @@ class BookStoreController:
                     self.view_renderer.display_title("All Books")
                     # create Entity request for All Books retrieval and perform execution against
                     #  database.
-                    #  Returns: Empty list for no books or list with field names and all rows
+                    #  Returns: generator of field names followed by all rows, streamed from
+                    #  database as they are displayed (yields nothing for no books)
                     all_books = entity_persistance_matcher_control.\
                         EntityPersistanceSingleKeyControl(
                             self.database_name, self.table_name, "Read All").\
                         create_and_execute_query()
 
                     # display data in all rows with field names or message for empty table
-                    if len(all_books) == 0:
+                    if all_books is None or \
+                            self.view_renderer.display_table_stream(all_books) == 0:
                         self.view_renderer.display_formatted_string(
                             "No Books in Stock")
+
+                # search words or partial words in book titles and authors
+                elif user_input == 6:
+                    self.view_renderer.display_title("Book Text Search Menu")
+                    # create Entity request for full-text Book Search and perform execution
+                    #  against database.
+                    #  Returns: Empty list for no match or list with field names and best ranked
+                    #  matching row(s)
+                    text_search_books = entity_persistance_matcher_control.\
+                        EntityPersistanceSingleKeyControl(
+                            self.database_name, self.table_name, "Text Search Entity").\
+                        create_and_execute_query()
+
+                    # display matching book row(s) data or message for no match found
+                    if not text_search_books:
+                        self.view_renderer.display_formatted_string(
+                            "No Matching Books found")
+                    else:
+                        self.view_renderer.display_sub_title("Search Results")
+                        self.view_renderer.display_table_with_header(
+                            text_search_books)
+
+                # view all books, or books matching a search, one page at a time
+                elif user_input == 7:
+                    self.view_renderer.display_title("Browse Books")
+                    # create Entity request for Book Browsing. Returns pager reading each page
+                    #  from database as user moves between pages
+                    book_pager = entity_persistance_matcher_control.\
+                        EntityPersistanceSingleKeyControl(
+                            self.database_name, self.table_name, "Browse Entity").\
+                        create_and_execute_query()
+
+                    if book_pager is not None:
+                        self.browse_pages(book_pager)
+
+                # add books read from a supplier file
+                elif user_input == 8:
+                    self.view_renderer.display_title("Import Books")
+                    # create Entity request for Book Import and perform execution against
+                    #  database. Returns number of books added and list of (line, reason)
+                    #  for rejected rows, or None if import could not be performed
+                    import_result = entity_persistance_matcher_control.\
+                        EntityPersistanceSingleKeyControl(
+                            self.database_name, self.table_name, "Import Entities").\
+                        create_and_execute_query()
+
+                    if import_result is None:
+                        self.view_renderer.display_sub_title("Books could not be imported")
+                    else:
+                        imported_count, row_errors = import_result
+                        self.view_renderer.display_sub_title(
+                            f"{imported_count} Books Imported, {len(row_errors)} Rows Rejected")
+                        self.display_row_errors(("line", "reason"), row_errors)
+
+                # add to or subtract from stock of a book
+                elif user_input == 9:
+                    self.view_renderer.display_title("Book Stock Adjustment")
+                    # create Entity request for Stock Adjustment and perform execution against
+                    #  database. Returns new stock quantity or False if not adjusted
+                    new_quantity = entity_persistance_matcher_control.\
+                        EntityPersistanceSingleKeyControl(
+                            self.database_name, self.table_name, "Adjust Stock Entity").\
+                        create_and_execute_query()
+
+                    # new quantity may be 0, compare against False and None explicitly
+                    if new_quantity is None or new_quantity is False:
+                        self.view_renderer.display_sub_title(
+                            "Book stock was not adjusted (book not found or not enough stock)")
+                    else:
+                        self.view_renderer.display_sub_title(
+                            f"Book stock adjusted, quantity is now {new_quantity}")
+
+                # apply changes to many books read from a reconciliation file
+                elif user_input == 10:
+                    self.view_renderer.display_title("Batch Update Books")
+                    # create Entity request for Batch Update and perform execution against
+                    #  database. Returns number of books updated and list of (row, reason)
+                    #  for changes not applied, or None if no changes could be made
+                    update_result = entity_persistance_matcher_control.\
+                        EntityPersistanceSingleKeyControl(
+                            self.database_name, self.table_name, "Batch Update Entities").\
+                        create_and_execute_query()
+
+                    if update_result is None:
+                        self.view_renderer.display_sub_title("Books could not be updated")
+                    else:
+                        updated_count, row_errors = update_result
+                        self.view_renderer.display_sub_title(
+                            f"{updated_count} Books Updated, {len(row_errors)} Changes Rejected")
+                        self.display_row_errors(("row", "reason"), row_errors)
+
+                # delete many books, listed in a file or matching a field value
+                elif user_input == 11:
+                    self.view_renderer.display_title("Bulk Delete Books")
+                    # create Entity request for Bulk Deletion. Returns generator deleting books
+                    #  chunk by chunk (yielding books deleted so far) and list of rejected file
+                    #  rows, or None if deletion was cancelled
+                    delete_result = entity_persistance_matcher_control.\
+                        EntityPersistanceSingleKeyControl(
+                            self.database_name, self.table_name, "Bulk Delete Entities").\
+                        create_and_execute_query()
+
+                    if delete_result is None:
+                        self.view_renderer.display_sub_title("No Books were deleted")
+                    else:
+                        delete_progress, row_errors = delete_result
+                        deleted_count = 0
+                        # report progress after each committed chunk
+                        for deleted_count in delete_progress:
+                            self.view_renderer.display_formatted_string(
+                                f"{deleted_count} books deleted...")
+                        self.view_renderer.display_sub_title(
+                            f"{deleted_count} Books Deleted, {len(row_errors)} Rows Rejected")
+                        self.display_row_errors(("line", "reason"), row_errors)
+
+                # add stock from a supplier feed, creating books not yet in table
+                elif user_input == 12:
+                    self.view_renderer.display_title("Restock Books")
+                    # create Entity request for Restock and perform execution against
+                    #  database. Returns number of books added or restocked and list of
+                    #  (line, reason) for rejected rows, or None if restock could not be performed
+                    restock_result = entity_persistance_matcher_control.\
+                        EntityPersistanceSingleKeyControl(
+                            self.database_name, self.table_name, "Restock Entities").\
+                        create_and_execute_query()
+
+                    if restock_result is None:
+                        self.view_renderer.display_sub_title("Books could not be restocked")
+                    else:
+                        restocked_count, row_errors = restock_result
+                        self.view_renderer.display_sub_title(
+                            f"{restocked_count} Books Added or Restocked, " +
+                            f"{len(row_errors)} Rows Rejected")
+                        self.display_row_errors(("line", "reason"), row_errors)
+
+                # report stock totals, stock held per author and low stock counts
+                elif user_input == 13:
+                    self.view_renderer.display_title("Stock Report")
+                    # create Entity request for Stock Report and perform execution against
+                    #  database. Returns tuple of (totals, author totals, low stock counts)
+                    #  each as list with field names and rows, or None if report failed
+                    stock_report = entity_persistance_matcher_control.\
+                        EntityPersistanceSingleKeyControl(
+                            self.database_name, self.table_name, "Stock Report").\
+                        create_and_execute_query()
+
+                    if stock_report is None:
+                        self.view_renderer.display_sub_title("Stock report could not be created")
                     else:
-                        self.view_renderer.display_table_with_header(all_books)
+                        stock_totals, author_totals, low_stock_counts = stock_report
+                        self.view_renderer.display_sub_title("Total Stock")
+                        self.view_renderer.display_table_with_header(stock_totals)
+                        self.view_renderer.display_sub_title("Authors with Most Stock")
+                        if author_totals:
+                            self.view_renderer.display_table_with_header(author_totals)
+                        else:
+                            self.view_renderer.display_formatted_string("No Books in Stock")
+                        self.view_renderer.display_sub_title("Low Stock (books at or below level)")
+                        self.view_renderer.display_table_with_header(low_stock_counts)
 
             # user has given empty input, character or decimal number
             except ValueError:
                 self.view_renderer.display_formatted_string(
                     "\nPlease enter a valid, non-decimal number")
                 continue
+
+
+    def display_row_errors(self, header, row_errors):
+        """Display first 'ERROR_DISPLAY_LIMIT' rejected rows of a bulk action (a large file may
+            have many) and a count of any rows not shown.
+
+        Arguments:
+        ----------
+        header: tuple
+            names of the two columns of each row error
+        row_errors: list of tuples
+            (row reference, reason) for each rejected row
+        """
+        if not row_errors:
+            return
+        self.view_renderer.display_table_with_header(
+            [header] + row_errors[:self.ERROR_DISPLAY_LIMIT])
+        if len(row_errors) > self.ERROR_DISPLAY_LIMIT:
+            self.view_renderer.display_formatted_string(
+                f"... and {len(row_errors) - self.ERROR_DISPLAY_LIMIT} more rejected rows")
+
+    def browse_pages(self, pager):
+        """Display first page from 'pager' and let user move to next or previous pages until user
+            returns to Main Menu, or until a page can no longer be read.
+
+        Arguments:
+        ----------
+        pager: object
+            pager with 'first_page()', 'next_page()' and 'previous_page()' methods returning a
+            list of field names and rows (None or empty when there is no such page), and with
+            attributes 'page_number', 'has_next' and 'has_previous'
+        """
+        page = pager.first_page()
+        if not page:
+            self.view_renderer.display_formatted_string("No Matching Books found")
+            return
+
+        while True:
+            self.view_renderer.display_sub_title(f"Page {pager.page_number}")
+            self.view_renderer.display_table_with_header(page)
+
+            # build navigation options available from current page
+            options = []
+            if pager.has_next:
+                options.append("n - Next Page")
+            if pager.has_previous:
+                options.append("p - Previous Page")
+            options.append("0 - Main Menu")
+            self.view_renderer.display_formatted_string("\n" + "\n".join(options))
+
+            while True:
+                user_option = self.view_renderer.input_request("\nSelected Option: ").lower()
+                if user_option == "0":
+                    return
+                if user_option == "n" and pager.has_next:
+                    page = pager.next_page()
+                    break
+                if user_option == "p" and pager.has_previous:
+                    page = pager.previous_page()
+                    break
+                self.view_renderer.display_formatted_string("\nPlease enter a listed option")
+
+            # page may be gone when books were deleted since previous page was read
+            if not page:
+                self.view_renderer.display_formatted_string("No more books to display")
+                return
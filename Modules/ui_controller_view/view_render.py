@@ -21,6 +21,9 @@ ConsoleViewRender:
 
     display_table_with_header(self, data_list ) -> None
         use 'tabulate' module to display data_list in tabular form
+
+    display_table_stream(self, row_iterator, chunk_size) -> int
+        display header and rows from an iterator in tabular blocks of 'chunk_size' rows
 """
 
 from tabulate import tabulate
@@ -45,6 +48,9 @@ class ConsoleViewRender:
     display_table_with_header(self, data_list ) -> None
         use 'tabulate' module to display data_list in tabular form
 
+    display_table_stream(self, row_iterator, chunk_size) -> int
+        display header and rows from an iterator in tabular blocks of 'chunk_size' rows
+
     Module Requirements:
     --------------------
     tabulate - printing program data in tabular form
@@ -74,3 +80,25 @@ class ConsoleViewRender:
     def display_table_with_header(self, data_list):
         """print data-list in tabular form"""
         print(tabulate(data_list, headers = "firstrow", tablefmt = "grid"))
+
+
+    def display_table_stream(self, row_iterator, chunk_size=50):
+        """print rows from 'row_iterator' (header tuple first) in tabular blocks of 'chunk_size'
+            rows, each with header. Only one block is held in memory at a time. Return number
+            of rows printed (0 if iterator was empty)"""
+        header = next(row_iterator, None)
+        if header is None:
+            return 0
+
+        row_count = 0
+        chunk = []
+        for row in row_iterator:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                print(tabulate(chunk, headers = header, tablefmt = "grid"))
+                row_count += len(chunk)
+                chunk = []
+        if chunk:
+            print(tabulate(chunk, headers = header, tablefmt = "grid"))
+            row_count += len(chunk)
+        return row_count
@@ -105,10 +105,6 @@ from Modules.business_logic import entity_persistance_matcher_control
 # table_reader = persistence_classes_single_key.ReadData("db", "books", ["id", "qty", "title", "author"])
 # print(table_reader.execute())
 
-# 7) Return Last id value in row
-# last_row = persistence_classes_single_key.ReturnLastId("db", "books", "id")
-# print(last_row.execute())
-
 
 ###############################################################################
 # INDEPENDANT TESTING FOR EntityPersistanceSingleKeyControl Class
@@ -18,7 +18,8 @@ Module Summary:
 ---------------
 
 - book_stock_management_system:
-    houses database name, table name, desired Application Controller and View Renderer instances.
+    houses database name, table name, database PRAGMA profile, group commit settings, desired
+     Application Controller and View Renderer instances.
      Calls the Applicaton Controller application_run() method to start application
 - Modulues.ui_controller__view:
     Main Application Controller and View Renderer modules
@@ -52,10 +53,25 @@ be Integer (set in Modules.busines_logic.book.FieldControl class)
 from Modules.ui_controller_view import book_stock_application_controller
 # View Renderer (MVC - View)
 from Modules.ui_controller_view import view_render
+# Database connection pool and writer thread queue (Persistance Layer)
+from Modules.persistance_layer import connection_pool
+from Modules.persistance_layer import write_queue
 
 # set preferred database_name, table_name
 DATABASE_NAME = "ebookstore"
 TABLE_NAME = "books"
+# set preferred database PRAGMA profile: "durable", "balanced" or "bulk-load"
+# (trade-offs documented in Modules.persistance_layer.connection_pool)
+DATABASE_PROFILE = "balanced"
+connection_pool.ConnectionPool.configure(DATABASE_NAME, pragma_profile=DATABASE_PROFILE)
+# optional group commit of queued writes: seconds the writer thread waits for more writes to
+# commit together (0.0 commits each write once it arrives, e.g. 0.005 during receiving shifts)
+# and most rows committed together (trade-offs documented in Modules.persistance_layer.write_queue)
+GROUP_COMMIT_WINDOW = 0.0
+GROUP_COMMIT_ROWS = 100
+write_queue.WriteQueue.configure(DATABASE_NAME, commit_window=GROUP_COMMIT_WINDOW,
+                                 max_batch=GROUP_COMMIT_ROWS)
+
 # Set Preferred Application controller and View Renderer for application usage
 VIEW_RENDERER = view_render.ConsoleViewRender()
 APPLICATION_CONTROLLER = book_stock_application_controller.BookStoreController(
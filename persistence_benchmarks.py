@@ -0,0 +1,615 @@
+"""Benchmarks for the Persistance Layer, run from the project directory as:
+
+    python persistence_benchmarks.py
+
+Each benchmark creates its own temporary database (the application 'ebookstore' database is
+never touched), performs a fixed workload through the Persistance Controllers in
+'Modules.persistance_layer' and prints the elapsed time and throughput.
+
+Classes:
+--------
+PersistenceBenchmark:
+    Base class creating a temporary 'books' table and timing a workload
+
+    Methods:
+    --------
+    __init__(self, row_count):
+        initialise benchmark with number of rows used by the workload
+
+    run(self):
+        create temporary database, run 'workload()' and print results
+
+    workload(self, database_name): 'override'
+        operations to be timed. Must be overridden by child class
+
+PragmaProfileBenchmark:
+    Compare single-row insert throughput (one commit per row) of sqlite defaults against each
+    'ConnectionPool.PRAGMA_PROFILES' profile
+
+FieldSearchBenchmark:
+    Time ReadData equality searches on a non-key field with and without the secondary index
+    created from 'FieldControl.index_list'
+
+TransactionBenchmark:
+    Compare a restock of single-row updates committed one by one against one 'Transaction'
+
+BatchUpdateBenchmark:
+    Time 'BatchUpdateData' stock changes to many rows of a loaded table
+
+BulkImportBenchmark:
+    Time import of a generated CSV file with 'BookImport' and 'BulkInsertData'
+
+RowCacheBenchmark:
+    Time repeated ReadData lookups of books by primary_key with and without 'RowCache'
+
+QueryCacheBenchmark:
+    Time repeated identical author searches with and without 'QueryCache', with a write
+    between every 'write_every' searches
+
+AsyncSearchBenchmark:
+    Compare unindexed searches run one after another against the same searches awaited together
+    through 'async_persistence.AsyncReadData'
+
+WriteQueueBenchmark:
+    Compare stock adjustments from several threads made directly on pooled connections against
+    the same adjustments submitted to the single writer thread of 'write_queue.WriteQueue'
+
+GroupCommitBenchmark:
+    Compare single-row inserts from receiving terminals committed one by one against inserts
+    group-committed by 'WriteQueue' with and without a commit window
+
+StatementCacheBenchmark:
+    Time ReadData lookups by primary_key with the sqlite3 compiled statement cache of pooled
+    connections turned off or at its configured size
+
+RowFactoryBenchmark:
+    Time reading every book of a table as tuples, named tuples or '__slots__' Book records
+    ('FieldControl.record_class()') selected with 'row_factory' of ReadData
+
+StockReportBenchmark:
+    Compare stock totals, stock per author and low stock counts computed in Python from every
+    row read against the same report aggregated by sqlite ('stock_reports')
+
+LowStockSearchBenchmark:
+    Time sorted, limited 'qty <' searches of a mostly well stocked table without an index on
+    'qty' and with the partial index of 'FieldControl.partial_index_list'
+"""
+import asyncio
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from Modules.business_logic import book
+from Modules.persistance_layer import async_persistence
+from Modules.persistance_layer import connection_pool
+from Modules.persistance_layer import persistence_classes_single_key
+from Modules.persistance_layer import query_cache
+from Modules.persistance_layer import row_cache
+from Modules.persistance_layer import stock_reports
+from Modules.persistance_layer import write_queue
+
+
+class PersistenceBenchmark:
+    """Base class creating a temporary 'books' table and timing a workload.
+
+    Attributes:
+    -----------
+    row_count: int
+        number of rows used by the workload
+    pragma_profile: str
+        PRAGMA profile used for the temporary database connections (None for sqlite defaults)
+    """
+    name = "Persistence Benchmark"
+    # fields indexed when temporary table is created (none by default)
+    index_list = None
+
+    def __init__(self, row_count, pragma_profile="balanced"):
+        """Initialise benchmark with number of rows used by the workload and PRAGMA profile."""
+        self.row_count = row_count
+        self.pragma_profile = pragma_profile
+
+    def run(self):
+        """Create temporary database with 'books' table, run 'workload()' and print results.
+
+        Return:
+        -------
+        elapsed time in seconds
+        """
+        directory = tempfile.mkdtemp(prefix="book_benchmark_")
+        database_name = os.path.join(directory, "benchmark_books")
+        try:
+            connection_pool.ConnectionPool.configure(
+                database_name, pragma_profile=self.pragma_profile)
+            persistence_classes_single_key.CreateTableSingleKey(
+                database_name, "books", "id", ["qty"], ["author", "title"],
+                index_list=self.index_list).execute()
+            self.prepare(database_name)
+
+            start = time.perf_counter()
+            self.workload(database_name)
+            elapsed = time.perf_counter() - start
+
+            print(f"{self.name:<45} {elapsed:8.3f}s {self.row_count / elapsed:12.0f} ops/s")
+            return elapsed
+        finally:
+            row_cache.RowCache.for_database(database_name).close()
+            query_cache.QueryCache.for_database(database_name).close()
+            async_persistence.AsyncPersistenceExecutor.for_database(database_name).close()
+            write_queue.WriteQueue.for_database(database_name).close()
+            connection_pool.ConnectionPool.for_database(database_name).close()
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def prepare(self, database_name):
+        """Untimed set up run before 'workload()' (for example loading rows). May be overridden."""
+
+    def workload(self, database_name):
+        """Operations to be timed. Must be overridden by child class."""
+
+    def load_rows(self, database_name, count, chunk_size=10000):
+        """Untimed helper loading 'count' generated rows in chunked multi-row inserts."""
+        for start in range(1, count + 1, chunk_size):
+            persistence_classes_single_key.InsertData(
+                database_name, "books",
+                self.sample_rows(min(chunk_size, count - start + 1), start)).execute()
+
+    def sample_rows(self, count, start=1):
+        """Return 'count' generated (id, qty, author, title) book rows."""
+        return [(book_id, book_id % 50, f"Author {book_id % 1000}", f"Title {book_id}")
+                for book_id in range(start, start + count)]
+
+
+# -------------------------------------------------------------------------------------------------
+class PragmaProfileBenchmark(PersistenceBenchmark):
+    """Single-row InsertData, one commit per row, under a PRAGMA profile."""
+
+    def __init__(self, row_count, pragma_profile):
+        super().__init__(row_count, pragma_profile)
+        self.name = f"insert 1 row/commit, profile={pragma_profile}"
+
+    def workload(self, database_name):
+        for row in self.sample_rows(self.row_count):
+            persistence_classes_single_key.InsertData(database_name, "books", [row]).execute()
+
+
+# -------------------------------------------------------------------------------------------------
+class FieldSearchBenchmark(PersistenceBenchmark):
+    """'author' equality searches on a table of 'table_rows' books, with or without the indexes
+        declared in 'FieldControl.index_list'."""
+
+    def __init__(self, row_count, table_rows, indexed):
+        super().__init__(row_count)
+        self.table_rows = table_rows
+        self.index_list = book.FieldControl().index_list if indexed else None
+        self.name = (f"author search on {table_rows} rows, " +
+                     ("indexed" if indexed else "no index"))
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, self.table_rows)
+        # confirm query plan used by the searches below
+        connection = sqlite3.connect(database_name)
+        plan = connection.execute("EXPLAIN QUERY PLAN SELECT * FROM books " +
+                                  "WHERE author = ?", ("Author 1",)).fetchall()
+        connection.close()
+        print(f"  plan: {plan[0][-1]}")
+
+    def workload(self, database_name):
+        for count in range(self.row_count):
+            persistence_classes_single_key.ReadData(
+                database_name, "books", ["*"], ["author"], [f"Author {count % 1000}"]).execute()
+
+
+# -------------------------------------------------------------------------------------------------
+class TransactionBenchmark(PersistenceBenchmark):
+    """'row_count' single-row UpdateData operations (a restock), each committed on its own or
+        all joined to one 'Transaction' (single commit), under the 'durable' profile."""
+
+    def __init__(self, row_count, unit_of_work):
+        super().__init__(row_count, "durable")
+        self.unit_of_work = unit_of_work
+        self.name = ("restock updates, " +
+                     ("one Transaction" if unit_of_work else "commit per update"))
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, self.row_count)
+
+    def workload(self, database_name):
+        if not self.unit_of_work:
+            for book_id in range(1, self.row_count + 1):
+                persistence_classes_single_key.UpdateData(
+                    database_name, "books", ["qty", "id"], (100, book_id)).execute()
+            return
+        with persistence_classes_single_key.Transaction(database_name) as transaction:
+            for book_id in range(1, self.row_count + 1):
+                persistence_classes_single_key.UpdateData(
+                    database_name, "books", ["qty", "id"], (100, book_id), transaction).execute()
+
+
+# -------------------------------------------------------------------------------------------------
+class BatchUpdateBenchmark(PersistenceBenchmark):
+    """'row_count' stock changes applied with 'BatchUpdateData' to a table of 'table_rows' books
+        (one transaction, one executemany per group of fields changed)."""
+
+    def __init__(self, row_count, table_rows):
+        super().__init__(row_count)
+        self.table_rows = table_rows
+        self.index_list = book.FieldControl().index_list
+        self.name = f"batch update {row_count} of {table_rows} rows"
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, self.table_rows)
+
+    def workload(self, database_name):
+        step = self.table_rows // self.row_count
+        changes = ((book_id, {"qty": book_id % 30})
+                   for book_id in range(self.table_rows, 0, -step))
+        persistence_classes_single_key.BatchUpdateData(
+            database_name, "books", "id", changes).execute()
+
+
+# -------------------------------------------------------------------------------------------------
+class BulkImportBenchmark(PersistenceBenchmark):
+    """'BookImport' of a generated CSV file through 'BulkInsertData' into an indexed table with
+        a full-text index, as performed by the 'Import Books' menu option."""
+    name = "bulk CSV import (indexed + full-text)"
+
+    def __init__(self, row_count):
+        super().__init__(row_count)
+        self.index_list = book.FieldControl().index_list
+
+    def prepare(self, database_name):
+        persistence_classes_single_key.CreateFullTextIndex(
+            database_name, "books", "id", book.FieldControl().full_text_list).execute()
+        self.csv_path = os.path.join(os.path.dirname(database_name), "catalog.csv")
+        with open(self.csv_path, "w", newline="", encoding="utf-8") as csv_file:
+            csv_file.write("title,author,qty\n")
+            for _, qty, author, title in self.sample_rows(self.row_count):
+                csv_file.write(f"{title},{author},{qty}\n")
+
+    def workload(self, database_name):
+        book_import = book.BookImport(self.csv_path)
+        persistence_classes_single_key.BulkInsertData(
+            database_name, "books", book_import.read_rows(), book_import.field_names,
+            book_import.chunk_size).execute()
+
+
+# -------------------------------------------------------------------------------------------------
+class RowCacheBenchmark(PersistenceBenchmark):
+    """'row_count' ReadData lookups by primary_key spread over 100 hot books of a table of
+        'table_rows' books, served through the row cache or always read from the database."""
+
+    def __init__(self, row_count, table_rows, cached):
+        super().__init__(row_count)
+        self.table_rows = table_rows
+        self.cached = cached
+        self.name = "id lookups, " + ("row cache" if cached else "no row cache")
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, self.table_rows)
+        row_cache.RowCache.configure(database_name, enabled=self.cached)
+
+    def workload(self, database_name):
+        fields = book.FieldControl().all_field_names
+        for count in range(self.row_count):
+            persistence_classes_single_key.ReadData(
+                database_name, "books", fields, ["id"], (count % 100 + 1,)).execute()
+
+
+# -------------------------------------------------------------------------------------------------
+class QueryCacheBenchmark(PersistenceBenchmark):
+    """'row_count' author searches over 20 authors on an indexed table of 'table_rows' books,
+        served through the query cache or always executed. A stock update every 'write_every'
+        searches makes cached results of the table stale."""
+
+    def __init__(self, row_count, table_rows, cached, write_every=None):
+        super().__init__(row_count)
+        self.table_rows = table_rows
+        self.cached = cached
+        self.write_every = write_every
+        self.index_list = book.FieldControl().index_list
+        self.name = ("author searches, " + ("query cache" if cached else "no query cache") +
+                     (f", write every {write_every}" if write_every else ""))
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, self.table_rows)
+        query_cache.QueryCache.configure(database_name, enabled=self.cached)
+
+    def workload(self, database_name):
+        fields = book.FieldControl().all_field_names
+        for count in range(self.row_count):
+            persistence_classes_single_key.ReadData(
+                database_name, "books", fields, ["author"], [f"Author {count % 20}"]).execute()
+            if self.write_every and count % self.write_every == 0:
+                persistence_classes_single_key.UpdateData(
+                    database_name, "books", ["qty", "id"], (count % 50, count + 1)).execute()
+
+
+# -------------------------------------------------------------------------------------------------
+class AsyncSearchBenchmark(PersistenceBenchmark):
+    """'row_count' title searches (full scans, caches disabled) on a table of 'table_rows'
+        books, run one after another with 'ReadData' or awaited together with 'AsyncReadData'
+        on 'max_workers' worker threads."""
+
+    def __init__(self, row_count, table_rows, max_workers=None):
+        super().__init__(row_count)
+        self.table_rows = table_rows
+        self.max_workers = max_workers
+        self.name = ("title scans, " + (f"async, {max_workers} workers" if max_workers
+                                        else "sequential"))
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, self.table_rows)
+        query_cache.QueryCache.configure(database_name, enabled=False)
+        if self.max_workers:
+            async_persistence.AsyncPersistenceExecutor.configure(
+                database_name, max_workers=self.max_workers)
+
+    def workload(self, database_name):
+        titles = [f"Title {count * 7 % self.table_rows}" for count in range(self.row_count)]
+        if not self.max_workers:
+            for title in titles:
+                persistence_classes_single_key.ReadData(
+                    database_name, "books", ["id"], ["title"], [title]).execute()
+            return
+
+        async def search_all():
+            await asyncio.gather(*(async_persistence.AsyncReadData(
+                database_name, "books", ["id"], ["title"], [title]).execute()
+                for title in titles))
+        asyncio.run(search_all())
+
+
+# -------------------------------------------------------------------------------------------------
+class WriteQueueBenchmark(PersistenceBenchmark):
+    """'row_count' AdjustQuantity stock changes shared between 'thread_count' threads under the
+        'durable' profile, each executed and committed directly on a pooled connection or
+        submitted to the write queue and waited for. Failed changes are counted."""
+
+    def __init__(self, row_count, thread_count, queued):
+        super().__init__(row_count, "durable")
+        self.thread_count = thread_count
+        self.queued = queued
+        self.failures = 0
+        self.name = (f"{thread_count} threads adjusting stock, " +
+                     ("write queue" if queued else "direct"))
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, 100)
+        connection_pool.ConnectionPool.configure(database_name, max_size=self.thread_count)
+
+    def workload(self, database_name):
+        adjust = persistence_classes_single_key.AdjustQuantity
+        writer = write_queue.WriteQueue.for_database(database_name)
+        lock = threading.Lock()
+
+        def adjust_stock(thread_number):
+            failures = 0
+            for count in range(thread_number, self.row_count, self.thread_count):
+                arguments = ("books", "qty", "id", count % 100 + 1, 1, 0, 10 ** 9)
+                if self.queued:
+                    result = writer.submit(adjust, database_name, *arguments).result()
+                else:
+                    result = adjust(database_name, *arguments).execute()
+                if not result:
+                    failures += 1
+            with lock:
+                self.failures += failures
+
+        threads = [threading.Thread(target=adjust_stock, args=(thread_number,))
+                   for thread_number in range(self.thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"  failed changes: {self.failures}")
+
+
+# -------------------------------------------------------------------------------------------------
+class GroupCommitBenchmark(PersistenceBenchmark):
+    """'row_count' single-row InsertData arriving from 'thread_count' receiving terminals, each
+        scanning a book every 'interval' seconds, under the 'durable' profile. Rows are inserted
+        and committed one by one ('commit_window' None) or submitted to the write queue, which
+        group-commits up to 'max_batch' rows arriving within 'commit_window' seconds, with each
+        terminal checking the results of its rows at the end of the shift."""
+
+    def __init__(self, row_count, thread_count, interval, commit_window=None, max_batch=500):
+        super().__init__(row_count, "durable")
+        self.thread_count = thread_count
+        self.interval = interval
+        self.commit_window = commit_window
+        self.max_batch = max_batch
+        self.commits = row_count
+        if commit_window is None:
+            self.name = f"{thread_count} terminals inserting, commit per row"
+        else:
+            self.name = (f"{thread_count} terminals inserting, group commit " +
+                         f"{commit_window * 1000:g}ms")
+
+    def prepare(self, database_name):
+        connection_pool.ConnectionPool.configure(database_name, max_size=self.thread_count)
+        if self.commit_window is not None:
+            write_queue.WriteQueue.configure(database_name, commit_window=self.commit_window,
+                                             max_batch=self.max_batch)
+
+    def workload(self, database_name):
+        insert = persistence_classes_single_key.InsertData
+        writer = write_queue.WriteQueue.for_database(database_name)
+        rows = self.sample_rows(self.row_count)
+
+        def receive_rows(thread_number):
+            futures = []
+            for row in rows[thread_number::self.thread_count]:
+                if self.commit_window is None:
+                    insert(database_name, "books", [row]).execute()
+                else:
+                    futures.append(writer.submit(insert, database_name, "books", [row]))
+                time.sleep(self.interval)
+            if not all(future.result() for future in futures):
+                print("  insert failed")
+
+        threads = [threading.Thread(target=receive_rows, args=(thread_number,))
+                   for thread_number in range(self.thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self.commit_window is not None:
+            self.commits = writer.statistics()["commits"]
+        print(f"  commits (syncs to disk): {self.commits}")
+
+
+# -------------------------------------------------------------------------------------------------
+class StatementCacheBenchmark(PersistenceBenchmark):
+    """'row_count' ReadData lookups by primary_key on a table of 'table_rows' books, read from
+        the database (row cache off) on connections keeping 'cached_statements' compiled
+        statements. With 0 every lookup compiles its SQL again."""
+
+    def __init__(self, row_count, table_rows, cached_statements):
+        super().__init__(row_count)
+        self.table_rows = table_rows
+        self.cached_statements = cached_statements
+        self.name = f"id lookups, cached_statements={cached_statements}"
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, self.table_rows)
+        row_cache.RowCache.configure(database_name, enabled=False)
+        connection_pool.ConnectionPool.configure(
+            database_name, cached_statements=self.cached_statements)
+
+    def workload(self, database_name):
+        fields = book.FieldControl().all_field_names
+        for count in range(self.row_count):
+            persistence_classes_single_key.ReadData(
+                database_name, "books", fields, ["id"], (count % self.table_rows + 1,)).execute()
+
+
+# -------------------------------------------------------------------------------------------------
+class RowFactoryBenchmark(PersistenceBenchmark):
+    """ReadData of all 'row_count' books (query cache off) with rows built by 'row_factory':
+        "tuple", "namedtuple" or "record" ('FieldControl.record_class()')."""
+
+    def __init__(self, row_count, row_factory):
+        super().__init__(row_count)
+        self.row_factory = row_factory
+        self.name = f"read all {row_count} rows, row_factory={row_factory}"
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, self.row_count)
+        query_cache.QueryCache.configure(database_name, enabled=False)
+
+    def workload(self, database_name):
+        field_control = book.FieldControl()
+        row_factory = (field_control.record_class() if self.row_factory == "record"
+                       else self.row_factory)
+        persistence_classes_single_key.ReadData(
+            database_name, "books", field_control.all_field_names,
+            row_factory=row_factory).execute()
+
+
+# -------------------------------------------------------------------------------------------------
+class StockReportBenchmark(PersistenceBenchmark):
+    """Stock report of an indexed table of 'row_count' books, either computed in Python from all
+        rows read with ReadData or aggregated in the database by 'stock_reports' classes."""
+
+    def __init__(self, row_count, in_database):
+        super().__init__(row_count)
+        self.in_database = in_database
+        self.index_list = book.FieldControl().index_list
+        self.name = "stock report, " + ("sqlite aggregates" if in_database else "python totals")
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, self.row_count)
+        query_cache.QueryCache.configure(database_name, enabled=False)
+
+    def workload(self, database_name):
+        thresholds = [0, 5, 10]
+        if self.in_database:
+            stock_reports.StockTotals(database_name, "books", "qty").execute()
+            stock_reports.GroupStockTotals(database_name, "books", "author", "qty", 10).execute()
+            stock_reports.LowStockCounts(database_name, "books", "qty", thresholds).execute()
+            return
+
+        rows = persistence_classes_single_key.ReadData(
+            database_name, "books", ["author", "qty"]).execute()[1:]
+        total_stock = sum(qty for _, qty in rows)
+        author_totals = {}
+        for author, qty in rows:
+            author_totals[author] = author_totals.get(author, 0) + qty
+        sorted(author_totals.items(), key=lambda item: (-item[1], item[0]))[:10]
+        [(threshold, sum(1 for _, qty in rows if qty <= threshold)) for threshold in thresholds]
+        return total_stock
+
+
+# -------------------------------------------------------------------------------------------------
+class LowStockSearchBenchmark(PersistenceBenchmark):
+    """'row_count' searches for the 50 books lowest on stock below a level of 1 to 10 on a table
+        of 'table_rows' books of which 1 in 50 is low on stock, with or without the partial
+        index on 'qty' ('FieldControl.partial_index_list')."""
+
+    def __init__(self, row_count, table_rows, partial_index):
+        super().__init__(row_count)
+        self.table_rows = table_rows
+        self.partial_index_list = book.FieldControl().partial_index_list if partial_index else None
+        self.name = "low stock searches, " + ("partial index" if partial_index else "no index")
+
+    def prepare(self, database_name):
+        self.load_rows(database_name, self.table_rows)
+        # most books well stocked, every 50th book has 0 to 9 copies
+        with persistence_classes_single_key.Transaction(database_name) as transaction:
+            transaction.connection.execute(
+                "UPDATE books SET qty = CASE WHEN id % 50 = 0 THEN id % 10 ELSE 20 + id % 500 END")
+        persistence_classes_single_key.CreateIndexes(
+            database_name, "books", partial_index_list=self.partial_index_list).execute()
+        query_cache.QueryCache.configure(database_name, enabled=False)
+
+    def workload(self, database_name):
+        fields = book.FieldControl().all_field_names
+        for count in range(self.row_count):
+            # condition of partial index repeated as 'BookSearch.search_book_range()' does
+            persistence_classes_single_key.ReadData(
+                database_name, "books", fields, ["qty", "qty"], [count % 10 + 1, 10],
+                where_operators=["<", "<="], order_by=["qty", "id"], limit=50).execute()
+
+
+if __name__ == "__main__":
+    for profile in [None] + list(connection_pool.ConnectionPool.PRAGMA_PROFILES):
+        PragmaProfileBenchmark(2000, profile).run()
+
+    for indexed in (False, True):
+        FieldSearchBenchmark(200, 200000, indexed).run()
+
+    for unit_of_work in (False, True):
+        TransactionBenchmark(500, unit_of_work).run()
+
+    BatchUpdateBenchmark(100000, 500000).run()
+
+    BulkImportBenchmark(200000).run()
+
+    for cached in (False, True):
+        RowCacheBenchmark(50000, 100000, cached).run()
+
+    for cached, write_every in ((False, None), (True, None), (True, 100)):
+        QueryCacheBenchmark(20000, 100000, cached, write_every).run()
+
+    for max_workers in (None, 4):
+        AsyncSearchBenchmark(200, 200000, max_workers).run()
+
+    for queued in (False, True):
+        WriteQueueBenchmark(2000, 8, queued).run()
+
+    for commit_window in (None, 0.0, 0.005):
+        GroupCommitBenchmark(5000, 4, 0.0002, commit_window).run()
+
+    for cached_statements in (0, 256):
+        StatementCacheBenchmark(50000, 100000, cached_statements).run()
+
+    for row_factory in ("tuple", "namedtuple", "record"):
+        RowFactoryBenchmark(200000, row_factory).run()
+
+    for in_database in (False, True):
+        StockReportBenchmark(200000, in_database).run()
+
+    for partial_index in (False, True):
+        LowStockSearchBenchmark(500, 200000, partial_index).run()
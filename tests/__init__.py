@@ -0,0 +1,50 @@
+"""Unit tests of the Persistance Layer and Business Logic. Run with 'python -m pytest' or
+    'python -m unittest' from the repository root."""
+import os
+import tempfile
+import unittest
+
+from Modules.persistance_layer import connection_pool
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from Modules.persistance_layer import query_cache
+from Modules.persistance_layer import row_cache
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Base test case creating a table (and its rows) in a new database of a temporary directory
+        before each test. Shared caches and connection pools are closed after each test so no
+        state is carried into the next test.
+
+    Attributes:
+    -----------
+    table_name: str
+        name of table created by 'create_table()'
+    int_field_names: list
+        integer fields of table (besides primary_key 'id')
+    text_field_names: list
+        text fields of table
+    rows: list
+        rows (tuples starting with 'id') inserted after table is created
+    """
+    table_name = "books"
+    int_field_names = ["qty"]
+    text_field_names = ["title"]
+    rows = []
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database_name = os.path.join(self.directory.name, "test_db")
+        self.create_table()
+        if self.rows:
+            persistence.InsertData(self.database_name, self.table_name, self.rows).execute()
+
+    def tearDown(self):
+        row_cache.RowCache.close_all_caches()
+        query_cache.QueryCache.close_all_caches()
+        connection_pool.ConnectionPool.close_all_pools()
+        self.directory.cleanup()
+
+    def create_table(self):
+        """Create table of test, overridden by test cases needing other indexes or tables."""
+        persistence.CreateTableSingleKey(self.database_name, self.table_name, "id",
+                                         self.int_field_names, self.text_field_names).execute()
@@ -0,0 +1,46 @@
+"""Tests for 'AdjustQuantity' changing a quantity within its allowed range in one statement."""
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from tests import DatabaseTestCase
+
+
+class AdjustQuantityTest(DatabaseTestCase):
+    """Adjustments return the new quantity, refused adjustments report the current quantity."""
+    rows = [(1, 10, "book1")]
+
+    def adjust(self, key_value, change, maximum=None):
+        return persistence.AdjustQuantity(self.database_name, "books", "qty", "id", key_value,
+                                          change, maximum=maximum)
+
+    def read_quantity(self):
+        return persistence.ReadData(self.database_name, "books", ["qty"], ["id"],
+                                    (1,)).execute()[1][0]
+
+    def test_adjustment_returns_new_quantity(self):
+        self.assertEqual(self.adjust(1, -4).execute(), 6)
+        self.assertEqual(self.adjust(1, 5).execute(), 11)
+        self.assertEqual(self.read_quantity(), 11)
+
+    def test_adjustment_below_minimum_is_refused(self):
+        adjustment = self.adjust(1, -11)
+
+        self.assertIs(adjustment.execute(), False)
+        self.assertEqual(adjustment.current_value, 10)
+        self.assertEqual(self.read_quantity(), 10)
+
+    def test_adjustment_above_maximum_is_refused(self):
+        adjustment = self.adjust(1, 5, maximum=12)
+
+        self.assertIs(adjustment.execute(), False)
+        self.assertEqual(adjustment.current_value, 10)
+
+    def test_adjustment_of_missing_row_is_refused(self):
+        adjustment = self.adjust(2, 1)
+
+        self.assertIs(adjustment.execute(), False)
+        self.assertIsNone(adjustment.current_value)
+
+
+if __name__ == "__main__":
+    unittest.main()
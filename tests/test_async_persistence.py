@@ -0,0 +1,48 @@
+"""Tests for Async write classes of 'async_persistence' submitting to the write queue."""
+import asyncio
+import unittest
+
+from Modules.persistance_layer import async_persistence
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from Modules.persistance_layer import write_queue
+from tests import DatabaseTestCase
+
+
+class AsyncQueuedWriteTest(DatabaseTestCase):
+    """Async writes are executed by the writer thread, async reads by the executor."""
+
+    def tearDown(self):
+        write_queue.WriteQueue.close_all_queues()
+        async_persistence.AsyncPersistenceExecutor.close_all_executors()
+        super().tearDown()
+
+    def test_writes_are_submitted_to_write_queue(self):
+        async def write_and_read():
+            insert = async_persistence.AsyncInsertData(self.database_name, "books",
+                                                       [(5, "book1")], ["qty", "title"])
+            inserted = await insert.execute()
+            updated = await async_persistence.AsyncUpdateData(
+                self.database_name, "books", ["qty", "id"], (7, insert.query.new_row_id)
+                ).execute()
+            rows = await async_persistence.AsyncReadData(
+                self.database_name, "books", ["id", "qty"]).execute()
+            return inserted, insert.query.new_row_id, updated, rows
+
+        self.assertEqual(asyncio.run(write_and_read()), (True, 1, True, [("id", "qty"), (1, 7)]))
+        queue_statistics = write_queue.WriteQueue.for_database(self.database_name).statistics()
+        self.assertEqual(queue_statistics["requests"], 2)
+        executor_statistics = async_persistence.AsyncPersistenceExecutor.for_database(
+            self.database_name).statistics()
+        self.assertEqual(executor_statistics["submitted"], 1)
+
+    def test_failed_write_returns_none(self):
+        persistence.InsertData(self.database_name, "books", [(1, 5, "book1")]).execute()
+
+        result = asyncio.run(async_persistence.AsyncInsertData(
+            self.database_name, "books", [(1, 6, "duplicate")]).execute())
+
+        self.assertIsNone(result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""Tests for 'BatchUpdateData' applying many changes grouped by the fields they change."""
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from tests import DatabaseTestCase
+
+
+class BatchUpdateTest(DatabaseTestCase):
+    """Changes are applied once per row and changes without a row are reported."""
+    rows = [(1, 10, "book1"), (2, 20, "book2")]
+
+    def test_changes_are_grouped_by_fields_changed(self):
+        batch_update = persistence.BatchUpdateData(
+            self.database_name, "books", "id",
+            [(1, {"qty": 11}), (2, {"qty": 21, "title": "second"})])
+
+        self.assertTrue(batch_update.execute())
+
+        self.assertEqual(batch_update.updated_count, 2)
+        self.assertEqual(persistence.ReadData(self.database_name, "books", ["id", "qty", "title"],
+                                              order_by=["id"]).execute()[1:],
+                         [(1, 11, "book1"), (2, 21, "second")])
+
+    def test_duplicate_key_does_not_hide_missing_key(self):
+        batch_update = persistence.BatchUpdateData(
+            self.database_name, "books", "id", [(1, {"qty": 11}), (1, {"qty": 12}),
+                                                (3, {"qty": 30})])
+
+        batch_update.execute()
+
+        self.assertEqual(batch_update.updated_count, 1)
+        self.assertEqual(batch_update.row_errors, [(3, "no row found")])
+        self.assertEqual(persistence.ReadData(self.database_name, "books", ["qty"], ["id"],
+                                              (1,)).execute(), [("qty",), (12,)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Tests for 'BulkDeleteData' deleting rows in chunks by primary_key values or by conditions."""
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from tests import DatabaseTestCase
+
+
+class BulkDeleteTest(DatabaseTestCase):
+    """Rows are deleted by the same comparisons they are searched by."""
+    rows = [(key, key, f"book{key}") for key in range(1, 11)]
+
+    def remaining_keys(self):
+        return [row[0] for row in persistence.ReadData(
+            self.database_name, "books", ["id"], order_by=["id"]).execute()[1:]]
+
+    def test_delete_by_key_values_in_chunks(self):
+        delete_query = persistence.BulkDeleteData(self.database_name, "books", "id",
+                                                  key_values=iter([2, 4, 6, 11]), chunk_size=2)
+
+        self.assertEqual(list(delete_query.execute_chunks()), [2, 3])
+        self.assertEqual(self.remaining_keys(), [1, 3, 5, 7, 8, 9, 10])
+
+    def test_delete_below_a_value(self):
+        deleted = persistence.BulkDeleteData(self.database_name, "books", "id",
+                                             where_field_list=["qty"], search_vals=[4],
+                                             chunk_size=2, where_operators=["<"]).execute()
+
+        self.assertEqual(deleted, 3)
+        self.assertEqual(self.remaining_keys(), [4, 5, 6, 7, 8, 9, 10])
+
+    def test_delete_between_values(self):
+        deleted = persistence.BulkDeleteData(self.database_name, "books", "id",
+                                             where_field_list=["qty"], search_vals=[(3, 8)],
+                                             where_operators=["BETWEEN"]).execute()
+
+        self.assertEqual(deleted, 6)
+        self.assertEqual(self.remaining_keys(), [1, 2, 9, 10])
+
+    def test_invalid_operator_deletes_nothing(self):
+        deleted = persistence.BulkDeleteData(self.database_name, "books", "id",
+                                             where_field_list=["qty"], search_vals=[4],
+                                             where_operators=["!="]).execute()
+
+        self.assertIsNone(deleted)
+        self.assertEqual(len(self.remaining_keys()), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
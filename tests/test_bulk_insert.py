@@ -0,0 +1,46 @@
+"""Tests for 'BulkInsertData' inserting rows from an iterator in committed chunks."""
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from tests import DatabaseTestCase
+
+
+class BulkInsertTest(DatabaseTestCase):
+    """Rows rejected by the database are reported by row number, the rest of their chunk kept."""
+    rows = [(1, 10, "book1")]
+
+    def read_books(self):
+        return persistence.ReadData(self.database_name, "books", ["id", "qty"],
+                                    order_by=["id"]).execute()[1:]
+
+    def test_rows_are_inserted_in_chunks(self):
+        rows = ((line, (key, key * 10, f"book{key}")) for line, key in enumerate(range(2, 7)))
+        bulk_insert = persistence.BulkInsertData(self.database_name, "books", rows, chunk_size=2)
+
+        self.assertTrue(bulk_insert.execute())
+        self.assertEqual(bulk_insert.inserted_count, 5)
+        self.assertEqual(bulk_insert.row_errors, [])
+        self.assertEqual(len(self.read_books()), 6)
+
+    def test_rejected_rows_are_reported_and_others_inserted(self):
+        # line 3 repeats an existing primary_key, line 4 misses a NOT NULL title
+        rows = iter([(2, (2, 20, "book2")), (3, (1, 30, "book3")), (4, (4, 40, None)),
+                     (5, (5, 50, "book5"))])
+        bulk_insert = persistence.BulkInsertData(self.database_name, "books", rows, chunk_size=3)
+
+        self.assertTrue(bulk_insert.execute())
+        self.assertEqual(bulk_insert.inserted_count, 2)
+        self.assertEqual([row_number for row_number, _ in bulk_insert.row_errors], [3, 4])
+        self.assertEqual(self.read_books(), [(1, 10), (2, 20), (5, 50)])
+
+    def test_primary_keys_are_allocated_when_not_given(self):
+        rows = iter([(1, (20, "book2")), (2, (30, "book3"))])
+        bulk_insert = persistence.BulkInsertData(self.database_name, "books", rows,
+                                                 ["qty", "title"])
+
+        self.assertTrue(bulk_insert.execute())
+        self.assertEqual(self.read_books(), [(1, 10), (2, 20), (3, 30)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests for 'Modules.persistance_layer.connection_pool.ConnectionPool'."""
+import sqlite3
+import unittest
+
+from Modules.persistance_layer import connection_pool
+from tests import DatabaseTestCase
+
+
+class ConnectionPoolTest(DatabaseTestCase):
+    """Connections are reused, handed back clean and bounded by 'max_size'."""
+
+    def setUp(self):
+        super().setUp()
+        self.pool = connection_pool.ConnectionPool(self.database_name, max_size=2,
+                                                   checkout_timeout=0.1)
+
+    def tearDown(self):
+        self.pool.close()
+        super().tearDown()
+
+    def count_books(self):
+        connection = self.pool.checkout()
+        try:
+            return connection.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+        finally:
+            self.pool.checkin(connection)
+
+    def test_checkin_rolls_back_uncommitted_transaction(self):
+        connection = self.pool.checkout()
+        connection.execute("INSERT INTO books VALUES(1, 10, 'book1')")
+        self.assertTrue(connection.in_transaction)
+
+        self.pool.checkin(connection)
+
+        self.assertFalse(connection.in_transaction)
+        self.assertEqual(self.count_books(), 0)
+
+    def test_committed_changes_are_kept_on_checkin(self):
+        connection = self.pool.checkout()
+        connection.execute("INSERT INTO books VALUES(1, 10, 'book1')")
+        connection.commit()
+        self.pool.checkin(connection)
+
+        self.assertEqual(self.count_books(), 1)
+
+    def test_returned_connection_is_reused(self):
+        connection = self.pool.checkout()
+        self.pool.checkin(connection)
+
+        self.assertIs(self.pool.checkout(), connection)
+        self.assertEqual(self.pool.statistics()["connections_created"], 1)
+
+    def test_checkout_times_out_when_pool_is_exhausted(self):
+        borrowed = [self.pool.checkout(), self.pool.checkout()]
+
+        with self.assertRaises(sqlite3.OperationalError):
+            self.pool.checkout()
+        self.assertEqual(self.pool.statistics()["timeouts"], 1)
+        for connection in borrowed:
+            self.pool.checkin(connection)
+
+    def test_connection_opened_before_settings_change_is_closed_on_checkin(self):
+        shared_pool = connection_pool.ConnectionPool.for_database(self.database_name)
+        borrowed = shared_pool.checkout()
+
+        connection_pool.ConnectionPool.configure(self.database_name, cached_statements=16)
+        shared_pool.checkin(borrowed)
+
+        statistics = shared_pool.statistics()
+        self.assertEqual(statistics["connections_discarded"], 1)
+        self.assertEqual(statistics["idle_connections"], 0)
+        connection = shared_pool.checkout()
+        self.assertIsNot(connection, borrowed)
+        shared_pool.checkin(connection)
+        self.assertEqual(shared_pool.statistics()["idle_connections"], 1)
+
+    def test_closed_pool_refuses_checkout(self):
+        self.pool.close()
+
+        with self.assertRaises(sqlite3.OperationalError):
+            self.pool.checkout()
+
+
+if __name__ == "__main__":
+    unittest.main()
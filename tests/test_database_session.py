@@ -0,0 +1,45 @@
+"""Tests for 'DatabaseSession' binding one long-lived connection to the application thread."""
+import time
+import unittest
+
+from Modules.persistance_layer import database_session
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from tests import DatabaseTestCase
+
+
+class DatabaseSessionTest(DatabaseTestCase):
+    """Queries of the application thread share the session connection without waiting on it."""
+    rows = [(1, 10, "book1")]
+
+    def setUp(self):
+        super().setUp()
+        self.session = database_session.DatabaseSession(self.database_name).open()
+
+    def tearDown(self):
+        self.session.close()
+        super().tearDown()
+
+    def test_queries_reuse_session_connection(self):
+        persistence.ReadData(self.database_name, "books", ["id"]).execute()
+        persistence.UpdateData(self.database_name, "books", ["qty", "id"], (11, 1)).execute()
+
+        statistics = self.session.statistics()
+        self.assertEqual(statistics["connections_created"], 1)
+        self.assertEqual(statistics["reuses"], 2)
+
+    def test_query_outside_open_transaction_does_not_wait_for_session_connection(self):
+        started = time.monotonic()
+        with persistence.Transaction(self.database_name) as transaction:
+            persistence.UpdateData(self.database_name, "books", ["qty", "id"], (12, 1),
+                                   transaction).execute()
+            # read on its own connection, change of transaction not yet committed
+            rows = persistence.ReadData(self.database_name, "books", ["id", "qty"]).execute()
+
+        self.assertEqual(rows, [("id", "qty"), (1, 10)])
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(persistence.ReadData(self.database_name, "books", ["id", "qty"],
+                                              ["id"], (1,)).execute(), [("id", "qty"), (1, 12)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Tests for 'FullTextSearch' of the index kept in sync with its table by 'CreateFullTextIndex'
+    triggers."""
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from tests import DatabaseTestCase
+
+
+class FullTextSearchTest(DatabaseTestCase):
+    """Rows written after the index is created are found by their current title and author."""
+    text_field_names = ["title", "author"]
+    # row present before index is created is indexed by 'CreateFullTextIndex'
+    rows = [(1, 10, "The Hobbit", "Tolkien")]
+
+    def setUp(self):
+        super().setUp()
+        persistence.CreateFullTextIndex(self.database_name, "books", "id",
+                                        ["title", "author"]).execute()
+
+    def search(self, search_text, search_mode="token"):
+        return persistence.FullTextSearch(self.database_name, "books", ["id", "title"], "id",
+                                          search_text, search_mode).execute()
+
+    def test_existing_and_inserted_rows_are_found(self):
+        persistence.InsertData(self.database_name, "books",
+                               [(2, 3, "Dune Messiah", "Herbert")]).execute()
+
+        self.assertEqual(self.search("hobbit"), [("id", "title"), (1, "The Hobbit")])
+        self.assertEqual(self.search("messi", "prefix"), [("id", "title"), (2, "Dune Messiah")])
+        self.assertEqual(self.search("dune messiah", "phrase"),
+                         [("id", "title"), (2, "Dune Messiah")])
+
+    def test_updated_row_is_found_by_new_text_only(self):
+        persistence.UpdateData(self.database_name, "books", ["title", "id"],
+                               ("The Silmarillion", 1)).execute()
+
+        self.assertEqual(self.search("hobbit"), [])
+        self.assertEqual(self.search("silmarillion"), [("id", "title"), (1, "The Silmarillion")])
+        self.assertEqual(self.search("tolkien"), [("id", "title"), (1, "The Silmarillion")])
+
+    def test_deleted_row_is_not_found(self):
+        persistence.DeleteData(self.database_name, "books", "id", 1).execute()
+
+        self.assertEqual(self.search("hobbit"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
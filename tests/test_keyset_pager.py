@@ -0,0 +1,63 @@
+"""Tests for 'KeysetPager' moving forwards and backwards through pages read by 'ReadPage'."""
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from tests import DatabaseTestCase
+
+
+class KeysetPagerTest(DatabaseTestCase):
+    """Pages hold the rows between their boundaries and stop at the first and last page."""
+    # equal quantities test primary_key as tie-breaker of sort field
+    rows = [(1, 30, "book1"), (2, 10, "book2"), (3, 20, "book3"), (4, 10, "book4"),
+            (5, 20, "book5")]
+
+    def pager(self, sort_field=None):
+        return persistence.KeysetPager(self.database_name, "books", ["id", "qty"], "id",
+                                       sort_field, page_size=2)
+
+    def test_next_pages_until_last_page(self):
+        pager = self.pager()
+
+        self.assertEqual(pager.first_page(), [("id", "qty"), (1, 30), (2, 10)])
+        self.assertTrue(pager.has_next)
+        self.assertFalse(pager.has_previous)
+        self.assertEqual(pager.next_page(), [("id", "qty"), (3, 20), (4, 10)])
+        self.assertEqual(pager.next_page(), [("id", "qty"), (5, 20)])
+        self.assertFalse(pager.has_next)
+        self.assertEqual(pager.page_number, 3)
+        self.assertIsNone(pager.next_page())
+
+    def test_previous_pages_until_first_page(self):
+        pager = self.pager()
+        pager.first_page()
+        pager.next_page()
+        pager.next_page()
+
+        self.assertEqual(pager.previous_page(), [("id", "qty"), (3, 20), (4, 10)])
+        self.assertTrue(pager.has_previous)
+        self.assertEqual(pager.previous_page(), [("id", "qty"), (1, 30), (2, 10)])
+        self.assertFalse(pager.has_previous)
+        self.assertTrue(pager.has_next)
+        self.assertEqual(pager.page_number, 1)
+        self.assertIsNone(pager.previous_page())
+
+    def test_pages_ordered_by_sort_field_with_ties(self):
+        pager = self.pager("qty")
+
+        self.assertEqual(pager.first_page(), [("id", "qty"), (2, 10), (4, 10)])
+        self.assertEqual(pager.next_page(), [("id", "qty"), (3, 20), (5, 20)])
+        self.assertEqual(pager.next_page(), [("id", "qty"), (1, 30)])
+        self.assertEqual(pager.previous_page(), [("id", "qty"), (3, 20), (5, 20)])
+
+    def test_page_of_exact_page_size_has_no_next_page(self):
+        persistence.BulkDeleteData(self.database_name, "books", "id",
+                                   key_values=[5]).execute()
+        pager = self.pager()
+        pager.first_page()
+
+        self.assertEqual(pager.next_page(), [("id", "qty"), (3, 20), (4, 10)])
+        self.assertFalse(pager.has_next)
+
+
+if __name__ == "__main__":
+    unittest.main()
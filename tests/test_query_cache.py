@@ -0,0 +1,68 @@
+"""Tests for 'Modules.persistance_layer.query_cache.QueryCache' used by 'ReadData' searches on
+    fields other than the primary_key."""
+import sqlite3
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from Modules.persistance_layer import query_cache
+from tests import DatabaseTestCase
+
+
+class QueryCacheTest(DatabaseTestCase):
+    """Search results cached by 'ReadData' are only made stale by writes to their table."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = query_cache.QueryCache.for_database(self.database_name)
+
+    def create_table(self):
+        for table_name in ("books", "authors"):
+            persistence.CreateTableSingleKey(self.database_name, table_name, "id", ["qty"],
+                                             ["name"]).execute()
+            persistence.InsertData(self.database_name, table_name,
+                                   [(1, 10, "first"), (2, 20, "second")]).execute()
+
+    def search(self, table_name, name):
+        return persistence.ReadData(self.database_name, table_name, ["id", "qty"], ["name"],
+                                    (name,)).execute()
+
+    def test_repeated_search_is_served_from_cache(self):
+        self.assertEqual(self.search("books", "first"), [("id", "qty"), (1, 10)])
+        self.assertEqual(self.search("books", "first"), [("id", "qty"), (1, 10)])
+        self.assertEqual(self.cache.statistics()["hits"], 1)
+
+    def test_streamed_search_is_served_from_cache(self):
+        all_books = persistence.ReadData(self.database_name, "books", ["id", "qty"]).execute()
+
+        rows = persistence.ReadData(self.database_name, "books", ["id", "qty"]).execute_stream()
+
+        self.assertEqual(list(rows), all_books)
+        self.assertEqual(all_books, [("id", "qty"), (1, 10), (2, 20)])
+        self.assertEqual(self.cache.statistics()["hits"], 1)
+
+    def test_write_to_one_table_keeps_searches_of_other_table_cached(self):
+        self.search("books", "first")
+        self.search("authors", "first")
+
+        self.assertTrue(persistence.UpdateData(self.database_name, "authors", ["qty", "id"],
+                                               (15, 1)).execute())
+
+        self.assertEqual(self.search("books", "first"), [("id", "qty"), (1, 10)])
+        self.assertEqual(self.cache.statistics()["hits"], 1)
+        self.assertEqual(self.search("authors", "first"), [("id", "qty"), (1, 15)])
+        self.assertEqual(self.cache.statistics()["version_changes"], 0)
+
+    def test_commit_outside_application_makes_every_search_stale(self):
+        self.search("books", "first")
+
+        connection = sqlite3.connect(self.database_name)
+        connection.execute("UPDATE books SET qty = 99 WHERE id = 1")
+        connection.commit()
+        connection.close()
+
+        self.assertEqual(self.search("books", "first"), [("id", "qty"), (1, 99)])
+        self.assertEqual(self.cache.statistics()["version_changes"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
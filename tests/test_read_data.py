@@ -0,0 +1,46 @@
+"""Tests for 'ReadData' searches comparing fields by operators, ordered and limited."""
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from Modules.persistance_layer import query_cache
+from tests import DatabaseTestCase
+
+
+class RangeSearchTest(DatabaseTestCase):
+    """Where fields are compared by 'where_operators', 'BETWEEN' taking a (low, high) pair."""
+    rows = [(key, 25 - 5 * key, f"book{key}") for key in range(1, 6)]
+
+    def create_table(self):
+        persistence.CreateTableSingleKey(self.database_name, "books", "id", ["qty"], ["title"],
+                                         partial_index_list=[("qty", 10)]).execute()
+
+    def search(self, where_fields, search_values, operators, limit=None):
+        return persistence.ReadData(self.database_name, "books", ["id", "qty"], where_fields,
+                                    search_values, where_operators=operators,
+                                    order_by=["qty", "id"], limit=limit).execute()
+
+    def test_between_includes_both_bounds(self):
+        self.assertEqual(self.search(["qty"], [(5, 15)], ["BETWEEN"]),
+                         [("id", "qty"), (4, 5), (3, 10), (2, 15)])
+
+    def test_between_with_limit(self):
+        self.assertEqual(self.search(["qty"], [(0, 20)], ["BETWEEN"], limit=2),
+                         [("id", "qty"), (5, 0), (4, 5)])
+
+    def test_comparison_combined_with_partial_index_condition(self):
+        self.assertEqual(self.search(["qty", "qty"], [5, 10], ["<", "<="]),
+                         [("id", "qty"), (5, 0)])
+
+    def test_repeated_range_search_is_served_from_query_cache(self):
+        self.search(["qty"], [(5, 15)], ["BETWEEN"])
+        self.assertEqual(self.search(["qty"], [(5, 15)], ["BETWEEN"]),
+                         [("id", "qty"), (4, 5), (3, 10), (2, 15)])
+        self.assertEqual(query_cache.QueryCache.for_database(
+            self.database_name).statistics()["hits"], 1)
+
+    def test_invalid_operator_returns_none(self):
+        self.assertIsNone(self.search(["qty"], [5], ["LIKE"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
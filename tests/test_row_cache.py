@@ -0,0 +1,160 @@
+"""Tests for 'Modules.persistance_layer.row_cache.RowCache' used by 'ReadData' lookups of rows by
+    primary_key."""
+import sqlite3
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from Modules.persistance_layer import row_cache
+from tests import DatabaseTestCase
+
+
+class RowCacheTest(DatabaseTestCase):
+    """Rows cached by 'ReadData' stay cached until they are written to."""
+    text_field_names = ["title", "author"]
+    rows = [(1, 10, "book1", "auth1"), (2, 20, "book2", "auth2")]
+
+    def setUp(self):
+        super().setUp()
+        self.cache = row_cache.RowCache.for_database(self.database_name)
+
+    def read_book(self, key_value):
+        return persistence.ReadData(self.database_name, "books", ["id", "qty"], ["id"],
+                                    (key_value,)).execute()
+
+    def test_lookup_is_served_from_cache(self):
+        self.assertEqual(self.read_book(1), [("id", "qty"), (1, 10)])
+        self.assertEqual(self.read_book(1), [("id", "qty"), (1, 10)])
+        self.assertEqual(self.cache.statistics()["hits"], 1)
+
+    def test_streamed_lookup_is_served_from_cache(self):
+        self.read_book(1)
+
+        rows = persistence.ReadData(self.database_name, "books", ["id", "qty"], ["id"],
+                                    (1,), row_factory="namedtuple").execute_stream()
+
+        self.assertEqual([tuple(row) for row in rows], [("id", "qty"), (1, 10)])
+        self.assertEqual(self.cache.statistics()["hits"], 1)
+
+    def test_write_to_one_key_keeps_other_keys_cached(self):
+        self.read_book(1)
+        self.read_book(2)
+
+        self.assertTrue(persistence.UpdateData(self.database_name, "books", ["qty", "id"],
+                                               (25, 2)).execute())
+
+        self.assertEqual(self.cache.get("books", "id", 1, ("id", "qty")),
+                         [("id", "qty"), (1, 10)])
+        self.assertIsNone(self.cache.get("books", "id", 2, ("id", "qty")))
+        self.assertEqual(self.read_book(2), [("id", "qty"), (2, 25)])
+        self.assertEqual(self.cache.statistics()["version_changes"], 0)
+
+    def test_transaction_commit_keeps_other_keys_cached(self):
+        self.read_book(1)
+        self.read_book(2)
+
+        with persistence.Transaction(self.database_name) as transaction:
+            persistence.UpdateData(self.database_name, "books", ["qty", "id"], (5, 2),
+                                   transaction).execute()
+
+        self.assertEqual(self.cache.get("books", "id", 1, ("id", "qty")),
+                         [("id", "qty"), (1, 10)])
+        self.assertEqual(self.read_book(2), [("id", "qty"), (2, 5)])
+
+    def test_commit_outside_application_clears_cache(self):
+        self.read_book(1)
+
+        connection = sqlite3.connect(self.database_name)
+        connection.execute("UPDATE books SET qty = 99 WHERE id = 1")
+        connection.commit()
+        connection.close()
+
+        self.assertEqual(self.read_book(1), [("id", "qty"), (1, 99)])
+        self.assertEqual(self.cache.statistics()["version_changes"], 1)
+
+    def test_commit_outside_application_before_own_commit_clears_cache(self):
+        self.read_book(1)
+
+        connection = sqlite3.connect(self.database_name)
+        connection.execute("UPDATE books SET qty = 99 WHERE id = 1")
+        connection.commit()
+        connection.close()
+        # own commit must not record the outside change as its own
+        persistence.UpdateData(self.database_name, "books", ["qty", "id"], (25, 2)).execute()
+
+        self.assertEqual(self.read_book(1), [("id", "qty"), (1, 99)])
+
+
+class DataVersionWatcherTest(DatabaseTestCase):
+    """Only commits proven to be the application's own leave the change count unchanged."""
+    rows = [(1, 10, "book1")]
+
+    def setUp(self):
+        super().setUp()
+        self.watcher = row_cache.DataVersionWatcher.for_database(self.database_name)
+        self.connection = sqlite3.connect(self.database_name)
+
+    def tearDown(self):
+        self.connection.close()
+        super().tearDown()
+
+    def read_book(self):
+        return persistence.ReadData(self.database_name, "books", ["id", "qty"], ["id"],
+                                    (1,)).execute()
+
+    def commit_outside_application(self):
+        connection = sqlite3.connect(self.database_name)
+        connection.execute("UPDATE books SET qty = qty + 1 WHERE id = 1")
+        connection.commit()
+        connection.close()
+
+    def test_own_commit_is_not_counted(self):
+        changes = self.watcher.changes()
+        self.connection.execute("UPDATE books SET qty = 11 WHERE id = 1")
+
+        commit_version = self.watcher.begin_commit(self.connection)
+        self.connection.commit()
+        # a lookup while the commit is in progress does not take it for a change
+        self.assertEqual(self.watcher.changes(), changes)
+        self.watcher.end_commit(self.connection, commit_version)
+
+        self.assertEqual(self.watcher.changes(), changes)
+
+    def test_commit_outside_application_before_own_commit_is_counted(self):
+        changes = self.watcher.changes()
+        self.commit_outside_application()
+        self.connection.execute("UPDATE books SET qty = 11 WHERE id = 1")
+
+        commit_version = self.watcher.begin_commit(self.connection)
+        self.connection.commit()
+        self.watcher.end_commit(self.connection, commit_version)
+
+        self.assertEqual(self.watcher.changes(), changes + 1)
+
+    def test_commit_outside_application_after_own_commit_is_counted(self):
+        changes = self.watcher.changes()
+        self.connection.execute("UPDATE books SET qty = 11 WHERE id = 1")
+
+        commit_version = self.watcher.begin_commit(self.connection)
+        self.connection.commit()
+        self.commit_outside_application()
+        self.watcher.end_commit(self.connection, commit_version)
+
+        self.assertEqual(self.watcher.changes(), changes + 1)
+
+    def test_row_changed_outside_application_during_own_commit_is_not_served(self):
+        cache = row_cache.RowCache.for_database(self.database_name)
+        self.read_book()
+        self.read_book()
+        self.assertEqual(cache.statistics()["hits"], 1)
+        self.connection.execute("INSERT INTO books VALUES(2, 5, 'book2')")
+
+        commit_version = self.watcher.begin_commit(self.connection)
+        self.connection.commit()
+        self.commit_outside_application()
+        self.watcher.end_commit(self.connection, commit_version)
+
+        self.assertEqual(self.read_book(), [("id", "qty"), (1, 11)])
+
+
+if __name__ == "__main__":
+    unittest.main()
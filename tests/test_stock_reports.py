@@ -0,0 +1,45 @@
+"""Tests for report queries of 'Modules.persistance_layer.stock_reports'."""
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from Modules.persistance_layer import stock_reports
+from tests import DatabaseTestCase
+
+
+class StockReportTest(DatabaseTestCase):
+    """Reports aggregate quantities of the whole table, of each group or below each threshold."""
+    text_field_names = ["title", "author"]
+    rows = [(1, 10, "book1", "auth1"), (2, 0, "book2", "auth2"), (3, 5, "book3", "auth1"),
+            (4, 3, "book4", "auth3")]
+
+    def test_stock_totals(self):
+        self.assertEqual(stock_reports.StockTotals(self.database_name, "books", "qty").execute(),
+                         [("titles", "total_stock", "average_stock"), (4, 18, 4.5)])
+
+    def test_stock_totals_of_empty_table(self):
+        persistence.CreateTableSingleKey(self.database_name, "orders", "id", ["qty"],
+                                         ["title"]).execute()
+
+        self.assertEqual(stock_reports.StockTotals(self.database_name, "orders", "qty").execute(),
+                         [("titles", "total_stock", "average_stock"), (0, 0, 0)])
+
+    def test_group_stock_totals_largest_first(self):
+        report = stock_reports.GroupStockTotals(self.database_name, "books", "author", "qty",
+                                                limit=2)
+
+        self.assertEqual(report.execute(), [("author", "titles", "total_stock"),
+                                            ("auth1", 2, 15), ("auth3", 1, 3)])
+
+    def test_low_stock_counts_for_each_threshold(self):
+        report = stock_reports.LowStockCounts(self.database_name, "books", "qty", [5, 0, 5])
+
+        self.assertEqual(report.execute(), [("stock_at_most", "titles", "copies"),
+                                            (0, 1, 0), (5, 3, 8)])
+
+    def test_low_stock_counts_without_thresholds(self):
+        self.assertEqual(
+            stock_reports.LowStockCounts(self.database_name, "books", "qty", []).execute(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
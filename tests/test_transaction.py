@@ -0,0 +1,54 @@
+"""Tests for 'Transaction' committing the queries joined to it together or not at all."""
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from tests import DatabaseTestCase
+
+
+class TransactionTest(DatabaseTestCase):
+    """Writes of joined queries are kept only if the 'with' block ends without a failure."""
+    rows = [(1, 10, "book1")]
+
+    def read_books(self):
+        return persistence.ReadData(self.database_name, "books", ["id", "qty"],
+                                    order_by=["id"]).execute()[1:]
+
+    def write_in_transaction(self, transaction):
+        persistence.UpdateData(self.database_name, "books", ["qty", "id"], (11, 1),
+                               transaction=transaction).execute()
+        persistence.InsertData(self.database_name, "books", [(2, 20, "book2")],
+                               transaction=transaction).execute()
+
+    def test_joined_queries_are_committed_together(self):
+        # row is cached before the update so commit must invalidate it
+        self.assertEqual(self.read_books(), [(1, 10)])
+
+        with persistence.Transaction(self.database_name) as transaction:
+            self.write_in_transaction(transaction)
+
+        self.assertTrue(transaction.committed)
+        self.assertEqual(self.read_books(), [(1, 11), (2, 20)])
+
+    def test_exception_in_block_rolls_back_joined_queries(self):
+        with self.assertRaises(RuntimeError):
+            with persistence.Transaction(self.database_name) as transaction:
+                self.write_in_transaction(transaction)
+                raise RuntimeError("stop before commit")
+
+        self.assertFalse(transaction.committed)
+        self.assertEqual(self.read_books(), [(1, 10)])
+
+    def test_failed_joined_query_rolls_back_transaction(self):
+        with persistence.Transaction(self.database_name) as transaction:
+            self.write_in_transaction(transaction)
+            # primary_key 1 exists, insert fails and marks transaction rollback only
+            persistence.InsertData(self.database_name, "books", [(1, 30, "book3")],
+                                   transaction=transaction).execute()
+
+        self.assertTrue(transaction.rollback_only)
+        self.assertFalse(transaction.committed)
+        self.assertEqual(self.read_books(), [(1, 10)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for 'UpsertData' merging restock feeds read by 'book.BookRestock' into the books table."""
+import os
+import unittest
+
+from Modules.business_logic import book
+from Modules.persistance_layer import connection_pool
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from tests import DatabaseTestCase
+
+
+class RestockTest(DatabaseTestCase):
+    """Feed rows without a primary_key add stock to the book with the same title and author."""
+    rows = [(1, 10, "Tolkien", "The Hobbit")]
+
+    def create_table(self):
+        field_control = book.FieldControl()
+        persistence.CreateTableSingleKey(
+            self.database_name, "books", "id", field_control.int_field_names,
+            field_control.text_field_names, field_control.float_field_names,
+            field_control.index_list, field_control.unique_list).execute()
+
+    def write_feed(self, lines):
+        feed_path = os.path.join(self.directory.name, "feed.csv")
+        with open(feed_path, "w", encoding="utf-8") as feed_file:
+            feed_file.write("\n".join(lines) + "\n")
+        return book.BookRestock(feed_path)
+
+    def read_books(self):
+        return persistence.ReadData(self.database_name, "books", ["id", "qty", "author", "title"],
+                                    order_by=["id"]).execute()[1:]
+
+    def restock(self, restock_feed):
+        upsert = persistence.UpsertData(
+            self.database_name, "books", restock_feed.read_rows(), restock_feed.field_names,
+            restock_feed.conflict_field, restock_feed.add_fields)
+        self.assertTrue(upsert.execute())
+        return upsert
+
+    def test_feed_without_primary_key_adds_to_stock_of_existing_book(self):
+        restock_feed = self.write_feed(["title,author,qty", "The Hobbit,Tolkien,5",
+                                        "Dune,Herbert,3"])
+        self.assertEqual(restock_feed.conflict_field, ("title", "author"))
+
+        upsert = self.restock(restock_feed)
+
+        self.assertEqual(upsert.inserted_count, 2)
+        self.assertEqual(self.read_books(), [(1, 15, "Tolkien", "The Hobbit"),
+                                             (2, 3, "Herbert", "Dune")])
+
+    def test_same_book_twice_in_feed_adds_both_quantities(self):
+        self.restock(self.write_feed(["title,author,qty", "Dune,Herbert,3", "Dune,Herbert,4"]))
+
+        self.assertEqual(self.read_books()[1:], [(2, 7, "Herbert", "Dune")])
+
+    def test_rows_without_primary_key_are_rejected_when_matched_on_primary_key(self):
+        restock_feed = self.write_feed(["id,title,author,qty", "1,The Hobbit,Tolkien,5",
+                                        ",Dune,Herbert,3"])
+        restock_feed.conflict_field = "id"
+        restock_feed.field_names = ["id"] + restock_feed.field_names
+
+        self.restock(restock_feed)
+
+        self.assertEqual(self.read_books(), [(1, 15, "Tolkien", "The Hobbit")])
+        self.assertEqual([line for line, _ in restock_feed.row_errors], [3])
+
+
+class DuplicateBooksTest(DatabaseTestCase):
+    """A table made before books were unique by title and author may hold duplicates."""
+    rows = [(1, 10, "Tolkien", "The Hobbit"), (2, 4, "Tolkien", "The Hobbit"),
+            (3, 2, "Herbert", "Dune")]
+
+    def create_table(self):
+        self.field_control = book.FieldControl()
+        # table as created before 'unique_list' was declared
+        persistence.CreateTableSingleKey(
+            self.database_name, "books", "id", self.field_control.int_field_names,
+            self.field_control.text_field_names, self.field_control.float_field_names,
+            ["author", "title", "qty"]).execute()
+
+    def index_names(self):
+        connection = connection_pool.ConnectionPool.for_database(self.database_name).checkout()
+        try:
+            return {row[1] for row in connection.execute("PRAGMA index_list('books')")}
+        finally:
+            connection_pool.ConnectionPool.for_database(self.database_name).checkin(connection)
+
+    def test_unique_index_is_left_out_and_other_indexes_created(self):
+        created = persistence.CreateIndexes(
+            self.database_name, "books", self.field_control.index_list,
+            self.field_control.unique_list, self.field_control.partial_index_list).execute()
+
+        self.assertFalse(created)
+        self.assertNotIn("books_title_author_unique", self.index_names())
+        self.assertIn("books_qty_at_most_10_index", self.index_names())
+
+    def test_restock_is_refused_without_unique_index(self):
+        upsert = persistence.UpsertData(self.database_name, "books",
+                                        iter([(1, (7, "Herbert", "Dune"))]),
+                                        ["qty", "author", "title"], ("title", "author"), ["qty"])
+
+        self.assertIsNone(upsert.execute())
+        self.assertEqual(persistence.ReadData(self.database_name, "books", ["id", "qty"],
+                                              order_by=["id"]).execute()[1:],
+                         [(1, 10), (2, 4), (3, 2)])
+
+    def test_restock_works_once_duplicates_are_merged(self):
+        persistence.DeleteData(self.database_name, "books", "id", 2).execute()
+        self.assertTrue(persistence.CreateIndexes(
+            self.database_name, "books", unique_list=self.field_control.unique_list).execute())
+
+        upsert = persistence.UpsertData(self.database_name, "books",
+                                        iter([(1, (7, "Herbert", "Dune"))]),
+                                        ["qty", "author", "title"], ("title", "author"), ["qty"])
+
+        self.assertTrue(upsert.execute())
+        self.assertEqual(persistence.ReadData(self.database_name, "books", ["id", "qty"],
+                                              order_by=["id"]).execute()[1:], [(1, 10), (3, 9)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Tests for 'Modules.persistance_layer.write_queue.WriteQueue' group-committing queued writes."""
+import unittest
+
+from Modules.persistance_layer import persistence_classes_single_key as persistence
+from Modules.persistance_layer import write_queue
+from tests import DatabaseTestCase
+
+
+class WriteQueueTest(DatabaseTestCase):
+    """Requests waiting together are committed once, a failing request alone is rolled back."""
+    rows = [(1, 10, "book1")]
+
+    def setUp(self):
+        super().setUp()
+        # batch is closed once three rows are queued, long window keeps them in one batch
+        self.queue = write_queue.WriteQueue(self.database_name, max_batch=3, commit_window=5.0)
+
+    def tearDown(self):
+        self.queue.close()
+        super().tearDown()
+
+    def read_books(self):
+        return persistence.ReadData(self.database_name, "books", ["id", "qty", "title"],
+                                    order_by=["id"]).execute()[1:]
+
+    def test_requests_are_committed_together(self):
+        futures = [
+            self.queue.submit(persistence.InsertData, self.database_name, "books",
+                              [(15, "book2")], ["qty", "title"]),
+            self.queue.submit(persistence.UpdateData, self.database_name, "books",
+                              ["qty", "id"], (11, 1)),
+            self.queue.submit(persistence.InsertData, self.database_name, "books",
+                              [(25, "book3")], ["qty", "title"])]
+
+        self.assertEqual([future.result(timeout=10) for future in futures], [True, True, True])
+        self.assertEqual(futures[2].query.new_row_id, 3)
+        statistics = self.queue.statistics()
+        self.assertEqual((statistics["batches"], statistics["commits"]), (1, 1))
+        self.assertEqual(self.read_books(), [(1, 11, "book1"), (2, 15, "book2"),
+                                             (3, 25, "book3")])
+
+    def test_failing_request_is_rolled_back_alone(self):
+        futures = [
+            self.queue.submit(persistence.UpdateData, self.database_name, "books",
+                              ["qty", "id"], (12, 1)),
+            # primary_key 1 already exists, insert fails inside its savepoint
+            self.queue.submit(persistence.InsertData, self.database_name, "books",
+                              [(1, 99, "duplicate")]),
+            self.queue.submit(persistence.InsertData, self.database_name, "books",
+                              [(20, "book2")], ["qty", "title"])]
+
+        self.assertEqual([future.result(timeout=10) for future in futures], [True, None, True])
+        statistics = self.queue.statistics()
+        self.assertEqual((statistics["commits"], statistics["failed_requests"]), (1, 1))
+        self.assertEqual(self.read_books(), [(1, 12, "book1"), (2, 20, "book2")])
+
+    def test_query_that_cannot_be_queued_is_refused(self):
+        with self.assertRaises(ValueError):
+            self.queue.submit(persistence.ReadData, self.database_name, "books", ["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()